@@ -5,11 +5,12 @@ import os
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
 
 from jose import JWTError, jwt
+from sqlalchemy.orm import Session
 
-from database import get_user_by_id
+from database import cache_user, get_cached_user, get_db, get_user_by_id, run_db, user_cache_generation
 from models import User
 
 # 역할 상수
@@ -23,6 +24,9 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "ansible-report-secret-change-in-produc
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 COOKIE_NAME = "session"
+# 1이면 읽기 전용 엔드포인트(get_current_viewer)에서 DB/캐시 조회 없이 토큰의 role 클레임을 그대로 신뢰.
+# 역할 변경·삭제가 토큰 만료(최대 ACCESS_TOKEN_EXPIRE_HOURS)까지 읽기 권한에 반영되지 않으므로 기본은 0.
+TRUST_TOKEN_ROLE = os.getenv("AUTH_TRUST_TOKEN_ROLE", "0").strip().lower() in ("1", "true", "yes")
 
 
 def _user_role(user: User) -> str:
@@ -61,41 +65,72 @@ def get_token_from_request(request: Request) -> Optional[str]:
     return request.cookies.get(COOKIE_NAME)
 
 
-async def get_current_user(request: Request) -> User:
-    """쿠키 JWT 검증 후 User 반환. 미인증 시 401."""
+async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    """
+    쿠키 JWT 검증 후 User 반환. 미인증 시 401.
+    사용자는 인증 사용자 캐시(USER_CACHE_TTL)에서 먼저 찾고, 없을 때만 요청 세션(get_db)으로 조회.
+    반환값은 세션에 속하지 않은 User 사본.
+    """
+    payload = _get_token_payload(request)
+    user_id = int(payload["sub"])
+    user = get_cached_user(user_id)
+    if user is not None:
+        return user
+    generation = user_cache_generation()
+    user = await run_db(get_user_by_id, user_id, db=db)
+    if not user:
+        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다")
+    return cache_user(user, generation)
+
+
+async def get_current_viewer(request: Request, db: Session = Depends(get_db)) -> User:
+    """
+    읽기 전용 엔드포인트용 인증 (로그인 사용자면 모두 허용).
+    AUTH_TRUST_TOKEN_ROLE=1이면 토큰 클레임(sub, username, role)으로 User를 만들어 DB/캐시 조회를 생략.
+    """
+    if not TRUST_TOKEN_ROLE:
+        return await get_current_user(request, db)
+    payload = _get_token_payload(request)
+    role = payload.get("role")
+    if role not in (ROLE_ADMIN, ROLE_MAINTAINER, ROLE_OPERATOR, ROLE_VIEWER):
+        role = ROLE_ADMIN if payload.get("is_admin") else ROLE_VIEWER
+    return User(
+        id=int(payload["sub"]),
+        username=payload.get("username"),
+        role=role,
+        is_admin=role == ROLE_ADMIN,
+        is_approved=True,
+    )
+
+
+def _get_token_payload(request: Request) -> dict:
+    """쿠키 JWT 검증 후 payload 반환. 없거나 잘못되면 401."""
     token = get_token_from_request(request)
     if not token:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다")
     payload = decode_access_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=401, detail="로그인이 필요합니다")
-    user_id = int(payload["sub"])
-    user = get_user_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다")
-    return user
+    return payload
 
 
-async def get_current_admin(request: Request) -> User:
+async def get_current_admin(user: User = Depends(get_current_user)) -> User:
     """Admin만 허용 (role == admin)."""
-    user = await get_current_user(request)
     if _user_role(user) != ROLE_ADMIN:
         raise HTTPException(status_code=403, detail="관리자만 접근할 수 있습니다")
     return user
 
 
-async def get_current_maintainer(request: Request) -> User:
+async def get_current_maintainer(user: User = Depends(get_current_user)) -> User:
     """Maintainer 이상 허용 (admin, maintainer)."""
-    user = await get_current_user(request)
     r = _user_role(user)
     if r not in (ROLE_ADMIN, ROLE_MAINTAINER):
         raise HTTPException(status_code=403, detail="권한이 없습니다 (Maintainer 이상 필요)")
     return user
 
 
-async def get_current_operator(request: Request) -> User:
+async def get_current_operator(user: User = Depends(get_current_user)) -> User:
     """Operator 이상 허용 (admin, maintainer, operator)."""
-    user = await get_current_user(request)
     r = _user_role(user)
     if r not in (ROLE_ADMIN, ROLE_MAINTAINER, ROLE_OPERATOR):
         raise HTTPException(status_code=403, detail="권한이 없습니다 (Operator 이상 필요)")
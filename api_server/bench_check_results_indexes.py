@@ -0,0 +1,144 @@
+"""
+check_results 상위 N건 조회 벤치마크 (복합 인덱스 적용 전/후)
+
+별도 벤치마크 DB에 합성 점검 결과를 --rows건 채운 뒤, API가 쓰는 조회 형태
+(check_type/hostname 필터 + ORDER BY created_at DESC LIMIT N)의 실행 계획과 소요 시간을
+models.py의 복합 인덱스 없이/있을 때 비교합니다.
+- 인덱스 없음: 필터 컬럼 단일 인덱스로 찾은 뒤 전체 정렬 (SQLite: USE TEMP B-TREE FOR ORDER BY, PostgreSQL: Sort)
+- 인덱스 있음: 인덱스 순서대로 N건만 읽고 종료
+
+운영 DB(DATABASE_URL)는 건드리지 않습니다. --database-url 로 빈 벤치마크용 DB를 지정하세요.
+
+사용법 (api_server 디렉터리에서):
+  python bench_check_results_indexes.py                      # sqlite:///./bench_check_results.db, 2,000,000건
+  python bench_check_results_indexes.py --rows 5000000 --limit 100
+  python bench_check_results_indexes.py --database-url postgresql://user:pw@localhost/bench_db
+  python bench_check_results_indexes.py --reuse              # 이미 채운 데이터로 측정만 반복
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from models import CheckResult
+
+CHECK_TYPES = ["os", "was", "mariadb", "postgresql", "cubrid", "tomcat"]
+# models.py에서 추가한 복합 인덱스 (적용 전/후 비교 대상)
+BENCH_INDEX_NAMES = {
+    "ix_check_results_check_type_created_at",
+    "ix_check_results_hostname_created_at",
+    "ix_check_results_created_at",
+}
+
+
+def _bench_indexes():
+    return [idx for idx in CheckResult.__table__.indexes if idx.name in BENCH_INDEX_NAMES]
+
+
+def _fill(engine, rows: int, hosts: int, chunk: int = 20000):
+    """합성 데이터 채우기: 최근 180일에 고르게 분포, results는 작은 JSON"""
+    table = CheckResult.__table__
+    rng = random.Random(42)
+    end = datetime.now()
+    span = 180 * 24 * 3600
+    started = time.perf_counter()
+    for offset in range(0, rows, chunk):
+        batch = []
+        for i in range(offset, min(rows, offset + chunk)):
+            created = end - timedelta(seconds=rng.randrange(span))
+            batch.append({
+                "check_type": rng.choice(CHECK_TYPES),
+                "hostname": f"host-{rng.randrange(hosts):05d}",
+                "check_time": created.isoformat(),
+                "checker": f"checker-{rng.randrange(20)}",
+                "status": rng.choice(("success", "success", "success", "warning", "error")),
+                "results": {"cpu": {"usage": rng.randrange(100)}},
+                "created_at": created,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+        done = min(rows, offset + chunk)
+        if done % (chunk * 25) == 0 or done == rows:
+            print(f"  {done:,}/{rows:,}건 ({time.perf_counter() - started:.0f}s)")
+
+
+def _queries(limit: int):
+    """API 조회 형태 (get_check_results와 같은 ORDER BY created_at DESC LIMIT)"""
+    table = CheckResult.__table__
+    order = table.c.created_at.desc()
+    return [
+        ("check_type='os'", select(table).where(table.c.check_type == "os").order_by(order).limit(limit)),
+        ("hostname='host-00042'", select(table).where(table.c.hostname == "host-00042").order_by(order).limit(limit)),
+        ("필터 없음", select(table).order_by(order).limit(limit)),
+    ]
+
+
+def _explain(conn, stmt) -> str:
+    sql = str(stmt.compile(conn, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql)).fetchall()
+        return "\n".join(f"    {r[-1]}" for r in rows)
+    rows = conn.execute(text("EXPLAIN (ANALYZE, BUFFERS) " + sql)).fetchall()
+    return "\n".join(f"    {r[0]}" for r in rows)
+
+
+def _measure(engine, limit: int, repeat: int, label: str):
+    print(f"\n== {label} ==")
+    with engine.connect() as conn:
+        for name, stmt in _queries(limit):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                conn.execute(stmt).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"  [{name}] LIMIT {limit}: median {statistics.median(timings):.2f}ms, max {max(timings):.2f}ms")
+            print(_explain(conn, stmt))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check_results 복합 인덱스 벤치마크")
+    parser.add_argument("--database-url", default="sqlite:///./bench_check_results.db", help="벤치마크용 DB (운영 DB 사용 금지)")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="합성 행 수 (기본 2,000,000)")
+    parser.add_argument("--hosts", type=int, default=2000, help="서로 다른 hostname 수 (기본 2000)")
+    parser.add_argument("--limit", type=int, default=100, help="조회 LIMIT (기본 100, API 기본값과 동일)")
+    parser.add_argument("--repeat", type=int, default=5, help="쿼리별 반복 횟수 (기본 5)")
+    parser.add_argument("--reuse", action="store_true", help="기존 데이터를 지우지 않고 측정만")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    table = CheckResult.__table__
+    if not args.reuse:
+        print(f"{args.database_url}: check_results 재생성, {args.rows:,}건 채우는 중...")
+        table.drop(engine, checkfirst=True)
+        table.create(engine)
+        for idx in _bench_indexes():
+            idx.drop(engine)
+        _fill(engine, args.rows, args.hosts)
+    with engine.connect() as conn:
+        total = conn.execute(select(func.count()).select_from(table)).scalar()
+    print(f"행 수: {total:,}, dialect: {engine.dialect.name}")
+
+    for idx in _bench_indexes():
+        idx.drop(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE check_results"))
+    _measure(engine, args.limit, args.repeat, "복합 인덱스 없음 (단일 컬럼 인덱스만)")
+
+    started = time.perf_counter()
+    for idx in _bench_indexes():
+        idx.create(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE check_results"))
+    print(f"\n복합 인덱스 생성: {time.perf_counter() - started:.1f}s")
+    _measure(engine, args.limit, args.repeat, "복합 인덱스 있음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+로그인 폭주 시 이벤트 루프 지연 벤치마크 (bcrypt 인라인 실행 vs 비밀번호 스레드풀)
+
+동시에 N건의 비밀번호 검증을 실행하는 동안, 10ms마다 깨어나는 코루틴의 지연(lag)을 측정합니다.
+- inline: 기존 방식처럼 async 함수 안에서 verify_password를 직접 호출 (이벤트 루프가 멈춤)
+- pool:   verify_password_async (전용 스레드풀, 대기열 초과분은 PasswordHasherBusy로 거부)
+
+사용법 (api_server 디렉터리에서):
+  python bench_password_pool.py
+  python bench_password_pool.py --logins 50 --rounds 12
+  PASSWORD_WORKERS=4 PASSWORD_QUEUE_LIMIT=8 python bench_password_pool.py --logins 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _measure_lag(stop: asyncio.Event, interval: float, lags: list):
+    """interval마다 깨어나면서 예정 시각보다 늦은 정도(ms)를 기록"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+
+async def _run(mode: str, logins: int, hashed: str, interval: float):
+    import database
+
+    async def login_inline():
+        # 기존 auth_login과 같은 형태: async 함수 안에서 bcrypt 동기 호출
+        return database.verify_password("benchmark-password", hashed)
+
+    async def login_pool():
+        try:
+            return await database.verify_password_async("benchmark-password", hashed)
+        except database.PasswordHasherBusy:
+            return None
+
+    login = login_inline if mode == "inline" else login_pool
+    lags: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_measure_lag(stop, interval, lags))
+    await asyncio.sleep(interval * 3)  # 측정 코루틴 안정화
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+    return {
+        "mode": mode,
+        "elapsed_s": round(elapsed, 2),
+        "ok": sum(1 for r in results if r is True),
+        "rejected": sum(1 for r in results if r is None),
+        "lag_p50_ms": round(statistics.median(lags), 1) if lags else 0.0,
+        "lag_p95_ms": round(sorted(lags)[int(len(lags) * 0.95) - 1], 1) if lags else 0.0,
+        "lag_max_ms": round(max(lags), 1) if lags else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt 이벤트 루프 지연 벤치마크")
+    parser.add_argument("--logins", type=int, default=20, help="동시 로그인 건수 (기본 20)")
+    parser.add_argument("--rounds", type=int, default=None, help="bcrypt cost (기본: BCRYPT_ROUNDS 또는 12)")
+    parser.add_argument("--interval", type=float, default=0.01, help="지연 측정 주기 초 (기본 0.01)")
+    args = parser.parse_args()
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    import database
+
+    hashed = database.hash_password("benchmark-password")
+    print(
+        f"bcrypt rounds={database.BCRYPT_ROUNDS}, 동시 로그인 {args.logins}건, "
+        f"PASSWORD_WORKERS={database.PASSWORD_WORKERS}, PASSWORD_QUEUE_LIMIT={database.PASSWORD_QUEUE_LIMIT}"
+    )
+    print(f"{'mode':<8}{'소요(s)':>9}{'성공':>6}{'거부':>6}{'lag p50(ms)':>13}{'lag p95(ms)':>13}{'lag max(ms)':>13}")
+    for mode in ("inline", "pool"):
+        r = asyncio.run(_run(mode, args.logins, hashed, args.interval))
+        print(
+            f"{r['mode']:<8}{r['elapsed_s']:>9}{r['ok']:>6}{r['rejected']:>6}"
+            f"{r['lag_p50_ms']:>13}{r['lag_p95_ms']:>13}{r['lag_max_ms']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+check_results 월별 파티션 (PostgreSQL 선언적 파티셔닝, PARTITION BY RANGE (created_at))
+- 파티션: check_results_pYYYYMM = [그 달 1일, 다음 달 1일), 범위 밖 행은 check_results_default
+- created_at 조건이 있는 조회(기간 필터·keyset cursor·내보내기)는 PostgreSQL이 해당 달 파티션만 읽음 (partition pruning)
+- 보관 기간 삭제는 DELETE 대신 지난 달 파티션을 DROP
+- 기존 테이블 전환은 migrate_partition_check_results.py, 앞으로 쓸 파티션 생성·만료 삭제는
+  database.maintain_check_result_partitions (서버 기동 시·주기적으로 실행)
+SQLite는 파티셔닝을 지원하지 않으므로 단일 테이블 그대로 사용.
+
+함수의 conn은 SQLAlchemy Session 또는 Connection (호출한 트랜잭션 안에서 실행, 커밋은 호출자)
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+
+PARENT = "check_results"
+DEFAULT_PARTITION = "check_results_default"
+_NAME_RE = re.compile(r"^check_results_p(\d{4})(\d{2})$")
+
+# advisory lock 키 (pg_advisory_xact_lock(namespace, key)): 파티션 작업(생성·삭제) 직렬화, idempotency_key별 저장 직렬화
+LOCK_NAMESPACE = 0x43525054  # "CRPT"
+MAINTENANCE_LOCK_KEY = 0
+IDEMPOTENCY_LOCK_NAMESPACE = 0x43524B59  # "CRKY"
+
+
+def month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """dt가 속한 달에서 months개월 뒤(음수면 전) 달의 1일"""
+    index = dt.year * 12 + dt.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT}_p{month.year:04d}{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    """check_results가 파티션 테이블인지 (PostgreSQL이 아니면 False)"""
+    bind = conn.get_bind() if hasattr(conn, "get_bind") else conn
+    if bind.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent))"
+    ), {"parent": PARENT}).scalar())
+
+
+def list_partitions(conn) -> List[Tuple[str, datetime, datetime]]:
+    """월 파티션 (이름, 시작, 끝) 시작 순. default 파티션 제외"""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:parent)"
+    ), {"parent": PARENT}).scalars().all()
+    partitions = []
+    for name in names:
+        match = _NAME_RE.match(name)
+        if match:
+            start = datetime(int(match.group(1)), int(match.group(2)), 1)
+            partitions.append((name, start, add_months(start, 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def partition_stats(conn) -> List[Dict[str, Any]]:
+    """파티션별 이름·범위·예상 행 수(pg_class.reltuples, ANALYZE 전이면 -1). default 포함"""
+    estimates = dict(conn.execute(text(
+        "SELECT c.relname, c.reltuples FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:parent)"
+    ), {"parent": PARENT}).all())
+    stats = [
+        {"name": name, "from": start.isoformat(), "to": end.isoformat(), "rows_estimate": int(estimates.get(name, -1))}
+        for name, start, end in list_partitions(conn)
+    ]
+    if DEFAULT_PARTITION in estimates:
+        stats.append({"name": DEFAULT_PARTITION, "from": None, "to": None, "rows_estimate": int(estimates[DEFAULT_PARTITION])})
+    return stats
+
+
+def create_partition(conn, month: datetime):
+    """
+    month가 속한 달 파티션 생성. default 파티션에 그 달 행이 들어가 있으면 새 파티션으로 옮긴 뒤 연결
+    (default에 해당 범위 행이 남아 있으면 ATTACH가 실패하므로)
+    """
+    start, end = month_start(month), add_months(month, 1)
+    name = partition_name(start)
+    bounds = f"FROM ('{start:%Y-%m-%d %H:%M:%S}') TO ('{end:%Y-%m-%d %H:%M:%S}')"
+    conn.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT} INCLUDING DEFAULTS)'))
+    if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar():
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f'INSERT INTO "{name}" SELECT * FROM moved'
+        ), {"start": start, "end": end})
+    conn.execute(text(f'ALTER TABLE {PARENT} ATTACH PARTITION "{name}" FOR VALUES {bounds}'))
+
+
+def create_default_partition(conn):
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT"))
+
+
+def ensure_partitions(conn, first_month: datetime, last_month: datetime) -> List[str]:
+    """first_month~last_month 달 파티션 중 없는 것 생성. 생성한 파티션 이름 반환"""
+    existing = {name for name, _, _ in list_partitions(conn)}
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        name = partition_name(month)
+        if name not in existing:
+            create_partition(conn, month)
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(conn, cutoff: datetime) -> Tuple[List[str], int]:
+    """
+    끝이 cutoff 이전인 달 파티션 DROP, default 파티션의 cutoff 이전 행 삭제.
+    (삭제한 파티션 이름, default 파티션에서 삭제한 행 수) 반환
+    """
+    dropped = []
+    for name, _, end in list_partitions(conn):
+        if end <= cutoff:
+            conn.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+    deleted = 0
+    if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar():
+        deleted = conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"), {"cutoff": cutoff}).rowcount
+    return dropped, deleted
+
+
+def lock_maintenance(conn):
+    """트랜잭션이 끝날 때까지 파티션 작업 잠금 (worker 여러 개가 동시에 같은 파티션을 만들지 않도록)"""
+    conn.execute(text("SELECT pg_advisory_xact_lock(:ns, :key)"), {"ns": LOCK_NAMESPACE, "key": MAINTENANCE_LOCK_KEY})
+
+
+def lock_idempotency_keys(conn, keys: List[str]):
+    """
+    트랜잭션이 끝날 때까지 idempotency_key별 잠금 (키 정렬 순서로 잡아 교착 방지).
+    파티션 테이블에는 파티션 키(created_at)를 포함하지 않는 유니크 인덱스를 둘 수 없어서,
+    같은 키의 동시 저장은 이 잠금 + 저장 전 존재 확인으로 막음
+    """
+    conn.execute(text(
+        "SELECT pg_advisory_xact_lock(:ns, hashtext(k)) FROM (SELECT unnest(CAST(:keys AS text[])) AS k ORDER BY 1) s"
+    ), {"ns": IDEMPOTENCY_LOCK_NAMESPACE, "keys": sorted(set(keys))})
@@ -0,0 +1,118 @@
+"""
+컬럼형 내보내기 (Parquet / Arrow IPC) — GET /api/checks/export?format=parquet|arrow
+- 원본 results JSON 대신 저장된 요약(summary)에서 수치 지표(result_formatter.SUMMARY_METRICS)를 평탄화한 컬럼을 씀
+  → 분석 쪽에서 필요한 컬럼만 읽고 results를 다시 파싱하지 않아도 됨
+- 컬럼 타입 고정(int64/float64/timestamp), zstd 압축
+- 행을 batch_size건씩 record batch(Parquet row group)로 써서 바로 전송 → 건수와 무관하게 메모리 일정
+pyarrow가 필요합니다 (requirements.txt의 선택 패키지). 없으면 import 시 ImportError.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+
+import pyarrow as pa
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+
+from result_formatter import SUMMARY_METRICS, summary_metrics
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+COLUMNAR_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+COLUMNAR_COMPRESSION = "zstd"
+
+SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("check_type", pa.dictionary(pa.int32(), pa.string())),
+        ("hostname", pa.string()),
+        ("check_time", pa.string()),
+        ("checker", pa.string()),
+        ("status", pa.dictionary(pa.int32(), pa.string())),
+        ("created_at", pa.timestamp("us")),
+    ]
+    + [(column, pa.float64() if kind == "float" else pa.int64()) for column, _, kind in SUMMARY_METRICS]
+)
+
+
+class _ChunkSink:
+    """pyarrow writer 출력을 모아 두었다가 take()로 꺼내는 쓰기 전용 파일 객체 (스트리밍 응답용)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _record_batch(rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+    columns: Dict[str, list] = {name: [] for name in SCHEMA.names}
+    for r in rows:
+        columns["id"].append(r.get("id"))
+        columns["check_type"].append(r.get("check_type"))
+        columns["hostname"].append(r.get("hostname"))
+        columns["check_time"].append(r.get("check_time"))
+        columns["checker"].append(r.get("checker"))
+        columns["status"].append(r.get("status"))
+        created_at = r.get("created_at")
+        columns["created_at"].append(datetime.fromisoformat(created_at) if created_at else None)
+        for column, value in summary_metrics(r.get("summary")).items():
+            columns[column].append(value)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in SCHEMA], schema=SCHEMA
+    )
+
+
+def columnar_chunks(rows: Iterator[Dict[str, Any]], export_format: str, batch_size: int) -> Iterator[bytes]:
+    """
+    iter_check_results(..., with_summary=True) 행 → Parquet 또는 Arrow IPC 파일 바이트 덩어리.
+    batch_size건마다 한 번씩 써서 내보냄 (Parquet는 row group 1개, Arrow는 record batch 1개).
+    """
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, SCHEMA, compression=COLUMNAR_COMPRESSION)
+    else:
+        writer = pa_ipc.new_file(sink, SCHEMA, options=pa_ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION))
+    try:
+        batch: List[Dict[str, Any]] = []
+        for r in rows:
+            batch.append(r)
+            if len(batch) >= batch_size:
+                writer.write_batch(_record_batch(batch))
+                batch = []
+                chunk = sink.take()
+                if chunk:
+                    yield chunk
+        if batch:
+            writer.write_batch(_record_batch(batch))
+        writer.close()
+        chunk = sink.take()
+        if chunk:
+            yield chunk
+    finally:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
@@ -1,12 +1,27 @@
 """
 데이터베이스 연결 및 CRUD 작업
 """
+import asyncio
+import base64
+import functools
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
-from models import Base, CheckResult, User, Server, CheckItem
-from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import create_engine, func, or_, select, text, union_all
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import defer, sessionmaker, Session
+from models import Base, CheckResult, LatestCheckResult, User, Server, CheckItem, CacheVersion
+from result_formatter import SUMMARY_VERSION, build_summary, format_db_result, summary_to_row
+from result_cache import LRUCache
+import check_result_partitions as partitions
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet, Callable, TypeVar, Iterator, AsyncIterator, Sequence, Union
 from datetime import datetime
 
 # 비밀번호 해시 (bcrypt 직접 사용 - passlib와 bcrypt 5.x 호환 이슈 회피)
@@ -15,7 +30,7 @@ def hash_password(password: str) -> str:
     raw = password.encode("utf-8")
     if len(raw) > 72:
         raw = raw[:72]
-    return bcrypt.hashpw(raw, bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(raw, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 
 def verify_password(plain: str, hashed: str) -> bool:
@@ -38,6 +53,44 @@ if env_file.exists():
                 key, value = line.split("=", 1)
                 os.environ[key.strip()] = value.strip()
 
+# ---------- 비밀번호(bcrypt) 작업 스레드풀 ----------
+# bcrypt 1회는 100~300ms CPU를 쓰므로 async 라우트에서는 hash_password_async / verify_password_async로
+# 이벤트 루프·DB 스레드풀과 분리된 전용 스레드풀(PASSWORD_WORKERS개)에서 실행 (bcrypt는 해시 중 GIL을 놓음).
+# 실행 중 + 대기 중 작업이 PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT건을 넘으면 PasswordHasherBusy (라우트에서 503).
+# BCRYPT_ROUNDS(cost factor)는 새로 만드는 해시에만 적용되고, 기존 해시는 저장된 cost로 검증됨.
+BCRYPT_ROUNDS = min(31, max(4, int(os.getenv("BCRYPT_ROUNDS", 12))))
+PASSWORD_WORKERS = max(1, int(os.getenv("PASSWORD_WORKERS", 2)))
+PASSWORD_QUEUE_LIMIT = max(0, int(os.getenv("PASSWORD_QUEUE_LIMIT", 16)))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="password")
+_password_jobs_pending = 0
+
+
+class PasswordHasherBusy(Exception):
+    """비밀번호 작업 대기열이 가득 참 (로그인 폭주 시)"""
+
+
+async def _run_password_job(func: Callable[..., Any], *args) -> Any:
+    global _password_jobs_pending
+    if _password_jobs_pending >= PASSWORD_WORKERS + PASSWORD_QUEUE_LIMIT:
+        raise PasswordHasherBusy("로그인 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도하세요.")
+    _password_jobs_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _password_jobs_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password를 비밀번호 스레드풀에서 실행"""
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password를 비밀번호 스레드풀에서 실행"""
+    return await _run_password_job(verify_password, plain, hashed)
+
+
 # DB 연결 설정 (환경변수 또는 기본값)
 # .env 파일 또는 환경변수에서 DATABASE_URL을 읽음
 DB_FILE = os.path.join(os.path.dirname(__file__), "check_results.db")
@@ -68,6 +121,39 @@ else:
     )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ---------- 비동기 DB 접근 ----------
+# async 라우트는 동기 DB 함수를 직접 호출하지 말고 `await run_db(함수, 인자...)` 로 호출.
+# 전용 스레드풀(최대 DB_THREADPOOL_SIZE개)에서 실행되므로 느린 쿼리가 이벤트 루프를 막지 않고,
+# 동시 DB 작업 수가 제한되어 연결 풀(PostgreSQL: pool_size 5 + max_overflow 10)을 넘지 않음.
+DB_THREADPOOL_SIZE = max(1, int(os.getenv("DB_THREADPOOL_SIZE", 10)))
+db_executor = ThreadPoolExecutor(max_workers=DB_THREADPOOL_SIZE, thread_name_prefix="db")
+
+T = TypeVar("T")
+
+
+async def run_db(func: Callable[..., T], *args, **kwargs) -> T:
+    """동기 DB 함수를 DB 스레드풀에서 실행하고 결과를 await"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(func, *args, **kwargs))
+
+
+async def iterate_db(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    동기 이터레이터(DB 커서를 읽는 제너레이터 등)를 DB 스레드풀에서 한 항목씩 진행 (StreamingResponse용).
+    끝나거나 클라이언트가 끊어 중단되면 close()로 제너레이터의 세션을 정리.
+    """
+    done = object()
+    try:
+        while True:
+            item = await run_db(next, iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_db(close)
+
 
 def init_db():
     """데이터베이스 초기화 (테이블 생성)"""
@@ -93,13 +179,195 @@ def check_db_connection() -> Tuple[bool, str]:
         return False, str(e)
 
 
-def get_db() -> Session:
-    """DB 세션 가져오기"""
+async def get_db() -> AsyncIterator[Session]:
+    """
+    FastAPI 의존성: 요청당 DB 세션 1개.
+    인증(get_current_user)과 라우트의 조회가 같은 세션을 공유하므로 연결 풀 checkout이 요청당 1회.
+    세션은 스레드 안전하지 않으므로 한 요청 안에서 이 세션을 쓰는 run_db 호출을 동시에(gather) 실행하지 말 것.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_db(db.close)
+
+
+@contextmanager
+def session_scope(db: Optional[Session] = None) -> Iterator[Session]:
+    """
+    CRUD 함수 공용 세션 범위.
+    db(요청 세션)가 주어지면 그대로 쓰고 닫지 않음. 없으면(수집 대기열·스크립트 등) 새 세션을 열고 끝나면 닫음.
+    """
+    if db is not None:
+        yield db
+        return
     db = SessionLocal()
     try:
-        return db
+        yield db
     finally:
-        pass  # 세션은 호출자가 닫아야 함
+        db.close()
+
+
+# 연결 끊김 재시도 정책: 연결 풀 checkout 시 끊긴 연결은 pool_pre_ping이 걸러내므로,
+# 쿼리 도중 연결이 끊긴 경우(connection_invalidated)만 rollback 후 DB_RETRY_COUNT회 재시도 (읽기 쿼리용)
+DB_RETRY_COUNT = int(os.getenv("DB_RETRY_COUNT", 1))
+
+
+def run_with_retry(db: Session, func: Callable[[], T]) -> T:
+    """읽기 쿼리 func()를 실행하고, 연결이 끊긴 경우에만 재시도"""
+    for attempt in range(DB_RETRY_COUNT + 1):
+        try:
+            return func()
+        except DBAPIError as e:
+            if not e.connection_invalidated or attempt >= DB_RETRY_COUNT:
+                raise
+            db.rollback()
+
+
+# check_results 월별 파티션 (PostgreSQL, migrate_partition_check_results.py로 전환한 경우. check_result_partitions 참고)
+CHECK_RESULTS_PARTITION_MONTHS_AHEAD = max(1, int(os.getenv("CHECK_RESULTS_PARTITION_MONTHS_AHEAD", 3)))  # 이번 달 이후 미리 만들어 둘 달 수
+CHECK_RESULTS_RETENTION_MONTHS = max(0, int(os.getenv("CHECK_RESULTS_RETENTION_MONTHS", 0)))  # 이번 달 포함 보관할 달 수, 0이면 삭제 안 함
+
+_check_results_partitioned: Optional[bool] = None
+
+
+def check_results_partitioned(db: Session) -> bool:
+    """check_results가 파티션 테이블인지 (프로세스당 1회 확인. 전환은 서버를 멈추고 하므로 재시작하면 다시 확인)"""
+    global _check_results_partitioned
+    if _check_results_partitioned is None:
+        _check_results_partitioned = partitions.is_partitioned(db)
+    return _check_results_partitioned
+
+
+def _ensure_idempotency_keys_unused(db: Session, keys: List[Optional[str]]):
+    """
+    파티션 테이블은 idempotency_key 유니크 인덱스가 없으므로 키 잠금 후 이미 저장된 키가 있으면
+    유니크 위반과 같은 IntegrityError (호출자의 중복 처리 그대로 사용). 파티션이 아니면 DB 제약이 처리하므로 아무것도 안 함
+    """
+    keys = [k for k in keys if k]
+    if not keys or not check_results_partitioned(db):
+        return
+    partitions.lock_idempotency_keys(db, keys)
+    duplicate = db.query(CheckResult.idempotency_key).filter(CheckResult.idempotency_key.in_(keys)).first()
+    if duplicate is not None:
+        raise IntegrityError("idempotency_key 중복", {"idempotency_key": duplicate[0]}, Exception("duplicate idempotency_key"))
+
+
+def maintain_check_result_partitions(db: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    파티션된 check_results 관리 (서버 기동 시·주기적으로 실행, worker끼리는 advisory lock으로 직렬화):
+    이번 달~CHECK_RESULTS_PARTITION_MONTHS_AHEAD개월 뒤 파티션 생성,
+    CHECK_RESULTS_RETENTION_MONTHS가 지난 파티션 DROP(해당 기간 latest_check_results 행도 삭제).
+    파티션 테이블이 아니면(SQLite 포함) 아무것도 안 함.
+    """
+    with session_scope(db) as db:
+        if not check_results_partitioned(db):
+            return {"partitioned": False, "created": [], "dropped": []}
+        try:
+            partitions.lock_maintenance(db)
+            this_month = partitions.month_start(datetime.now())
+            created = partitions.ensure_partitions(
+                db, this_month, partitions.add_months(this_month, CHECK_RESULTS_PARTITION_MONTHS_AHEAD)
+            )
+            dropped: List[str] = []
+            if CHECK_RESULTS_RETENTION_MONTHS:
+                cutoff = partitions.add_months(this_month, 1 - CHECK_RESULTS_RETENTION_MONTHS)
+                dropped, deleted = partitions.drop_partitions_before(db, cutoff)
+                deleted += db.query(LatestCheckResult).filter(LatestCheckResult.created_at < cutoff).delete(synchronize_session=False)
+                if dropped or deleted:
+                    # 삭제한 결과가 ETag·응답 캐시에 남지 않도록 데이터 버전 +1 (DDL 잠금을 다 잡은 뒤 마지막에)
+                    _bump_cache_version(db, CHECK_RESULTS_VERSION_NAME)
+            db.commit()
+            return {"partitioned": True, "created": created, "dropped": dropped}
+        except Exception:
+            db.rollback()
+            raise
+
+
+def get_check_result_partitions(db: Optional[Session] = None) -> Dict[str, Any]:
+    """파티션 목록(범위·예상 행 수)과 설정 (관리자 확인용)"""
+    with session_scope(db) as db:
+        partitioned = check_results_partitioned(db)
+        return {
+            "partitioned": partitioned,
+            "months_ahead": CHECK_RESULTS_PARTITION_MONTHS_AHEAD,
+            "retention_months": CHECK_RESULTS_RETENTION_MONTHS,
+            "partitions": run_with_retry(db, lambda: partitions.partition_stats(db)) if partitioned else [],
+        }
+
+
+def _set_summary(check_result: CheckResult):
+    """저장 전에 표 형식 요약을 계산해 summary/summary_version에 넣음 (created_at이 정해진 뒤 호출)"""
+    summary = build_summary(check_result.to_dict())
+    check_result.summary = summary
+    check_result.summary_version = SUMMARY_VERSION if summary is not None else None
+
+
+def _upsert_latest_check_results(db: Session, check_results: List[CheckResult]):
+    """
+    방금 flush한 점검 결과로 latest_check_results upsert (호출한 트랜잭션과 함께 커밋).
+    같은 (check_type, hostname)이 여러 건이면 마지막 건만 반영.
+    """
+    latest: Dict[Tuple[str, str], CheckResult] = {}
+    for r in check_results:
+        latest[(r.check_type, r.hostname)] = r
+    values = [
+        {
+            "check_type": r.check_type,
+            "hostname": r.hostname,
+            "result_id": r.id,
+            "check_time": r.check_time,
+            "checker": r.checker,
+            "status": r.status,
+            "created_at": r.created_at,
+        }
+        for r in latest.values()
+    ]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(LatestCheckResult).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["check_type", "hostname"],
+            set_={c: stmt.excluded[c] for c in ("result_id", "check_time", "checker", "status", "created_at")},
+        )
+        db.execute(stmt)
+    else:
+        for v in values:
+            db.merge(LatestCheckResult(**v))
+
+
+def _insert_check_results(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    점검 결과 INSERT + latest_check_results upsert (커밋은 호출자. 중복 키 확인·저장이 같은 트랜잭션)
+    
+    SQLAlchemy 2.0의 insertmanyvalues로 flush 시 multi-row INSERT ... RETURNING 한 번에 처리됨.
+    
+    Returns:
+        저장된 레코드 ID 리스트 (rows 순서와 동일)
+    """
+    _ensure_idempotency_keys_unused(db, [row.get("idempotency_key") for row in rows])
+    now = datetime.now()
+    check_results = [
+        CheckResult(
+            check_type=row["check_type"],
+            hostname=row["hostname"],
+            check_time=row["check_time"],
+            checker=row.get("checker"),
+            status=row.get("status"),
+            results=row["results"],
+            idempotency_key=row.get("idempotency_key") or None,
+            created_at=now,
+        )
+        for row in rows
+    ]
+    for check_result in check_results:
+        _set_summary(check_result)
+    db.add_all(check_results)
+    db.flush()
+    _upsert_latest_check_results(db, check_results)
+    # 데이터 버전은 마지막에 올림 (PostgreSQL에서 버전 행 잠금을 커밋 직전에만 잡도록)
+    _bump_cache_version(db, CHECK_RESULTS_VERSION_NAME)
+    return [r.id for r in check_results]
 
 
 def save_check_result(
@@ -108,268 +376,656 @@ def save_check_result(
     check_time: str,
     checker: str,
     status: str,
-    results: Dict[str, Any]
+    results: Dict[str, Any],
+    idempotency_key: Optional[str] = None,
+    db: Optional[Session] = None,
 ) -> int:
     """
     점검 결과를 DB에 저장
     
+    Args:
+        idempotency_key: 지정 시 같은 키가 이미 저장돼 있으면 새로 저장하지 않고 기존 ID 반환
+    
     Returns:
         저장된 레코드의 ID
     """
-    db = SessionLocal()
+    row = {
+        "check_type": check_type,
+        "hostname": hostname,
+        "check_time": check_time,
+        "checker": checker,
+        "status": status,
+        "results": results,
+        "idempotency_key": idempotency_key,
+    }
+    with session_scope(db) as db:
+        try:
+            result_id = _insert_check_results(db, [row])[0]
+            db.commit()
+            return result_id
+        except IntegrityError as e:
+            # 동시 재전송으로 같은 idempotency_key가 먼저 저장된 경우
+            db.rollback()
+            if idempotency_key:
+                existing = db.query(CheckResult.id).filter(CheckResult.idempotency_key == idempotency_key).first()
+                if existing:
+                    return existing[0]
+            raise e
+        except Exception as e:
+            db.rollback()
+            raise e
+
+
+def save_check_results_bulk(rows: List[Dict[str, Any]], db: Optional[Session] = None) -> List[int]:
+    """
+    점검 결과 여러 건을 하나의 트랜잭션으로 저장 (배치 수집용). 한 건이라도 실패하면 전체 rollback 후 예외
+    
+    Args:
+        rows: check_type, hostname, check_time, checker, status, results 키를 가진 dict 리스트
+    
+    Returns:
+        저장된 레코드 ID 리스트 (rows 순서와 동일)
+    """
+    if not rows:
+        return []
+    with session_scope(db) as db:
+        try:
+            ids = _insert_check_results(db, rows)
+            db.commit()
+            return ids
+        except Exception as e:
+            db.rollback()
+            raise e
+
+
+def save_check_results_each(rows: List[Dict[str, Any]], db: Optional[Session] = None) -> List[Dict[str, Any]]:
+    """
+    점검 결과를 한 건씩 각자의 트랜잭션으로 저장 (save_check_results_bulk가 실패했을 때 문제 항목만 골라내는 용도)
+    
+    같은 idempotency_key가 먼저 저장돼 있으면(동시 재전송) 기존 ID를 중복으로 돌려주고,
+    그 밖의 오류(컬럼 길이 초과, DB가 거부하는 값 등)는 해당 항목만 실패로 기록.
+    
+    Returns:
+        rows 순서대로 {"id", "duplicate"} (실패한 항목은 id None + "error")
+    """
+    outcomes: List[Dict[str, Any]] = []
+    with session_scope(db) as db:
+        for row in rows:
+            key = row.get("idempotency_key")
+            try:
+                result_id = _insert_check_results(db, [row])[0]
+                db.commit()
+                outcomes.append({"id": result_id, "duplicate": False})
+                continue
+            except Exception as e:
+                db.rollback()
+                error = e
+            existing = None
+            if key and isinstance(error, IntegrityError):
+                try:
+                    existing = db.query(CheckResult.id).filter(CheckResult.idempotency_key == key).first()
+                except Exception:
+                    db.rollback()
+            if existing:
+                outcomes.append({"id": existing[0], "duplicate": True})
+            else:
+                outcomes.append({"id": None, "duplicate": False, "error": str(getattr(error, "orig", None) or error)})
+    return outcomes
+
+
+def get_check_result_ids_by_idempotency_keys(keys: List[str], db: Optional[Session] = None) -> Dict[str, int]:
+    """
+    이미 저장된 idempotency_key 조회 (중복 수집 방지용)
+    
+    Returns:
+        {idempotency_key: 점검 결과 ID}
+    """
+    keys = [k for k in set(keys or []) if k]
+    if not keys:
+        return {}
+    with session_scope(db) as db:
+        rows = db.query(CheckResult.idempotency_key, CheckResult.id).filter(
+            CheckResult.idempotency_key.in_(keys)
+        ).all()
+        return {key: result_id for key, result_id in rows}
+
+
+def get_check_result_by_id(result_id: int, db: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+    """ID로 점검 결과 1건 조회 (없으면 None)"""
+    with session_scope(db) as db:
+        result = db.query(CheckResult).filter(CheckResult.id == result_id).first()
+        return result.to_dict() if result else None
+
+
+# 점검 유형 필터: 단일 유형 또는 유형 리스트
+CheckTypeFilter = Optional[Union[str, Sequence[str]]]
+
+# 목록 조회에서 선택할 수 있는 컬럼 (CheckResult.to_dict 순서). 목록 화면용 요약은 results(원본 출력, 수 KB~) 제외
+CHECK_RESULT_FIELDS = ("id", "check_type", "hostname", "check_time", "checker", "status", "results", "created_at")
+CHECK_RESULT_SUMMARY_FIELDS = tuple(f for f in CHECK_RESULT_FIELDS if f != "results")
+
+
+def make_cursor(row: Dict[str, Any]) -> str:
+    """조회 결과 한 행(created_at ISO 문자열, id)으로 다음 페이지 cursor 생성 (base64url)"""
+    raw = f"{row['created_at']}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def parse_cursor(cursor: str) -> Tuple[datetime, int]:
+    """make_cursor로 만든 cursor → (created_at, id). 형식이 잘못되면 ValueError"""
     try:
-        check_result = CheckResult(
-            check_type=check_type,
-            hostname=hostname,
-            check_time=check_time,
-            checker=checker,
-            status=status,
-            results=results
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, result_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(result_id)
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"잘못된 cursor: {cursor}") from e
+
+
+def _filter_check_results(
+    query,
+    check_type: Optional[str] = None,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    ids: Optional[List[int]] = None,
+):
+    """점검 결과 조회 공통 필터 + 최신순(created_at DESC, id DESC) 정렬"""
+    if ids:
+        query = query.filter(CheckResult.id.in_(ids))
+    if check_type:
+        query = query.filter(CheckResult.check_type == check_type)
+    if hostname:
+        query = query.filter(CheckResult.hostname == hostname)
+    if checker:
+        query = query.filter(CheckResult.checker == checker)
+    if status:
+        query = query.filter(CheckResult.status == status)
+    if created_after is not None:
+        query = query.filter(CheckResult.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(CheckResult.created_at <= created_before)
+    if cursor is not None:
+        # keyset: (created_at, id) < cursor. created_at <= 조건은 복합 인덱스 범위 탐색에 쓰이고
+        # 같은 created_at 안에서만 id로 거름 → 페이지 깊이와 무관하게 일정한 비용
+        cursor_created_at, cursor_id = cursor
+        query = query.filter(
+            CheckResult.created_at <= cursor_created_at,
+            or_(CheckResult.created_at < cursor_created_at, CheckResult.id < cursor_id),
         )
-        db.add(check_result)
-        db.commit()
-        db.refresh(check_result)
-        return check_result.id
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    return query.order_by(CheckResult.created_at.desc(), CheckResult.id.desc())
+
+
+def _check_results_query(db: Session, check_type: CheckTypeFilter, limit: int, columns=None, **filters):
+    """
+    필터·최신순·limit을 적용한 CheckResult 쿼리 (한 번의 SQL). columns를 주면 그 컬럼만 SELECT.
+    check_type이 여러 개면 유형별로 (check_type, created_at) 인덱스에서 상위 limit건 id만 뽑아 UNION ALL 한 뒤
+    그 안에서 다시 정렬·limit. check_type IN (...) + ORDER BY는 인덱스 순서를 쓰지 못해 해당 유형 전체를 정렬하기 때문.
+    """
+    base = db.query(*columns) if columns else db.query(CheckResult)
+    check_types = [check_type] if isinstance(check_type, str) else list(dict.fromkeys(check_type or []))
+    if len(check_types) <= 1:
+        query = _filter_check_results(base, check_types[0] if check_types else None, **filters)
+        return query.limit(limit)
+    branches = []
+    for t in check_types:
+        top_ids = _filter_check_results(db.query(CheckResult.id), t, **filters).limit(limit).subquery()
+        branches.append(select(top_ids.c.id))
+    query = base.filter(CheckResult.id.in_(union_all(*branches)))
+    # 바깥 쿼리에도 기간 상·하한을 붙여 파티션 테이블에서는 해당 달 파티션의 id만 찾게 함 (partition pruning)
+    if filters.get("created_after") is not None:
+        query = query.filter(CheckResult.created_at >= filters["created_after"])
+    created_before, cursor = filters.get("created_before"), filters.get("cursor")
+    if cursor is not None and (created_before is None or cursor[0] < created_before):
+        created_before = cursor[0]
+    if created_before is not None:
+        query = query.filter(CheckResult.created_at <= created_before)
+    return query.order_by(CheckResult.created_at.desc(), CheckResult.id.desc()).limit(limit)
 
 
 def get_check_results(
-    check_type: Optional[str] = None,
+    check_type: CheckTypeFilter = None,
     hostname: Optional[str] = None,
     checker: Optional[str] = None,
     limit: int = 100,
     created_after: Optional[datetime] = None,
     created_before: Optional[datetime] = None,
     ids: Optional[List[int]] = None,
+    db: Optional[Session] = None,
+    status: Optional[str] = None,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    fields: Optional[Sequence[str]] = None,
 ) -> List[Dict[str, Any]]:
     """
     점검 결과 조회
     
     Args:
+        check_type: 점검 유형 또는 유형 리스트 (리스트면 check_type IN, 정렬·limit은 DB에서 한 번에)
         created_after: 이 시각 이후 created_at
         created_before: 이 시각 이전 created_at
         ids: 지정 시 해당 id만 조회 (다른 필터와 AND)
+        status: 상태 필터 (success, warning, error)
+        cursor: parse_cursor 결과. 지정 시 이 (created_at, id)보다 오래된 결과만 (keyset 페이지네이션)
+        fields: CHECK_RESULT_FIELDS 중 반환할 컬럼 (SQL에서 해당 컬럼만 조회). None이면 전체
     
     Returns:
-        점검 결과 리스트
+        점검 결과 리스트 (created_at, id 최신순)
     """
-    db = SessionLocal()
-    try:
-        # 연결 유효성 확인 (PostgreSQL의 경우)
-        if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
-            try:
-                db.execute(text("SELECT 1"))
-            except Exception:
-                # 연결이 끊어진 경우 세션 재생성
-                db.close()
-                db = SessionLocal()
-        
-        query = db.query(CheckResult)
-        
-        # 필터 적용
+    # cursor 생성에 id·created_at이 필요하므로 항상 포함
+    names = None
+    if fields is not None:
+        names = [f for f in CHECK_RESULT_FIELDS if f in fields or f in ("id", "created_at")]
+    columns = [getattr(CheckResult, f) for f in names] if names else None
+
+    def query_results() -> List[Dict[str, Any]]:
+        results = _check_results_query(
+            db, check_type, limit, columns=columns, hostname=hostname, checker=checker, status=status,
+            created_after=created_after, created_before=created_before, cursor=cursor, ids=ids,
+        ).all()
+        if names is None:
+            return [result.to_dict() for result in results]
+        rows = [row._asdict() for row in results]
+        for row in rows:
+            row["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+        return rows
+
+    with session_scope(db) as db:
+        return run_with_retry(db, query_results)
+
+
+# 내보내기 스트리밍 시 서버 측 커서에서 한 번에 가져오는 행 수
+EXPORT_BATCH_SIZE = max(1, int(os.getenv("EXPORT_BATCH_SIZE", 1000)))
+
+
+def iter_check_results(
+    check_type: Optional[str] = None,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    ids: Optional[List[int]] = None,
+    limit: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    fields: Sequence[str] = CHECK_RESULT_FIELDS,
+    with_summary: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    내보내기용 점검 결과 스트리밍 (최신순, to_dict와 같은 형태). limit이 None이면 전체.
+    yield_per로 batch_size건씩 읽고(PostgreSQL은 서버 측 커서) ORM 객체를 만들지 않으므로 건수와 무관하게 메모리 일정.
+    자체 세션을 열어 제너레이터가 끝나거나 close()될 때까지 연결 1개를 점유 (iterate_db로 소비).
+
+    Args:
+        fields: CHECK_RESULT_FIELDS 중 읽을 컬럼 (id·created_at은 항상 포함)
+        with_summary: True면 각 행에 "summary"(표 형식 요약) 추가. 요약이 없거나 버전이 다른 행만 results를 읽어 다시 계산
+    """
+    names = [f for f in CHECK_RESULT_FIELDS if f in fields or f in ("id", "created_at")]
+    columns = [getattr(CheckResult, f) for f in names]
+    if with_summary:
+        columns += [CheckResult.summary, CheckResult.summary_version]
+    stmt = _filter_check_results(
+        select(*columns), check_type, hostname, checker, status, created_after, created_before, None, ids
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    with session_scope() as db:
+        for row in db.execute(stmt.execution_options(yield_per=batch_size)):
+            item = row._asdict()
+            item["created_at"] = item["created_at"].isoformat() if item["created_at"] else None
+            if with_summary:
+                summary, version = item.pop("summary"), item.pop("summary_version")
+                if summary is None or version != SUMMARY_VERSION:
+                    results = item["results"] if "results" in item else db.query(CheckResult.results).filter(
+                        CheckResult.id == item["id"]
+                    ).scalar()
+                    summary = build_summary(dict(item, results=results))
+                item["summary"] = summary
+            yield item
+
+
+def count_check_results(
+    check_type: Optional[str] = None,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    ids: Optional[List[int]] = None,
+    db: Optional[Session] = None,
+) -> int:
+    """필터에 맞는 점검 결과 건수 (내보내기 작업 진행률용)"""
+    query = _filter_check_results(
+        select(func.count()).select_from(CheckResult),
+        check_type, hostname, checker, status, created_after, created_before, None, ids,
+    ).order_by(None)
+    with session_scope(db) as db:
+        return run_with_retry(db, lambda: db.execute(query).scalar() or 0)
+
+
+# check_results 데이터 버전 (cache_versions 행). 점검 결과를 저장·삭제하는 트랜잭션이 같은 트랜잭션에서 +1 하므로
+# 커밋 순서대로 증가함. max(id)는 PostgreSQL에서 시퀀스 값과 커밋 순서가 달라(작은 id가 나중에 커밋)
+# 새 결과가 보여도 바뀌지 않을 수 있고, 보관 기간 삭제도 반영하지 못해 쓰지 않음
+CHECK_RESULTS_VERSION_NAME = "check_results"
+
+
+def get_check_results_version(db: Optional[Session] = None) -> Tuple[str, Optional[datetime]]:
+    """
+    조회 API의 ETag/응답 캐시용 데이터 버전: ("r<데이터 버전>.<요약 버전>", 가장 최근 created_at(Last-Modified 표시용)).
+    cache_versions PK 1건과 created_at 인덱스 끝만 읽음.
+    """
+    query = select(
+        select(CacheVersion.version).where(CacheVersion.name == CHECK_RESULTS_VERSION_NAME).scalar_subquery(),
+        select(func.max(CheckResult.created_at)).scalar_subquery(),
+    )
+    with session_scope(db) as db:
+        version, last_created_at = run_with_retry(db, lambda: db.execute(query).one())
+    return f"r{version or 0}.{SUMMARY_VERSION}", last_created_at
+
+
+def _formatted_row(r: CheckResult, include_results: bool = True) -> Dict[str, Any]:
+    """저장된 요약이 현재 버전이면 그대로, 아니면 format_db_result로 계산. include_results=False면 원본 results 제외"""
+    if r.summary is not None and r.summary_version == SUMMARY_VERSION:
+        row = summary_to_row(r.summary, r.id, r.results if include_results else None)
+    else:
+        row = format_db_result(r.to_dict())
+    if not include_results:
+        row.pop("results", None)
+    return row
+
+
+def get_latest_check_results(
+    check_type: Optional[str] = None,
+    hostname: Optional[str] = None,
+    formatted: bool = False,
+    db: Optional[Session] = None,
+) -> List[Dict[str, Any]]:
+    """
+    (check_type, hostname)별 최신 점검 결과 (latest_check_results → check_results PK 조인).
+    이력 건수와 무관하게 호스트 수만큼만 읽음. formatted=True면 데이터 API와 같은 표 형식.
+    """
+    def query_rows() -> List[Dict[str, Any]]:
+        query = db.query(CheckResult).join(LatestCheckResult, LatestCheckResult.result_id == CheckResult.id)
         if check_type:
-            query = query.filter(CheckResult.check_type == check_type)
+            query = query.filter(LatestCheckResult.check_type == check_type)
         if hostname:
-            query = query.filter(CheckResult.hostname == hostname)
-        if checker:
-            query = query.filter(CheckResult.checker == checker)
-        if created_after is not None:
-            query = query.filter(CheckResult.created_at >= created_after)
-        if created_before is not None:
-            query = query.filter(CheckResult.created_at <= created_before)
-        if ids:
-            query = query.filter(CheckResult.id.in_(ids))
-        
-        # 최신순 정렬 및 제한
-        results = query.order_by(CheckResult.created_at.desc()).limit(limit).all()
-        
-        return [result.to_dict() for result in results]
-    except Exception as e:
-        # 연결 오류인 경우 재시도
-        if "connection" in str(e).lower() or "closed" in str(e).lower():
-            db.close()
-            db = SessionLocal()
-            try:
-                query = db.query(CheckResult)
-                if check_type:
-                    query = query.filter(CheckResult.check_type == check_type)
-                if hostname:
-                    query = query.filter(CheckResult.hostname == hostname)
-                if checker:
-                    query = query.filter(CheckResult.checker == checker)
-                if created_after is not None:
-                    query = query.filter(CheckResult.created_at >= created_after)
-                if created_before is not None:
-                    query = query.filter(CheckResult.created_at <= created_before)
-                if ids:
-                    query = query.filter(CheckResult.id.in_(ids))
-                results = query.order_by(CheckResult.created_at.desc()).limit(limit).all()
-                return [result.to_dict() for result in results]
-            except Exception as e2:
-                raise e2
-        else:
-            raise e
-    finally:
-        db.close()
+            query = query.filter(LatestCheckResult.hostname == hostname)
+        rows = query.order_by(LatestCheckResult.check_type.asc(), LatestCheckResult.hostname.asc()).all()
+        return [_formatted_row(r) if formatted else r.to_dict() for r in rows]
+
+    with session_scope(db) as db:
+        return run_with_retry(db, query_rows)
+
+
+# 포맷된 행 캐시: check_results.id -> 표 형식 행(원본 results 제외). 점검 결과는 저장 후 바뀌지 않으므로 무효화 없이 LRU로만 제한.
+# 크기는 행의 JSON 길이로 근사. FORMATTED_ROW_CACHE_MAX_BYTES=0이면 사용 안 함
+FORMATTED_ROW_CACHE_MAX_BYTES = int(os.getenv("FORMATTED_ROW_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+formatted_row_cache = LRUCache(
+    max_bytes=FORMATTED_ROW_CACHE_MAX_BYTES,
+    sizeof=lambda row: len(json.dumps(row, ensure_ascii=False, default=str)),
+)
+
+
+def get_check_result_summaries(ids: Sequence[int], db: Optional[Session] = None) -> List[Dict[str, Any]]:
+    """
+    WebSocket 변경 이벤트용: 지정한 결과의 목록 컬럼(CHECK_RESULT_SUMMARY_FIELDS) + formatted(데이터 API와 같은 표 형식 행, results 제외).
+    최신순. 포맷된 행은 formatted_row_cache에도 넣어 두므로 이후 데이터 API 조회에서 재사용됨.
+    """
+    if not ids:
+        return []
+
+    def query_rows() -> List[Dict[str, Any]]:
+        rows = db.query(CheckResult).options(defer(CheckResult.results)).filter(CheckResult.id.in_(list(ids)))
+        items = []
+        for r in rows.order_by(CheckResult.created_at.desc(), CheckResult.id.desc()).all():
+            formatted = formatted_row_cache.get(r.id)
+            if formatted is None:
+                formatted = _formatted_row(r, include_results=False)
+                formatted_row_cache.put(r.id, formatted)
+            item = {f: getattr(r, f) for f in CHECK_RESULT_SUMMARY_FIELDS}
+            item["created_at"] = r.created_at.isoformat() if r.created_at else None
+            item["formatted"] = dict(formatted)
+            items.append(item)
+        return items
+
+    with session_scope(db) as db:
+        return run_with_retry(db, query_rows)
+
+
+def get_formatted_check_results(
+    check_type: CheckTypeFilter = None,
+    limit: int = 100,
+    db: Optional[Session] = None,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    include_results: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    데이터 API(/api/*-checks/data)용 표 형식 점검 결과, 최신순. check_type(유형 리스트 가능)·필터·cursor는 get_check_results와 동일.
+    먼저 id만 조회해 formatted_row_cache에 있는 행은 그대로 쓰고, 없는 행만 읽어서 포맷 후 캐시에 넣음.
+    포맷은 저장된 summary를 쓰고, 없거나 summary_version이 다른 행만 format_db_result로 다시 계산.
+    include_results=False면 results 컬럼을 읽지 않음 (요약 재계산이 필요한 행만 그 행의 results를 추가 조회).
+    """
+    def query_rows() -> List[Dict[str, Any]]:
+        ids = [row.id for row in _check_results_query(
+            db, check_type, limit, columns=[CheckResult.id], hostname=hostname, checker=checker, status=status,
+            created_after=created_after, created_before=created_before, cursor=cursor,
+        ).all()]
+        rows = formatted_row_cache.get_many(ids)
+        results: Dict[int, Any] = {}
+        missing = [i for i in ids if i not in rows]
+        if missing:
+            query = db.query(CheckResult).filter(CheckResult.id.in_(missing))
+            if not include_results:
+                query = query.options(defer(CheckResult.results))
+            for r in query.all():
+                row = _formatted_row(r, include_results=False)
+                formatted_row_cache.put(r.id, row)
+                rows[r.id] = row
+                if include_results:
+                    results[r.id] = r.results
+        if include_results and len(results) < len(rows):
+            cached_ids = [i for i in rows if i not in results]
+            results.update(db.query(CheckResult.id, CheckResult.results).filter(CheckResult.id.in_(cached_ids)).all())
+        if not include_results:
+            return [dict(rows[i]) for i in ids if i in rows]
+        return [dict(rows[i], results=results.get(i)) for i in ids if i in rows]
+
+    with session_scope(db) as db:
+        return run_with_retry(db, query_rows)
 
 
 # ---------- User CRUD ----------
 
 
-def get_user_by_username(username: str) -> Optional[User]:
+def get_user_by_username(username: str, db: Optional[Session] = None) -> Optional[User]:
     """username으로 사용자 조회"""
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         return db.query(User).filter(User.username == username).first()
-    finally:
-        db.close()
 
 
-def get_user_by_id(user_id: int) -> Optional[User]:
+def get_user_by_id(user_id: int, db: Optional[Session] = None) -> Optional[User]:
     """id로 사용자 조회"""
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.id == user_id).first()
-    finally:
-        db.close()
-
-
-def create_user(username: str, password: str, email: Optional[str] = None) -> User:
-    """회원가입: 사용자 생성. 비밀번호는 해시 후 저장. 기본 역할 viewer."""
-    db = SessionLocal()
-    try:
-        user = User(
-            username=username,
-            email=email or None,
-            password_hash=hash_password(password),
-            is_approved=False,
-            is_admin=False,
-            role="viewer",
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        return user
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        return run_with_retry(db, lambda: db.query(User).filter(User.id == user_id).first())
+
+
+def create_user(
+    username: str,
+    password: str,
+    email: Optional[str] = None,
+    db: Optional[Session] = None,
+    password_hash: Optional[str] = None,
+) -> User:
+    """회원가입: 사용자 생성. 비밀번호는 해시 후 저장(password_hash를 미리 계산해 넘기면 그대로 사용). 기본 역할 viewer."""
+    with session_scope(db) as db:
+        try:
+            user = User(
+                username=username,
+                email=email or None,
+                password_hash=password_hash or hash_password(password),
+                is_approved=False,
+                is_admin=False,
+                role="viewer",
+            )
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            return user
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
-def get_all_users() -> List[User]:
+def get_all_users(db: Optional[Session] = None) -> List[User]:
     """가입자 목록 (승인 대기 포함) - 관리자용"""
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         return db.query(User).order_by(User.created_at.desc()).all()
-    finally:
-        db.close()
 
 
-def set_user_approved(user_id: int, approved: bool) -> Optional[User]:
+def set_user_approved(user_id: int, approved: bool, db: Optional[Session] = None) -> Optional[User]:
     """사용자 승인/거부 설정"""
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return None
-        user.is_approved = approved
-        db.commit()
-        db.refresh(user)
-        return user
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                return None
+            user.is_approved = approved
+            db.commit()
+            db.refresh(user)
+            invalidate_user_cache(user_id)
+            return user
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
-def delete_user(user_id: int) -> bool:
+def delete_user(user_id: int, db: Optional[Session] = None) -> bool:
     """사용자 삭제 (거부 시 선택적으로 사용)"""
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return False
-        db.delete(user)
-        db.commit()
-        return True
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                return False
+            db.delete(user)
+            db.commit()
+            invalidate_user_cache(user_id)
+            return True
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
-def set_user_role(user_id: int, role: str) -> Optional[User]:
+def set_user_role(user_id: int, role: str, db: Optional[Session] = None) -> Optional[User]:
     """사용자 역할 변경. role: admin | maintainer | operator | viewer."""
     if role not in ("admin", "maintainer", "operator", "viewer"):
         return None
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+    with session_scope(db) as db:
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                return None
+            user.role = role
+            user.is_admin = role == "admin"
+            db.commit()
+            db.refresh(user)
+            invalidate_user_cache(user_id)
+            return user
+        except Exception as e:
+            db.rollback()
+            raise e
+
+
+# 인증 사용자 캐시 (get_current_user용): user_id -> (저장 시각, User 컬럼 값), LRU + TTL.
+# 승인/역할 변경·삭제 시 같은 프로세스에서는 바로 무효화. 다른 worker는 최대 USER_CACHE_TTL초 뒤 반영.
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 30))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 1024))
+_user_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_user_cache_generation = 0
+_user_cache_lock = threading.Lock()
+
+
+def get_cached_user(user_id: int) -> Optional[User]:
+    """캐시에 있으면 세션에 속하지 않은 User 사본 반환 (DB 조회 없음). 없거나 만료되면 None."""
+    if USER_CACHE_TTL <= 0:
+        return None
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is None:
             return None
-        user.role = role
-        user.is_admin = role == "admin"
-        db.commit()
-        db.refresh(user)
-        return user
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+        if time.monotonic() - entry[0] >= USER_CACHE_TTL:
+            del _user_cache[user_id]
+            return None
+        _user_cache.move_to_end(user_id)
+        return User(**entry[1])
+
+
+def user_cache_generation() -> int:
+    """DB 조회 전에 읽어 두었다가 cache_user()에 넘김 (조회 중 무효화된 값을 캐시하지 않기 위함)"""
+    return _user_cache_generation
+
+
+def cache_user(user: User, generation: int) -> User:
+    """조회한 사용자를 캐시에 넣고 세션에 속하지 않은 User 사본 반환"""
+    values = {c.name: getattr(user, c.name) for c in User.__table__.columns}
+    if USER_CACHE_TTL > 0:
+        with _user_cache_lock:
+            if generation == _user_cache_generation:
+                _user_cache[user.id] = (time.monotonic(), values)
+                _user_cache.move_to_end(user.id)
+                while len(_user_cache) > USER_CACHE_SIZE:
+                    _user_cache.popitem(last=False)
+    return User(**values)
+
+
+def invalidate_user_cache(user_id: Optional[int] = None):
+    """사용자 캐시 무효화 (user_id 없으면 전체)"""
+    global _user_cache_generation
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id, None)
+        _user_cache_generation += 1
 
 
 # ---------- 서버(점검 대상) CRUD ----------
 
 
-def list_servers(check_enabled: Optional[bool] = None) -> List[Server]:
+def list_servers(check_enabled: Optional[bool] = None, db: Optional[Session] = None) -> List[Server]:
     """서버 목록. check_enabled로 필터 가능."""
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         q = db.query(Server).order_by(Server.id.asc())
         if check_enabled is not None:
             q = q.filter(Server.check_enabled == check_enabled)
         return q.all()
-    finally:
-        db.close()
 
 
-def get_server(server_id: int) -> Optional[Server]:
+def get_server(server_id: int, db: Optional[Session] = None) -> Optional[Server]:
     """서버 단건 조회."""
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         return db.query(Server).filter(Server.id == server_id).first()
-    finally:
-        db.close()
 
 
-def get_server_by_name(name: str) -> Optional[Server]:
+def get_server_by_name(name: str, db: Optional[Session] = None) -> Optional[Server]:
     """호스트명으로 서버 조회 (엑셀 일괄 업로드 등)."""
     if not name or not name.strip():
         return None
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         return db.query(Server).filter(Server.name == name.strip()).first()
-    finally:
-        db.close()
 
 
-def get_server_by_ip(ip: str) -> Optional[Server]:
+def get_server_by_ip(ip: str, db: Optional[Session] = None) -> Optional[Server]:
     """IP로 서버 조회 (엑셀 일괄 업로드 등)."""
     if not ip or not ip.strip():
         return None
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         return db.query(Server).filter(Server.ip == ip.strip()).first()
-    finally:
-        db.close()
 
 
 def create_server(
@@ -383,6 +1039,7 @@ def create_server(
     ssh_auth_type: str = "key_file",
     ssh_key_path: Optional[str] = None,
     ssh_password: Optional[str] = None,
+    db: Optional[Session] = None,
 ) -> Server:
     """서버 추가. ssh_password 있으면 암호화해 저장."""
     encrypted = None
@@ -392,29 +1049,27 @@ def create_server(
             encrypted = encrypt_password(ssh_password)
         except ValueError as e:
             raise ValueError("서버 SSH 비밀번호 저장을 위해 .env에 ENCRYPTION_KEY(또는 ANSIBLE_SERVER_ENCRYPTION_KEY)를 설정하세요.") from e
-    db = SessionLocal()
-    try:
-        s = Server(
-            name=name.strip(),
-            ip=ip.strip(),
-            os_type=(os_type or "linux").strip(),
-            ssh_port=ssh_port,
-            ssh_user=(ssh_user or "root").strip(),
-            check_enabled=check_enabled,
-            memo=memo.strip() if memo else None,
-            ssh_auth_type=(ssh_auth_type or "key_file").strip(),
-            ssh_key_path=ssh_key_path.strip() if ssh_key_path else None,
-            ssh_password_encrypted=encrypted,
-        )
-        db.add(s)
-        db.commit()
-        db.refresh(s)
-        return s
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            s = Server(
+                name=name.strip(),
+                ip=ip.strip(),
+                os_type=(os_type or "linux").strip(),
+                ssh_port=ssh_port,
+                ssh_user=(ssh_user or "root").strip(),
+                check_enabled=check_enabled,
+                memo=memo.strip() if memo else None,
+                ssh_auth_type=(ssh_auth_type or "key_file").strip(),
+                ssh_key_path=ssh_key_path.strip() if ssh_key_path else None,
+                ssh_password_encrypted=encrypted,
+            )
+            db.add(s)
+            db.commit()
+            db.refresh(s)
+            return s
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
 def update_server(
@@ -429,113 +1084,176 @@ def update_server(
     ssh_auth_type: Optional[str] = None,
     ssh_key_path: Optional[str] = None,
     ssh_password: Optional[str] = None,
+    db: Optional[Session] = None,
 ) -> Optional[Server]:
     """서버 수정. None인 필드는 변경하지 않음. ssh_password 비우면 유지."""
-    db = SessionLocal()
-    try:
-        s = db.query(Server).filter(Server.id == server_id).first()
-        if not s:
-            return None
-        if name is not None:
-            s.name = name.strip()
-        if ip is not None:
-            s.ip = ip.strip()
-        if os_type is not None:
-            s.os_type = os_type.strip()
-        if ssh_port is not None:
-            s.ssh_port = ssh_port
-        if ssh_user is not None:
-            s.ssh_user = ssh_user.strip()
-        if check_enabled is not None:
-            s.check_enabled = check_enabled
-        if memo is not None:
-            s.memo = memo.strip() or None
-        if ssh_auth_type is not None:
-            s.ssh_auth_type = ssh_auth_type.strip()
-        if ssh_key_path is not None:
-            s.ssh_key_path = ssh_key_path.strip() or None
-        if ssh_password is not None and (ssh_auth_type or getattr(s, "ssh_auth_type", "key_file")) == "password":
-            if ssh_password.strip():
-                try:
-                    from crypto_util import encrypt_password
-                    s.ssh_password_encrypted = encrypt_password(ssh_password)
-                except ValueError as e:
-                    raise ValueError("서버 SSH 비밀번호 저장을 위해 .env에 ENCRYPTION_KEY(또는 ANSIBLE_SERVER_ENCRYPTION_KEY)를 설정하세요.") from e
-            # 비밀번호 미입력(빈 값) 시: 기존 값 유지. 변경하지 않음.
-        from datetime import datetime
-        s.updated_at = datetime.now()
-        db.commit()
-        db.refresh(s)
-        return s
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            s = db.query(Server).filter(Server.id == server_id).first()
+            if not s:
+                return None
+            if name is not None:
+                s.name = name.strip()
+            if ip is not None:
+                s.ip = ip.strip()
+            if os_type is not None:
+                s.os_type = os_type.strip()
+            if ssh_port is not None:
+                s.ssh_port = ssh_port
+            if ssh_user is not None:
+                s.ssh_user = ssh_user.strip()
+            if check_enabled is not None:
+                s.check_enabled = check_enabled
+            if memo is not None:
+                s.memo = memo.strip() or None
+            if ssh_auth_type is not None:
+                s.ssh_auth_type = ssh_auth_type.strip()
+            if ssh_key_path is not None:
+                s.ssh_key_path = ssh_key_path.strip() or None
+            if ssh_password is not None and (ssh_auth_type or getattr(s, "ssh_auth_type", "key_file")) == "password":
+                if ssh_password.strip():
+                    try:
+                        from crypto_util import encrypt_password
+                        s.ssh_password_encrypted = encrypt_password(ssh_password)
+                    except ValueError as e:
+                        raise ValueError("서버 SSH 비밀번호 저장을 위해 .env에 ENCRYPTION_KEY(또는 ANSIBLE_SERVER_ENCRYPTION_KEY)를 설정하세요.") from e
+                # 비밀번호 미입력(빈 값) 시: 기존 값 유지. 변경하지 않음.
+            from datetime import datetime
+            s.updated_at = datetime.now()
+            db.commit()
+            db.refresh(s)
+            return s
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
-def delete_server(server_id: int) -> bool:
+def delete_server(server_id: int, db: Optional[Session] = None) -> bool:
     """서버 삭제."""
-    db = SessionLocal()
-    try:
-        s = db.query(Server).filter(Server.id == server_id).first()
-        if not s:
-            return False
-        db.delete(s)
-        db.commit()
-        return True
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            s = db.query(Server).filter(Server.id == server_id).first()
+            if not s:
+                return False
+            db.delete(s)
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
-def set_server_check_enabled(server_id: int, enabled: bool) -> Optional[Server]:
+def set_server_check_enabled(server_id: int, enabled: bool, db: Optional[Session] = None) -> Optional[Server]:
     """서버 점검 대상 여부 설정."""
-    return update_server(server_id, check_enabled=enabled)
+    return update_server(server_id, check_enabled=enabled, db=db)
 
 
 # ---------- 점검 항목(CheckItem) CRUD ----------
 
 
-def list_check_items(check_type: Optional[str] = None) -> List[CheckItem]:
+def list_check_items(check_type: Optional[str] = None, db: Optional[Session] = None) -> List[CheckItem]:
     """점검 항목 목록. check_type 지정 시 해당 유형만."""
-    db = SessionLocal()
-    try:
+    with session_scope(db) as db:
         q = db.query(CheckItem).order_by(CheckItem.check_type.asc(), CheckItem.sort_order.asc(), CheckItem.item_key.asc())
         if check_type:
             q = q.filter(CheckItem.check_type == check_type)
         return q.all()
-    finally:
-        db.close()
 
 
-def get_check_item(item_id: int) -> Optional[CheckItem]:
+def get_check_item(item_id: int, db: Optional[Session] = None) -> Optional[CheckItem]:
     """점검 항목 단건 조회."""
+    with session_scope(db) as db:
+        return db.query(CheckItem).filter(CheckItem.id == item_id).first()
+
+
+# 활성 점검 항목 캐시: check_type -> item_key frozenset (항목 없으면 None).
+# 같은 프로세스의 변경은 CRUD 함수가 바로 무효화하고, 다른 worker의 변경은
+# cache_versions 테이블 버전을 CHECK_ITEMS_CACHE_CHECK_INTERVAL초마다 비교해 감지.
+CHECK_ITEMS_CACHE_NAME = "check_items"
+CHECK_ITEMS_CACHE_CHECK_INTERVAL = float(os.getenv("CHECK_ITEMS_CACHE_CHECK_INTERVAL", 5))
+_enabled_item_keys_cache: Dict[str, Optional[FrozenSet[str]]] = {}
+_enabled_item_keys_cache_version: Optional[int] = None
+_enabled_item_keys_cache_checked_at = 0.0
+_enabled_item_keys_cache_generation = 0
+_enabled_item_keys_cache_lock = threading.Lock()
+
+
+def _get_cache_version(db: Session, name: str) -> int:
+    row = db.query(CacheVersion.version).filter(CacheVersion.name == name).first()
+    return row[0] if row else 0
+
+
+def _bump_cache_version(db: Session, name: str):
+    """캐시 버전 +1 (호출한 트랜잭션과 함께 커밋됨). 행이 없을 때 동시에 만들어도 충돌하지 않도록 upsert"""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(CacheVersion).values(name=name, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["name"], set_={"version": CacheVersion.version + 1}
+        ))
+        return
+    updated = db.query(CacheVersion).filter(CacheVersion.name == name).update(
+        {CacheVersion.version: CacheVersion.version + 1}, synchronize_session=False
+    )
+    if not updated:
+        db.add(CacheVersion(name=name, version=1))
+
+
+def invalidate_enabled_item_keys_cache():
+    """활성 점검 항목 캐시 비우기 (점검 항목 추가/수정/삭제 후 호출)"""
+    global _enabled_item_keys_cache_version, _enabled_item_keys_cache_generation
+    with _enabled_item_keys_cache_lock:
+        _enabled_item_keys_cache.clear()
+        _enabled_item_keys_cache_version = None
+        _enabled_item_keys_cache_generation += 1
+
+
+def _sync_enabled_item_keys_cache():
+    """다른 worker에서 점검 항목이 바뀌었는지 버전으로 확인 (주기 제한)"""
+    global _enabled_item_keys_cache_version, _enabled_item_keys_cache_checked_at, _enabled_item_keys_cache_generation
+    now = time.monotonic()
+    if (
+        _enabled_item_keys_cache_version is not None
+        and now - _enabled_item_keys_cache_checked_at < CHECK_ITEMS_CACHE_CHECK_INTERVAL
+    ):
+        return
     db = SessionLocal()
     try:
-        return db.query(CheckItem).filter(CheckItem.id == item_id).first()
+        version = _get_cache_version(db, CHECK_ITEMS_CACHE_NAME)
     finally:
         db.close()
+    with _enabled_item_keys_cache_lock:
+        if version != _enabled_item_keys_cache_version:
+            _enabled_item_keys_cache.clear()
+            _enabled_item_keys_cache_generation += 1
+            _enabled_item_keys_cache_version = version
+        _enabled_item_keys_cache_checked_at = now
 
 
-def get_enabled_item_keys_for_type(check_type: str) -> Optional[List[str]]:
+def get_enabled_item_keys_for_type(check_type: str) -> Optional[FrozenSet[str]]:
     """
-    해당 점검 유형에서 활성화된 item_key 목록.
+    해당 점검 유형에서 활성화된 item_key 집합 (캐시 사용).
     등록된 항목이 하나도 없으면 None (필터 없이 전체 저장).
     """
+    _sync_enabled_item_keys_cache()
+    with _enabled_item_keys_cache_lock:
+        if check_type in _enabled_item_keys_cache:
+            return _enabled_item_keys_cache[check_type]
+        generation = _enabled_item_keys_cache_generation
     db = SessionLocal()
     try:
-        rows = db.query(CheckItem).filter(
+        rows = db.query(CheckItem.item_key).filter(
             CheckItem.check_type == check_type,
             CheckItem.enabled == True
-        ).order_by(CheckItem.sort_order.asc(), CheckItem.item_key.asc()).all()
-        if not rows:
-            return None
-        return [r.item_key for r in rows]
+        ).all()
     finally:
         db.close()
+    keys = frozenset(r[0] for r in rows) or None
+    with _enabled_item_keys_cache_lock:
+        # 조회 중에 무효화됐으면 오래된 값일 수 있으므로 캐시에 넣지 않음
+        if generation == _enabled_item_keys_cache_generation:
+            _enabled_item_keys_cache[check_type] = keys
+    return keys
 
 
 def create_check_item(
@@ -544,34 +1262,35 @@ def create_check_item(
     display_name: Optional[str] = None,
     enabled: bool = True,
     sort_order: int = 0,
+    db: Optional[Session] = None,
 ) -> CheckItem:
     """점검 항목 추가. 동일 check_type + item_key 중복 시 예외."""
-    db = SessionLocal()
-    try:
-        existing = db.query(CheckItem).filter(
-            CheckItem.check_type == check_type,
-            CheckItem.item_key == (item_key or "").strip()
-        ).first()
-        if existing:
-            raise ValueError(f"이미 존재하는 항목입니다: {check_type} / {item_key}")
-        item = CheckItem(
-            check_type=(check_type or "").strip(),
-            item_key=(item_key or "").strip(),
-            display_name=(display_name or "").strip() or None,
-            enabled=enabled,
-            sort_order=sort_order,
-        )
-        db.add(item)
-        db.commit()
-        db.refresh(item)
-        return item
-    except ValueError:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            existing = db.query(CheckItem).filter(
+                CheckItem.check_type == check_type,
+                CheckItem.item_key == (item_key or "").strip()
+            ).first()
+            if existing:
+                raise ValueError(f"이미 존재하는 항목입니다: {check_type} / {item_key}")
+            item = CheckItem(
+                check_type=(check_type or "").strip(),
+                item_key=(item_key or "").strip(),
+                display_name=(display_name or "").strip() or None,
+                enabled=enabled,
+                sort_order=sort_order,
+            )
+            db.add(item)
+            _bump_cache_version(db, CHECK_ITEMS_CACHE_NAME)
+            db.commit()
+            db.refresh(item)
+            invalidate_enabled_item_keys_cache()
+            return item
+        except ValueError:
+            raise
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
 def update_check_item(
@@ -579,44 +1298,45 @@ def update_check_item(
     display_name: Optional[str] = None,
     enabled: Optional[bool] = None,
     sort_order: Optional[int] = None,
+    db: Optional[Session] = None,
 ) -> Optional[CheckItem]:
     """점검 항목 수정."""
-    db = SessionLocal()
-    try:
-        item = db.query(CheckItem).filter(CheckItem.id == item_id).first()
-        if not item:
-            return None
-        if display_name is not None:
-            item.display_name = (display_name or "").strip() or None
-        if enabled is not None:
-            item.enabled = enabled
-        if sort_order is not None:
-            item.sort_order = sort_order
-        db.commit()
-        db.refresh(item)
-        return item
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            item = db.query(CheckItem).filter(CheckItem.id == item_id).first()
+            if not item:
+                return None
+            if display_name is not None:
+                item.display_name = (display_name or "").strip() or None
+            if enabled is not None:
+                item.enabled = enabled
+            if sort_order is not None:
+                item.sort_order = sort_order
+            _bump_cache_version(db, CHECK_ITEMS_CACHE_NAME)
+            db.commit()
+            db.refresh(item)
+            invalidate_enabled_item_keys_cache()
+            return item
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
-def delete_check_item(item_id: int) -> bool:
+def delete_check_item(item_id: int, db: Optional[Session] = None) -> bool:
     """점검 항목 삭제."""
-    db = SessionLocal()
-    try:
-        item = db.query(CheckItem).filter(CheckItem.id == item_id).first()
-        if not item:
-            return False
-        db.delete(item)
-        db.commit()
-        return True
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
+    with session_scope(db) as db:
+        try:
+            item = db.query(CheckItem).filter(CheckItem.id == item_id).first()
+            if not item:
+                return False
+            db.delete(item)
+            _bump_cache_version(db, CHECK_ITEMS_CACHE_NAME)
+            db.commit()
+            invalidate_enabled_item_keys_cache()
+            return True
+        except Exception as e:
+            db.rollback()
+            raise e
 
 
 def seed_default_check_items_if_empty():
@@ -692,7 +1412,9 @@ def seed_default_check_items_if_empty():
                 enabled=True,
                 sort_order=sort_order,
             ))
+        _bump_cache_version(db, CHECK_ITEMS_CACHE_NAME)
         db.commit()
+        invalidate_enabled_item_keys_cache()
     except Exception as e:
         db.rollback()
         raise e
@@ -700,12 +1422,12 @@ def seed_default_check_items_if_empty():
         db.close()
 
 
-def list_servers_for_inventory() -> List[Dict[str, Any]]:
+def list_servers_for_inventory(db: Optional[Session] = None) -> List[Dict[str, Any]]:
     """
     동적 inventory용. check_enabled=True인 서버만, hostvars에 ansible_* 및 비밀번호(복호화) 포함.
     반환: [ {"host": "name_or_name_id", "hostvars": {...}}, ... ]
     """
-    servers = list_servers(check_enabled=True)
+    servers = list_servers(check_enabled=True, db=db)
     seen_names = {}
     out = []
     for s in servers:
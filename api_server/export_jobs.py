@@ -0,0 +1,280 @@
+"""
+백그라운드 내보내기 작업 (POST /api/checks/export/jobs)
+- 요청은 작업을 등록하고 즉시 job_id 반환, 실제 내보내기는 전용 스레드풀(EXPORT_JOB_WORKERS)에서 실행
+- 결과 파일은 내보내기 디렉터리(EXPORT_DIR)에 <job_id>.<확장자>로 저장 (작성 중에는 .part)
+- 작업 상태는 <job_id>.json 파일에 기록 → 같은 서버의 다른 uvicorn worker에서도 조회·다운로드 가능
+- 완료(또는 실패) 후 ttl초가 지난 작업은 cleanup()에서 파일과 함께 삭제
+- 이 프로세스의 대기+실행 작업이 max_pending을 넘으면 ExportJobQueueFull (엔드포인트에서 429로 응답)
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ExportJobQueueFull(Exception):
+    """대기 중인 내보내기 작업이 너무 많음 (backpressure)"""
+
+
+class ExportProgress:
+    """작업 스레드에서 진행 상황 기록. 상태 파일은 최대 1초에 한 번만 갱신."""
+
+    def __init__(self, jobs: "ExportJobs", job: Dict[str, Any]):
+        self._jobs = jobs
+        self._job = job
+        self._saved_at = 0.0
+
+    def set_total(self, total: int):
+        """예상 건수 (진행률 계산용)"""
+        self._job["total"] = total
+        self._save(force=True)
+
+    def track(self, rows: Iterator[Any]) -> Iterator[Any]:
+        """rows를 그대로 넘기면서 처리 건수를 셈. 중단되면 rows도 close()"""
+        try:
+            for row in rows:
+                yield row
+                self._job["rows"] += 1
+                self._save()
+        finally:
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+
+    def _save(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._saved_at >= 1.0:
+            self._saved_at = now
+            self._jobs._write_state(self._job)
+
+
+# 작업 본문: 진행 기록기를 받아 파일에 쓸 바이트 덩어리를 내는 함수 (작업 스레드에서 실행)
+ExportBuilder = Callable[[ExportProgress], Iterator[bytes]]
+
+
+class ExportJobs:
+    """
+    Args:
+        directory: 결과·상태 파일을 둘 디렉터리 (없으면 생성)
+        workers: 동시에 실행할 내보내기 작업 수 (작업마다 DB 연결 1개 점유)
+        max_pending: 이 프로세스에서 대기+실행 중인 작업 최대 수. 초과 시 submit()이 ExportJobQueueFull
+        ttl: 완료·실패 후 파일을 보관할 시간(초)
+        cleanup_interval: start() 후 cleanup()을 실행할 주기(초)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        workers: int = 2,
+        max_pending: int = 10,
+        ttl: float = 86400,
+        cleanup_interval: float = 600,
+    ):
+        self.directory = Path(directory)
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """주기적 cleanup task 시작 (lifespan에서 호출)"""
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def stop(self):
+        """cleanup task와 작업 스레드풀 종료. 실행 중인 작업은 조회 시 failed로 표시됨"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(
+        self,
+        build: ExportBuilder,
+        extension: str,
+        media_type: str,
+        owner_id: Optional[int],
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """작업 등록 후 상태 반환. 대기열이 가득 차면 ExportJobQueueFull."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExportJobQueueFull(f"내보내기 작업 대기열이 가득 찼습니다 (최대 {self.max_pending}건)")
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "filename": f"check_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+            "extension": extension,
+            "media_type": media_type,
+            "params": params,
+            "owner_id": owner_id,
+            "pid": os.getpid(),
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "total": None,
+            "rows": 0,
+            "size_bytes": None,
+            "error": None,
+        }
+        self._write_state(job)
+        self._executor.submit(self._run, job, build)
+        return self.public(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """상태 파일에서 작업 조회 (없거나 잘못된 id면 None)"""
+        if not _JOB_ID_RE.match(job_id or ""):
+            return None
+        try:
+            with open(self._state_path(job_id), encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if job["status"] in ("queued", "running") and not _process_alive(job.get("pid")):
+            job["status"] = "failed"
+            job["error"] = "작업을 실행하던 서버 프로세스가 종료되었습니다."
+        return job
+
+    def artifact_path(self, job: Dict[str, Any]) -> Path:
+        return self.directory / f"{job['job_id']}.{job['extension']}"
+
+    def public(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """API 응답용 상태 (진행률·만료 시각 포함, 내부 필드 제외)"""
+        total = job.get("total")
+        finished_at = job.get("finished_at")
+        return {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "filename": job["filename"],
+            "params": job["params"],
+            "rows": job["rows"],
+            "total": total,
+            "progress": 100.0 if job["status"] == "done" else (
+                round(min(job["rows"] / total * 100, 99.9), 1) if total else None
+            ),
+            "size_bytes": job.get("size_bytes"),
+            "error": job.get("error"),
+            "created_at": _iso(job.get("created_at")),
+            "started_at": _iso(job.get("started_at")),
+            "finished_at": _iso(finished_at),
+            "expires_at": _iso(finished_at + self.ttl) if finished_at else None,
+        }
+
+    def cleanup(self) -> int:
+        """완료·실패 후 ttl이 지난 작업(상태·결과·작성 중 파일) 삭제. 삭제한 작업 수 반환"""
+        if not self.directory.exists():
+            return 0
+        now = time.time()
+        removed = 0
+        for state_path in self.directory.glob("*.json"):
+            job = self.get(state_path.stem)
+            if job is None:
+                continue
+            finished_at = job.get("finished_at")
+            if job["status"] == "failed" and not finished_at:
+                finished_at = job.get("created_at")  # 프로세스 종료로 중단된 작업
+            if not finished_at or now - finished_at < self.ttl:
+                continue
+            for path in (self.artifact_path(job), self._part_path(job), state_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            removed += 1
+        return removed
+
+    async def _cleanup_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                removed = await loop.run_in_executor(None, self.cleanup)
+                if removed:
+                    print(f"만료된 내보내기 작업 {removed}건 삭제")
+            except Exception as e:
+                print(f"내보내기 작업 정리 실패: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+    def _run(self, job: Dict[str, Any], build: ExportBuilder):
+        part_path = self._part_path(job)
+        try:
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            self._write_state(job)
+            with open(part_path, "wb") as f:
+                for chunk in build(ExportProgress(self, job)):
+                    f.write(chunk)
+            os.replace(part_path, self.artifact_path(job))
+            job["status"] = "done"
+            job["size_bytes"] = self.artifact_path(job).stat().st_size
+        except Exception as e:
+            traceback.print_exc()
+            job["status"] = "failed"
+            job["error"] = str(e)
+            try:
+                part_path.unlink()
+            except FileNotFoundError:
+                pass
+        finally:
+            job["finished_at"] = time.time()
+            self._write_state(job)
+            with self._lock:
+                self._pending -= 1
+
+    def _state_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def _part_path(self, job: Dict[str, Any]) -> Path:
+        return self.directory / f"{job['job_id']}.{job['extension']}.part"
+
+    def _write_state(self, job: Dict[str, Any]):
+        """상태 파일을 임시 파일에 쓰고 교체 (다른 worker가 반쯤 쓴 파일을 읽지 않도록)"""
+        path = self._state_path(job["job_id"])
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
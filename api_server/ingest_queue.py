@@ -0,0 +1,230 @@
+"""
+점검 결과 수집용 비동기 write-behind 큐
+- POST /api/checks 요청은 큐에 넣고 즉시 202 + receipt_id 반환
+- 백그라운드 writer task가 batch_size건이 모이거나 flush_interval초가 지나면 모아서 한 트랜잭션으로 저장
+- 재시도 후에도 배치 저장이 실패하면 한 건씩 저장해 문제 항목의 receipt만 failed (나머지는 저장)
+- DB 저장(동기 SQLAlchemy)은 DB 스레드풀에서 실행해 이벤트 루프를 막지 않음
+- 큐가 가득 차면 IngestQueueFull (엔드포인트에서 429로 응답)
+"""
+import asyncio
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class IngestQueueFull(Exception):
+    """큐가 가득 차서 더 받을 수 없음 (backpressure)"""
+
+
+class IngestQueue:
+    """
+    Args:
+        writer: 동기 함수. 항목 리스트를 저장하고 항목 순서대로 {"id", "duplicate"} dict 리스트 반환
+            (항목 하나만 저장하지 못했으면 그 항목 dict에 "error"를 넣어 반환, 예외는 배치 전체 실패)
+        on_flushed: 저장 성공 후 호출할 코루틴 함수 (items, outcomes). WebSocket 알림 등
+        max_size: 큐 최대 길이. 초과 시 submit()이 IngestQueueFull
+        batch_size: 한 트랜잭션에 저장할 최대 건수
+        flush_interval: 첫 항목이 들어온 뒤 이 시간(초)이 지나면 batch_size 미만이어도 저장
+        max_receipts: 상태 조회용으로 보관할 receipt 수 (오래된 것부터 삭제)
+        retry_count: 저장 실패 시 재시도 횟수
+        executor: writer를 실행할 스레드풀 (None이면 이벤트 루프 기본 스레드풀)
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Any]], List[Dict[str, Any]]],
+        on_flushed: Optional[Callable[[List[Any], List[Dict[str, Any]]], Awaitable[None]]] = None,
+        max_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_receipts: int = 10000,
+        retry_count: int = 3,
+        executor: Optional[Executor] = None,
+    ):
+        self.writer = writer
+        self.on_flushed = on_flushed
+        self.max_size = max_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_receipts = max_receipts
+        self.retry_count = retry_count
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._receipts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {
+            "enqueued_total": 0,
+            "rejected_total": 0,
+            "flushed_total": 0,
+            "failed_total": 0,
+            "flush_count": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": None,
+            "max_flush_ms": None,
+            "total_flush_ms": 0.0,
+            "last_queue_wait_ms": None,
+            "last_flush_at": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """writer task 시작 (lifespan에서 호출). Queue는 실행 중인 이벤트 루프에서 생성."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """writer task 종료. 큐에 남은 항목은 모두 저장한 뒤 종료 (lifespan 종료 시 호출)."""
+        if not self.running:
+            return
+        self._stopping = True
+        await self._task
+        self._task = None
+        self._stopping = False
+
+    def submit(self, item: Any) -> str:
+        """항목을 큐에 넣고 receipt_id 반환. 가득 차면 IngestQueueFull."""
+        receipt_id = uuid.uuid4().hex
+        try:
+            self._queue.put_nowait((receipt_id, time.monotonic(), item))
+        except asyncio.QueueFull:
+            self._stats["rejected_total"] += 1
+            raise IngestQueueFull(f"수집 대기열이 가득 찼습니다 (최대 {self.max_size}건)")
+        self._stats["enqueued_total"] += 1
+        self._set_receipt(receipt_id, {"status": "queued"})
+        return receipt_id
+
+    def get_receipt(self, receipt_id: str) -> Optional[Dict[str, Any]]:
+        """receipt 상태 조회: queued | saved | duplicate | failed"""
+        receipt = self._receipts.get(receipt_id)
+        return dict(receipt, receipt_id=receipt_id) if receipt is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 크기 산정용 지표 (깊이, flush 지연 등)"""
+        s = self._stats
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "enqueued_total": s["enqueued_total"],
+            "rejected_total": s["rejected_total"],
+            "flushed_total": s["flushed_total"],
+            "failed_total": s["failed_total"],
+            "flush_count": s["flush_count"],
+            "last_batch_size": s["last_batch_size"],
+            "last_flush_ms": s["last_flush_ms"],
+            "avg_flush_ms": round(s["total_flush_ms"] / s["flush_count"], 2) if s["flush_count"] else None,
+            "max_flush_ms": s["max_flush_ms"],
+            "last_queue_wait_ms": s["last_queue_wait_ms"],
+            "last_flush_at": s["last_flush_at"],
+        }
+
+    def _set_receipt(self, receipt_id: str, value: Dict[str, Any]):
+        self._receipts[receipt_id] = value
+        self._receipts.move_to_end(receipt_id)
+        while len(self._receipts) > self.max_receipts:
+            self._receipts.popitem(last=False)
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+            elif self._stopping:
+                return
+
+    async def _collect_batch(self) -> List[Tuple[str, float, Any]]:
+        """
+        첫 항목이 들어온 뒤 batch_size가 차거나 flush_interval이 지날 때까지 모음.
+        flush_interval 동안 아무 것도 없으면 빈 리스트 (stop 여부 확인용).
+        """
+        try:
+            batch = [await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write_each(self, items: List[Any]) -> List[Dict[str, Any]]:
+        """배치 저장이 끝내 실패했을 때 한 건씩 1회 저장 (실패한 항목만 "error")"""
+        loop = asyncio.get_running_loop()
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.extend(await loop.run_in_executor(self.executor, self.writer, [item]))
+            except Exception as e:
+                outcomes.append({"id": None, "duplicate": False, "error": str(e)})
+        failed = sum(1 for outcome in outcomes if outcome.get("error"))
+        print(f"수집 대기열 {len(items)}건 한 건씩 저장: 실패 {failed}건")
+        return outcomes
+
+    async def _flush(self, batch: List[Tuple[str, float, Any]]):
+        if not batch:
+            return
+        items = [item for _, _, item in batch]
+        started = time.monotonic()
+        outcomes = None
+        last_error = None
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retry_count + 1):
+            try:
+                outcomes = await loop.run_in_executor(self.executor, self.writer, items)
+                break
+            except Exception as e:
+                last_error = e
+                print(f"ERROR: 수집 대기열 저장 실패 ({len(items)}건, 시도 {attempt + 1}): {e}")
+                if attempt < self.retry_count:
+                    await asyncio.sleep(min(1.0 * (attempt + 1), 5.0))
+        if outcomes is None and len(items) > 1:
+            outcomes = await self._write_each(items)
+        elapsed_ms = round((time.monotonic() - started) * 1000, 2)
+
+        s = self._stats
+        s["flush_count"] += 1
+        s["last_batch_size"] = len(batch)
+        s["last_flush_ms"] = elapsed_ms
+        s["max_flush_ms"] = max(s["max_flush_ms"] or 0, elapsed_ms)
+        s["total_flush_ms"] += elapsed_ms
+        s["last_queue_wait_ms"] = round((started - min(t for _, t, _ in batch)) * 1000, 2)
+        s["last_flush_at"] = time.time()
+
+        if outcomes is None:
+            s["failed_total"] += len(batch)
+            traceback.print_exception(type(last_error), last_error, last_error.__traceback__)
+            for receipt_id, _, _ in batch:
+                self._set_receipt(receipt_id, {"status": "failed", "error": str(last_error)})
+            return
+
+        for (receipt_id, _, _), outcome in zip(batch, outcomes):
+            if outcome.get("error"):
+                s["failed_total"] += 1
+                self._set_receipt(receipt_id, {"status": "failed", "error": outcome["error"]})
+                continue
+            s["flushed_total"] += 1
+            self._set_receipt(receipt_id, {
+                "status": "duplicate" if outcome.get("duplicate") else "saved",
+                "id": outcome.get("id"),
+            })
+        if self.on_flushed is not None:
+            try:
+                await self.on_flushed(items, outcomes)
+            except Exception as e:
+                print(f"수집 대기열 flush 후처리 실패: {e}")
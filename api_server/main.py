@@ -3,29 +3,57 @@ Ansible 점검 결과 수집 API 서버
 FastAPI 기반으로 점검 결과를 받아서 DB에 저장
 """
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Request, File, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, RedirectResponse, Response
-from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timezone, timedelta
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Callable
+from datetime import datetime, timezone
+from email.utils import format_datetime
 from contextlib import asynccontextmanager
 import uvicorn
 import json
 import asyncio
 import csv
 import io
+import math
 import os
+import zlib
 from pathlib import Path
 
 from database import (
     init_db,
     save_check_result,
+    save_check_results_bulk,
+    save_check_results_each,
+    get_check_result_ids_by_idempotency_keys,
     get_check_results,
+    get_check_result_by_id,
+    get_formatted_check_results,
+    get_check_result_summaries,
+    iter_check_results,
+    count_check_results,
+    get_check_results_version,
+    maintain_check_result_partitions,
+    get_check_result_partitions,
+    formatted_row_cache,
+    iterate_db,
+    EXPORT_BATCH_SIZE,
+    get_latest_check_results,
+    make_cursor,
+    parse_cursor,
+    CHECK_RESULT_FIELDS,
+    CHECK_RESULT_SUMMARY_FIELDS,
     ensure_admin_user,
     get_user_by_username,
     get_user_by_id,
     create_user,
-    verify_password,
+    verify_password_async,
+    hash_password_async,
+    PasswordHasherBusy,
     get_all_users,
     set_user_approved,
     delete_user,
@@ -46,11 +74,21 @@ from database import (
     create_check_item,
     update_check_item,
     delete_check_item,
+    db_executor,
+    get_db,
+    run_db,
+    DATABASE_URL,
 )
 from models import CheckResult, User
+from ingest_queue import IngestQueue, IngestQueueFull
+from export_jobs import ExportJobs, ExportJobQueueFull, ExportProgress
+from result_cache import LRUCache
+from websocket_manager import ConnectionManager, make_subscription
+from ws_broadcast import create_broadcast
 from auth import (
     create_access_token,
     get_current_user,
+    get_current_viewer,
     get_current_admin,
     get_current_maintainer,
     get_token_from_request,
@@ -58,6 +96,24 @@ from auth import (
     COOKIE_NAME,
 )
 
+# check_results 파티션 관리 주기(초): 앞으로 쓸 달 파티션 생성·보관 기간이 지난 파티션 삭제 (파티션 테이블일 때만)
+CHECK_RESULTS_PARTITION_CHECK_INTERVAL = float(os.getenv("CHECK_RESULTS_PARTITION_CHECK_INTERVAL", 3600))
+
+
+async def _partition_maintenance_loop():
+    """기동 직후와 이후 주기적으로 check_results 파티션 관리. 파티션 테이블이 아니면 바로 종료"""
+    while True:
+        try:
+            result = await run_db(maintain_check_result_partitions)
+            if not result["partitioned"]:
+                return
+            if result["created"] or result["dropped"]:
+                print(f"check_results 파티션 생성 {result['created']}, 삭제 {result['dropped']}")
+        except Exception as e:
+            print(f"check_results 파티션 관리 실패: {e}")
+        await asyncio.sleep(CHECK_RESULTS_PARTITION_CHECK_INTERVAL)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 서버 시작 시 (DB 실패해도 프로세스는 기동해 두고, /api/health에서 degraded 표시)
@@ -70,8 +126,17 @@ async def lifespan(app: FastAPI):
         import traceback
         print(f"⚠️ DB 초기화 실패 (서비스는 기동함, /api/health에서 db 상태 확인): {e}", flush=True)
         traceback.print_exc()
+    if INGEST_QUEUE_ENABLED:
+        await ingest_queue.start()
+    await export_jobs.start()
+    await broadcast.start(_deliver_broadcast_event, _resync_clients)
+    partition_task = asyncio.create_task(_partition_maintenance_loop())
     yield
-    # 서버 종료 시 (필요한 경우 정리 작업)
+    partition_task.cancel()
+    # 서버 종료 시: 수집 대기열에 남은 결과 저장
+    await ingest_queue.stop()
+    await export_jobs.stop()
+    await broadcast.stop()
 
 app = FastAPI(
     title="Ansible 점검 결과 수집 API",
@@ -80,26 +145,32 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# WebSocket 연결 관리
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+# 재연결한 클라이언트에게 다시 보내기 위해 보관하는 최근 이벤트 수 (이보다 많이 놓쳤으면 전체 재조회 지시)
+WS_EVENT_BUFFER_SIZE = int(os.getenv("WS_EVENT_BUFFER_SIZE", 256))
+# 연결별 전송 대기열 크기(메시지 수). 가득 차면 느린 클라이언트로 보고 연결을 끊음 (재연결 시 놓친 이벤트 재전송)
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 64))
+# 메시지 1건 전송 제한 시간(초). 넘으면 연결을 끊음
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", 10))
+
+manager = ConnectionManager(
+    buffer_size=WS_EVENT_BUFFER_SIZE,
+    queue_size=WS_SEND_QUEUE_SIZE,
+    send_timeout=WS_SEND_TIMEOUT,
+)
 
-manager = ConnectionManager()
+# worker 사이 이벤트 중계 (ws_broadcast 참고): local(기본, worker 1개) | unix(같은 서버의 worker 여러 개) | postgres(서버 여러 대)
+WS_BROADCAST_BACKEND = os.getenv("WS_BROADCAST_BACKEND", "local")
+# unix 백엔드 소켓 경로 (같은 서버의 worker가 같은 경로를 써야 함, <경로>.lock 파일도 생성)
+WS_BROADCAST_UNIX_PATH = Path(os.getenv("WS_BROADCAST_UNIX_PATH", str(Path(__file__).resolve().parent / "ws_broadcast.sock")))
+# postgres 백엔드 LISTEN/NOTIFY 채널 (DATABASE_URL의 DB 사용)
+WS_BROADCAST_PG_CHANNEL = os.getenv("WS_BROADCAST_PG_CHANNEL", "check_results")
+
+broadcast = create_broadcast(
+    WS_BROADCAST_BACKEND,
+    unix_path=WS_BROADCAST_UNIX_PATH,
+    database_url=DATABASE_URL,
+    pg_channel=WS_BROADCAST_PG_CHANNEL,
+)
 
 # CORS 설정 (필요시 프론트엔드에서 접근 가능하도록)
 app.add_middleware(
@@ -111,14 +182,99 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    422 응답에서 입력값(input·ctx) 제외: 점검 결과 원본(수 KB~)을 그대로 되돌려 보내지 않고,
+    NaN 등 JSON으로 직렬화할 수 없는 값 때문에 422 대신 500이 나지 않도록
+    """
+    errors = [{"type": err["type"], "loc": list(err["loc"]), "msg": err["msg"]} for err in exc.errors()]
+    return JSONResponse(status_code=422, content={"detail": errors})
+
+
+def _check_json_value(value: Any, path: str = "results"):
+    """DB(PostgreSQL JSON)가 거부하는 값(NaN·Infinity, NUL 문자)이 있으면 ValueError"""
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"{path}: NaN/Infinity는 저장할 수 없습니다")
+    if isinstance(value, str) and "\x00" in value:
+        raise ValueError(f"{path}: NUL 문자는 저장할 수 없습니다")
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _check_json_value(k, path)
+            _check_json_value(v, f"{path}.{k}")
+    elif isinstance(value, list):
+        for n, v in enumerate(value):
+            _check_json_value(v, f"{path}[{n}]")
+
+
 class CheckResultRequest(BaseModel):
-    """점검 결과 요청 모델"""
-    check_type: str  # "os", "was", "mariadb", "postgresql", "cubrid" 등
-    hostname: str
-    check_time: str
-    checker: str
-    status: str  # "success", "warning", "error"
+    """
+    점검 결과 요청 모델. 길이는 check_results 컬럼 크기와 같게 제한해
+    수집 대기열에서 저장할 때가 아니라 요청 시점에 422로 거부
+    """
+    check_type: str = Field(max_length=50)  # "os", "was", "mariadb", "postgresql", "cubrid" 등
+    hostname: str = Field(max_length=255)
+    check_time: str = Field(max_length=50)
+    checker: str = Field(max_length=100)
+    status: str = Field(max_length=20)  # "success", "warning", "error"
     results: Dict[str, Any]
+    idempotency_key: Optional[str] = Field(default=None, max_length=64)  # 재전송 중복 방지 키 (api_sender spool)
+
+    @field_validator("check_type", "hostname", "check_time", "checker", "status", "idempotency_key")
+    @classmethod
+    def _no_nul(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and "\x00" in value:
+            raise ValueError("NUL 문자는 저장할 수 없습니다")
+        return value
+
+    @field_validator("results")
+    @classmethod
+    def _storable_results(cls, value: Dict[str, Any]) -> Dict[str, Any]:
+        _check_json_value(value)
+        return value
+
+
+class CheckResultBatchRequest(BaseModel):
+    """점검 결과 일괄 요청 모델. items 각 항목은 CheckResultRequest 형식 (항목별로 검증)."""
+    items: List[Dict[str, Any]]
+
+
+# 배치 요청 1회당 최대 항목 수
+CHECK_BATCH_MAX_ITEMS = int(os.getenv("CHECK_BATCH_MAX_ITEMS", 1000))
+
+# POST /api/checks 수집 대기열 설정
+INGEST_QUEUE_ENABLED = os.getenv("INGEST_QUEUE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+INGEST_QUEUE_MAX_SIZE = int(os.getenv("INGEST_QUEUE_MAX_SIZE", 2000))   # 초과 시 429
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 200))            # 트랜잭션 1회당 최대 건수
+INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", 0.5))  # 초
+
+# 백그라운드 내보내기 작업 (POST /api/checks/export/jobs)
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", str(Path(__file__).resolve().parent / "exports")))
+EXPORT_JOB_WORKERS = int(os.getenv("EXPORT_JOB_WORKERS", 2))           # 동시 실행 작업 수 (작업당 DB 연결 1개)
+EXPORT_JOB_MAX_PENDING = int(os.getenv("EXPORT_JOB_MAX_PENDING", 10))  # worker당 대기+실행 작업 상한, 초과 시 429
+EXPORT_JOB_TTL = float(os.getenv("EXPORT_JOB_TTL", 86400))             # 완료 후 파일 보관 시간(초)
+
+# 조회 API 응답 본문 캐시: URL(경로+쿼리) -> (데이터 버전, JSON 바이트). 둘 다 0이면 사용 안 함
+DATA_RESPONSE_CACHE_SIZE = int(os.getenv("DATA_RESPONSE_CACHE_SIZE", 64))                            # 최대 URL 수
+DATA_RESPONSE_CACHE_MAX_BYTES = int(os.getenv("DATA_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))  # 본문 합계 상한
+data_response_cache = LRUCache(
+    max_entries=DATA_RESPONSE_CACHE_SIZE,
+    max_bytes=DATA_RESPONSE_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry[1]),
+)
+
+
+class ExportJobRequest(BaseModel):
+    """백그라운드 내보내기 작업 요청. 필터는 GET /api/checks/export와 동일, limit 0 이하면 전체."""
+    format: str = "csv"  # json | csv | ndjson | parquet | arrow
+    check_type: Optional[str] = None
+    hostname: Optional[str] = None
+    checker: Optional[str] = None
+    status: Optional[str] = None
+    created_after: Optional[str] = None
+    created_before: Optional[str] = None
+    ids: Optional[List[int]] = None
+    limit: int = 0
 
 
 class LoginRequest(BaseModel):
@@ -165,7 +321,7 @@ async def register_page():
 async def health_check():
     """서버 상태 확인 (DB 연결 포함)"""
     from database import check_db_connection
-    db_ok, db_message = check_db_connection()
+    db_ok, db_message = await run_db(check_db_connection)
     return {
         "status": "healthy" if db_ok else "degraded",
         "timestamp": datetime.now().isoformat(),
@@ -178,19 +334,34 @@ async def health_check():
 
 
 @app.post("/api/auth/register")
-async def auth_register(body: RegisterRequest):
+async def auth_register(body: RegisterRequest, db: Session = Depends(get_db)):
     """회원가입. 승인 전에는 로그인 불가."""
-    if get_user_by_username(body.username):
+    if await run_db(get_user_by_username, body.username, db=db):
         raise HTTPException(status_code=409, detail="이미 사용 중인 아이디입니다.")
-    create_user(username=body.username, password=body.password, email=body.email)
+    try:
+        password_hash = await hash_password_async(body.password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    await run_db(
+        create_user,
+        username=body.username,
+        password=body.password,
+        email=body.email,
+        password_hash=password_hash,
+        db=db,
+    )
     return {"success": True, "message": "가입이 완료되었습니다. 관리자 승인 후 로그인할 수 있습니다."}
 
 
 @app.post("/api/auth/login")
-async def auth_login(body: LoginRequest, response: Response):
+async def auth_login(body: LoginRequest, response: Response, db: Session = Depends(get_db)):
     """로그인. 승인된 사용자만 성공. 성공 시 쿠키에 JWT 설정."""
-    user = get_user_by_username(body.username)
-    if not user or not verify_password(body.password, user.password_hash):
+    user = await run_db(get_user_by_username, body.username, db=db)
+    try:
+        password_ok = user is not None and await verify_password_async(body.password, user.password_hash)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if not password_ok:
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호가 올바르지 않습니다.")
     if not user.is_approved:
         raise HTTPException(status_code=403, detail="계정이 승인 대기 중입니다. 관리자 승인 후 로그인할 수 있습니다.")
@@ -223,10 +394,10 @@ async def auth_me(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/admin/users")
-async def admin_list_users(_: User = Depends(get_current_maintainer)):
+async def admin_list_users(_: User = Depends(get_current_maintainer), db: Session = Depends(get_db)):
     """가입자 목록 (승인 대기 포함). Maintainer 이상."""
     try:
-        users = get_all_users()
+        users = await run_db(get_all_users, db=db)
         return {"success": True, "users": [u.to_dict() for u in users]}
     except Exception as e:
         print(f"admin_list_users error: {e}")
@@ -237,29 +408,29 @@ async def admin_list_users(_: User = Depends(get_current_maintainer)):
 
 
 @app.post("/api/admin/users/{user_id:int}/approve")
-async def admin_approve_user(user_id: int, _: User = Depends(get_current_maintainer)):
+async def admin_approve_user(user_id: int, _: User = Depends(get_current_maintainer), db: Session = Depends(get_db)):
     """사용자 승인. Maintainer 이상."""
-    user = set_user_approved(user_id, True)
+    user = await run_db(set_user_approved, user_id, True, db=db)
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     return {"success": True, "user": user.to_dict()}
 
 
 @app.post("/api/admin/users/{user_id:int}/reject")
-async def admin_reject_user(user_id: int, _: User = Depends(get_current_maintainer)):
+async def admin_reject_user(user_id: int, _: User = Depends(get_current_maintainer), db: Session = Depends(get_db)):
     """사용자 거부(승인 해제). Maintainer 이상. 삭제는 하지 않고 is_approved=False."""
-    user = set_user_approved(user_id, False)
+    user = await run_db(set_user_approved, user_id, False, db=db)
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     return {"success": True, "user": user.to_dict()}
 
 
 @app.delete("/api/admin/users/{user_id:int}")
-async def admin_delete_user(user_id: int, current: User = Depends(get_current_admin)):
+async def admin_delete_user(user_id: int, current: User = Depends(get_current_admin), db: Session = Depends(get_db)):
     """사용자 삭제. Admin 전용. 본인 삭제 불가."""
     if current.id == user_id:
         raise HTTPException(status_code=400, detail="본인 계정은 삭제할 수 없습니다.")
-    if not delete_user(user_id):
+    if not await run_db(delete_user, user_id, db=db):
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     return {"success": True}
 
@@ -269,13 +440,18 @@ class SetRoleRequest(BaseModel):
 
 
 @app.patch("/api/admin/users/{user_id:int}/role")
-async def admin_set_user_role(user_id: int, body: SetRoleRequest, current: User = Depends(get_current_admin)):
+async def admin_set_user_role(
+    user_id: int,
+    body: SetRoleRequest,
+    current: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
     """사용자 역할 변경. Admin 전용. 본인 역할 변경 불가."""
     if current.id == user_id:
         raise HTTPException(status_code=400, detail="본인 역할은 여기서 변경할 수 없습니다.")
     if body.role not in ("admin", "maintainer", "operator", "viewer"):
         raise HTTPException(status_code=400, detail="role은 admin, maintainer, operator, viewer 중 하나여야 합니다.")
-    user = set_user_role(user_id, body.role)
+    user = await run_db(set_user_role, user_id, body.role, db=db)
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     return {"success": True, "user": user.to_dict()}
@@ -324,10 +500,11 @@ class CheckEnabledRequest(BaseModel):
 async def admin_list_servers(
     check_enabled: Optional[bool] = None,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """서버 목록. Maintainer 이상."""
     try:
-        servers = list_servers(check_enabled=check_enabled)
+        servers = await run_db(list_servers, check_enabled=check_enabled, db=db)
         return {"success": True, "servers": [s.to_dict() for s in servers]}
     except Exception as e:
         print(f"admin_list_servers error: {e}")
@@ -335,30 +512,36 @@ async def admin_list_servers(
 
 
 @app.post("/api/admin/servers")
-async def admin_create_server(body: ServerCreateRequest, _: User = Depends(get_current_maintainer)):
+async def admin_create_server(
+    body: ServerCreateRequest,
+    _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
+):
     """서버 추가. Maintainer 이상."""
     try:
-        s = create_server(
-        name=body.name,
-        ip=body.ip,
-        os_type=body.os_type,
-        ssh_port=body.ssh_port,
-        ssh_user=body.ssh_user,
-        check_enabled=body.check_enabled,
-        memo=body.memo,
-        ssh_auth_type=body.ssh_auth_type,
-        ssh_key_path=body.ssh_key_path,
-        ssh_password=body.ssh_password,
-    )
+        s = await run_db(
+            create_server,
+            name=body.name,
+            ip=body.ip,
+            os_type=body.os_type,
+            ssh_port=body.ssh_port,
+            ssh_user=body.ssh_user,
+            check_enabled=body.check_enabled,
+            memo=body.memo,
+            ssh_auth_type=body.ssh_auth_type,
+            ssh_key_path=body.ssh_key_path,
+            ssh_password=body.ssh_password,
+            db=db,
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return {"success": True, "server": s.to_dict()}
 
 
 @app.get("/api/admin/servers/{server_id:int}")
-async def admin_get_server(server_id: int, _: User = Depends(get_current_maintainer)):
+async def admin_get_server(server_id: int, _: User = Depends(get_current_maintainer), db: Session = Depends(get_db)):
     """서버 단건 조회. Maintainer 이상."""
-    s = get_server(server_id)
+    s = await run_db(get_server, server_id, db=db)
     if not s:
         raise HTTPException(status_code=404, detail="서버를 찾을 수 없습니다.")
     return {"success": True, "server": s.to_dict()}
@@ -369,10 +552,12 @@ async def admin_update_server(
     server_id: int,
     body: ServerUpdateRequest,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """서버 수정. Maintainer 이상."""
     try:
-        s = update_server(
+        s = await run_db(
+            update_server,
             server_id,
             name=body.name,
             ip=body.ip,
@@ -384,6 +569,7 @@ async def admin_update_server(
             ssh_auth_type=body.ssh_auth_type,
             ssh_key_path=body.ssh_key_path,
             ssh_password=body.ssh_password,
+            db=db,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -393,9 +579,9 @@ async def admin_update_server(
 
 
 @app.delete("/api/admin/servers/{server_id:int}")
-async def admin_delete_server(server_id: int, _: User = Depends(get_current_maintainer)):
+async def admin_delete_server(server_id: int, _: User = Depends(get_current_maintainer), db: Session = Depends(get_db)):
     """서버 삭제. Maintainer 이상."""
-    if not delete_server(server_id):
+    if not await run_db(delete_server, server_id, db=db):
         raise HTTPException(status_code=404, detail="서버를 찾을 수 없습니다.")
     return {"success": True}
 
@@ -405,9 +591,10 @@ async def admin_set_server_check_enabled(
     server_id: int,
     body: CheckEnabledRequest,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """서버 점검 대상 여부 설정. Maintainer 이상."""
-    s = set_server_check_enabled(server_id, body.enabled)
+    s = await run_db(set_server_check_enabled, server_id, body.enabled, db=db)
     if not s:
         raise HTTPException(status_code=404, detail="서버를 찾을 수 없습니다.")
     return {"success": True, "server": s.to_dict()}
@@ -444,6 +631,7 @@ def _normalize_excel_header(header: str) -> Optional[str]:
 async def admin_servers_bulk_upload(
     file: UploadFile = File(..., description=".xlsx 엑셀 파일"),
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """
     서버 접속 정보 엑셀 일괄 업로드.
@@ -508,9 +696,9 @@ async def admin_servers_bulk_upload(
             continue
         server = None
         if name:
-            server = get_server_by_name(name)
+            server = await run_db(get_server_by_name, name, db=db)
         if not server and ip:
-            server = get_server_by_ip(ip)
+            server = await run_db(get_server_by_ip, ip, db=db)
         if server:
             try:
                 kwargs: Dict[str, Any] = {}
@@ -520,7 +708,7 @@ async def admin_servers_bulk_upload(
                 if ssh_user:
                     kwargs["ssh_user"] = ssh_user
                 if kwargs:
-                    update_server(server.id, **kwargs)
+                    await run_db(update_server, server.id, db=db, **kwargs)
                     updated += 1
             except Exception as e:
                 failed += 1
@@ -537,7 +725,8 @@ async def admin_servers_bulk_upload(
                 auth_type = (ssh_auth_type or "").strip() or ("password" if password else "key_file")
                 if auth_type not in ("password", "key_file"):
                     auth_type = "password" if password else "key_file"
-                create_server(
+                await run_db(
+                    create_server,
                     name=name,
                     ip=ip,
                     os_type=os_type or "linux",
@@ -548,6 +737,7 @@ async def admin_servers_bulk_upload(
                     ssh_auth_type=auth_type,
                     ssh_key_path=ssh_key_path or None,
                     ssh_password=password or None,
+                    db=db,
                 )
                 created += 1
             except Exception as e:
@@ -582,14 +772,21 @@ class CheckItemUpdateRequest(BaseModel):
     sort_order: Optional[int] = None
 
 
+@app.get("/api/admin/check-results/partitions")
+async def admin_check_result_partitions(_: User = Depends(get_current_admin), db: Session = Depends(get_db)):
+    """check_results 월별 파티션 목록(범위·예상 행 수)과 생성·보관 설정. 파티션 테이블이 아니면 partitioned=false. Admin 전용."""
+    return {"success": True, **await run_db(get_check_result_partitions, db=db)}
+
+
 @app.get("/api/admin/check-items")
 async def admin_list_check_items(
     check_type: Optional[str] = None,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """점검 항목 목록. check_type 지정 시 해당 유형만. Maintainer 이상."""
     try:
-        items = list_check_items(check_type=check_type)
+        items = await run_db(list_check_items, check_type=check_type, db=db)
         return {"success": True, "items": [x.to_dict() for x in items]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -599,15 +796,18 @@ async def admin_list_check_items(
 async def admin_create_check_item(
     body: CheckItemCreateRequest,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """점검 항목 추가. 변경 즉시 신규 점검에 반영. Maintainer 이상."""
     try:
-        item = create_check_item(
+        item = await run_db(
+            create_check_item,
             check_type=body.check_type,
             item_key=body.item_key,
             display_name=body.display_name,
             enabled=body.enabled,
             sort_order=body.sort_order,
+            db=db,
         )
         return {"success": True, "item": item.to_dict()}
     except ValueError as e:
@@ -621,13 +821,16 @@ async def admin_update_check_item(
     item_id: int,
     body: CheckItemUpdateRequest,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """점검 항목 수정 (표시명, 활성화 여부). Maintainer 이상."""
-    item = update_check_item(
+    item = await run_db(
+        update_check_item,
         item_id,
         display_name=body.display_name,
         enabled=body.enabled,
         sort_order=body.sort_order,
+        db=db,
     )
     if not item:
         raise HTTPException(status_code=404, detail="점검 항목을 찾을 수 없습니다.")
@@ -638,14 +841,15 @@ async def admin_update_check_item(
 async def admin_delete_check_item(
     item_id: int,
     _: User = Depends(get_current_maintainer),
+    db: Session = Depends(get_db),
 ):
     """점검 항목 삭제. Maintainer 이상."""
-    if not delete_check_item(item_id):
+    if not await run_db(delete_check_item, item_id, db=db):
         raise HTTPException(status_code=404, detail="점검 항목을 찾을 수 없습니다.")
     return {"success": True}
 
 
-async def require_inventory_auth(request: Request) -> None:
+async def require_inventory_auth(request: Request, db: Session = Depends(get_db)) -> None:
     """Maintainer+ 세션 또는 INVENTORY_API_KEY로 인증. Cron/스크립트용."""
     api_key = request.headers.get("X-API-Key") or request.query_params.get("api_key")
     env_key = os.getenv("INVENTORY_API_KEY")
@@ -655,19 +859,19 @@ async def require_inventory_auth(request: Request) -> None:
     if token:
         payload = decode_access_token(token)
         if payload and "sub" in payload:
-            user = get_user_by_id(int(payload["sub"]))
+            user = await run_db(get_user_by_id, int(payload["sub"]), db=db)
             if user and getattr(user, "role", None) in ("admin", "maintainer"):
                 return
     raise HTTPException(status_code=401, detail="인증이 필요합니다 (Maintainer 이상 또는 INVENTORY_API_KEY)")
 
 
 @app.get("/api/inventory")
-async def get_inventory(_: None = Depends(require_inventory_auth)):
+async def get_inventory(_: None = Depends(require_inventory_auth), db: Session = Depends(get_db)):
     """
     Ansible 동적 inventory JSON. check_enabled=True인 서버만 포함.
     인증: Maintainer+ 세션 쿠키 또는 X-API-Key / api_key 쿼리(INVENTORY_API_KEY와 일치).
     """
-    items = list_servers_for_inventory()
+    items = await run_db(list_servers_for_inventory, db=db)
     hosts = [x["host"] for x in items]
     hostvars = {x["host"]: x["hostvars"] for x in items}
     body = {
@@ -677,8 +881,135 @@ async def get_inventory(_: None = Depends(require_inventory_auth)):
     return Response(content=json.dumps(body), media_type="application/json")
 
 
+def _filter_enabled_results(results: Optional[Dict[str, Any]], enabled_keys) -> Dict[str, Any]:
+    """점검 항목 설정 반영: enabled_keys가 있으면 해당 키만 남김 (None이면 전체 저장)"""
+    results = results or {}
+    if enabled_keys is not None and isinstance(results, dict):
+        return {k: v for k, v in results.items() if k in enabled_keys}
+    return results
+
+
+def _persist_check_results(items: List[CheckResultRequest], db: Optional[Session] = None) -> List[Dict[str, Any]]:
+    """
+    점검 결과 여러 건을 한 트랜잭션으로 저장 (일괄 수집·수집 대기열 공용, 동기 함수)
+    
+    idempotency_key가 이미 저장돼 있거나 같은 목록 안에서 반복되면 저장하지 않고 기존 ID를 돌려줌.
+    한 트랜잭션 저장이 실패하면(동시 재전송의 키 중복, DB가 거부하는 값 등) 한 건씩 다시 저장해
+    문제 항목만 실패 처리. 연결 끊김 등 DB 자체 오류는 그대로 예외 (호출자가 재시도·500).
+    점검 항목 설정(get_enabled_item_keys_for_type)은 check_type별로 한 번만 조회.
+    db: 요청 세션 (수집 대기열에서 호출할 때는 None → 자체 세션 사용)
+    
+    Returns:
+        items 순서대로 {"id": 점검 결과 ID, "duplicate": 중복 여부} (저장 실패 항목은 id None + "error")
+    """
+    existing_ids = get_check_result_ids_by_idempotency_keys(
+        [item.idempotency_key for item in items if item.idempotency_key], db=db
+    )
+    to_save: List[int] = []
+    seen_keys = set()
+    for n, item in enumerate(items):
+        key = item.idempotency_key
+        if key and (key in existing_ids or key in seen_keys):
+            continue
+        if key:
+            seen_keys.add(key)
+        to_save.append(n)
+
+    saved: List[Dict[str, Any]] = []
+    if to_save:
+        enabled_keys_by_type = {
+            check_type: get_enabled_item_keys_for_type(check_type)
+            for check_type in {items[n].check_type for n in to_save}
+        }
+        rows = [
+            {
+                "check_type": items[n].check_type,
+                "hostname": items[n].hostname,
+                "check_time": items[n].check_time,
+                "checker": items[n].checker,
+                "status": items[n].status,
+                "results": _filter_enabled_results(items[n].results, enabled_keys_by_type[items[n].check_type]),
+                "idempotency_key": items[n].idempotency_key,
+            }
+            for n in to_save
+        ]
+        try:
+            saved = [{"id": result_id, "duplicate": False} for result_id in save_check_results_bulk(rows, db=db)]
+        except Exception as e:
+            if isinstance(e, OperationalError) or getattr(e, "connection_invalidated", False):
+                raise
+            print(f"WARNING: 점검 결과 {len(rows)}건 일괄 저장 실패, 한 건씩 다시 저장: {getattr(e, 'orig', None) or e}")
+            saved = save_check_results_each(rows, db=db)
+
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    for n, outcome in zip(to_save, saved):
+        outcomes[n] = outcome
+        if items[n].idempotency_key and outcome["id"] is not None:
+            existing_ids[items[n].idempotency_key] = outcome["id"]
+    for n, item in enumerate(items):
+        if outcomes[n] is None:
+            outcomes[n] = {"id": existing_ids.get(item.idempotency_key), "duplicate": True}
+    return outcomes
+
+
+def _new_results_event(rows: List[Dict[str, Any]], timestamp: Optional[str] = None) -> Dict[str, Any]:
+    """get_check_result_summaries 행들로 new_check_results 이벤트 구성"""
+    return {
+        "type": "new_check_results",
+        "count": len(rows),
+        "check_types": sorted({row["check_type"] for row in rows}),
+        "hostnames": sorted({row["hostname"] for row in rows}),
+        "checkers": sorted({row["checker"] for row in rows if row.get("checker")}),
+        "statuses": sorted({row["status"] for row in rows if row.get("status")}),
+        "rows": rows,
+        "timestamp": timestamp or datetime.now().isoformat()
+    }
+
+
+async def _broadcast_new_results(items: List[CheckResultRequest], outcomes: List[Dict[str, Any]]):
+    """
+    새로 저장된 결과(중복 제외)를 WebSocket 이벤트 1회로 브로드캐스트 (다른 worker에는 broadcast 백엔드로 중계).
+    rows에 저장된 행 자체(목록 컬럼 + formatted 표 형식 행)를 담아 클라이언트가 목록을 다시 받지 않고 갱신하도록 함.
+    """
+    saved_ids = [outcome["id"] for outcome in outcomes if outcome["id"] is not None and not outcome["duplicate"]]
+    if not saved_ids:
+        return
+    try:
+        rows = await run_db(get_check_result_summaries, saved_ids)
+        if rows:
+            await broadcast.publish(_new_results_event(rows))
+    except:
+        pass  # WebSocket 브로드캐스트 실패해도 저장은 성공
+
+
+async def _deliver_broadcast_event(message: Dict[str, Any]):
+    """broadcast 백엔드가 넘긴 이벤트를 이 worker의 연결에 발행. 결과 id만 온 경우(postgres) 행을 DB에서 읽음"""
+    if message.get("type") == "new_check_results" and "rows" not in message and message.get("ids"):
+        rows = await run_db(get_check_result_summaries, message["ids"])
+        if not rows:
+            return
+        message = _new_results_event(rows, message.get("timestamp"))
+    await manager.publish(message)
+
+
+async def _resync_clients():
+    """다른 worker의 이벤트를 놓쳤을 수 있음(중계 재연결) → rows 없는 이벤트로 클라이언트 전체 재조회"""
+    await manager.publish({"type": "new_check_results", "resync": True, "timestamp": datetime.now().isoformat()})
+
+
+# POST /api/checks write-behind 수집 대기열 (INGEST_QUEUE_ENABLED=0이면 요청마다 바로 저장)
+ingest_queue = IngestQueue(
+    writer=_persist_check_results,
+    on_flushed=_broadcast_new_results,
+    max_size=INGEST_QUEUE_MAX_SIZE,
+    batch_size=INGEST_BATCH_SIZE,
+    flush_interval=INGEST_FLUSH_INTERVAL,
+    executor=db_executor,
+)
+
+
 @app.post("/api/checks")
-async def create_check_result(check_result: CheckResultRequest):
+async def create_check_result(check_result: CheckResultRequest, db: Session = Depends(get_db)):
     """
     점검 결과를 받아서 DB에 저장
     
@@ -686,36 +1017,57 @@ async def create_check_result(check_result: CheckResultRequest):
         check_result: 점검 결과 데이터
         
     Returns:
-        저장된 결과 정보
+        저장된 결과 정보. 수집 대기열 사용 시 202 + receipt_id (대기열이 가득 차면 429)
     """
+    if ingest_queue.running:
+        try:
+            receipt_id = ingest_queue.submit(check_result)
+        except IngestQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+        return JSONResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "queued": True,
+                "message": "점검 결과가 저장 대기열에 등록되었습니다",
+                "receipt_id": receipt_id,
+                "check_type": check_result.check_type,
+                "hostname": check_result.hostname,
+                "check_time": check_result.check_time
+            },
+        )
     try:
+        # 이미 수집된 재전송 건이면 저장·브로드캐스트 없이 기존 ID 반환
+        if check_result.idempotency_key:
+            existing_ids = await run_db(get_check_result_ids_by_idempotency_keys, [check_result.idempotency_key], db=db)
+            if check_result.idempotency_key in existing_ids:
+                return {
+                    "success": True,
+                    "duplicate": True,
+                    "message": "이미 저장된 점검 결과입니다",
+                    "id": existing_ids[check_result.idempotency_key],
+                    "check_type": check_result.check_type,
+                    "hostname": check_result.hostname,
+                    "check_time": check_result.check_time
+                }
         # 점검 항목 설정 반영: 활성화된 항목만 저장 (관리자에서 설정한 경우)
-        results_to_save = check_result.results or {}
-        enabled_keys = get_enabled_item_keys_for_type(check_result.check_type)
-        if enabled_keys is not None and isinstance(results_to_save, dict):
-            results_to_save = {k: v for k, v in results_to_save.items() if k in enabled_keys}
+        enabled_keys = await run_db(get_enabled_item_keys_for_type, check_result.check_type)
+        results_to_save = _filter_enabled_results(check_result.results, enabled_keys)
         # DB에 저장
-        result_id = save_check_result(
+        result_id = await run_db(
+            save_check_result,
             check_type=check_result.check_type,
             hostname=check_result.hostname,
             check_time=check_result.check_time,
             checker=check_result.checker,
             status=check_result.status,
-            results=results_to_save
+            results=results_to_save,
+            idempotency_key=check_result.idempotency_key,
+            db=db,
         )
         
-        # WebSocket으로 실시간 업데이트 브로드캐스트
-        try:
-            await manager.broadcast({
-                "type": "new_check_result",
-                "check_type": check_result.check_type,
-                "hostname": check_result.hostname,
-                "checker": check_result.checker,
-                "status": check_result.status,
-                "timestamp": datetime.now().isoformat()
-            })
-        except:
-            pass  # WebSocket 브로드캐스트 실패해도 저장은 성공
+        # WebSocket으로 실시간 업데이트 브로드캐스트 (저장된 행 포함)
+        await _broadcast_new_results([check_result], [{"id": result_id, "duplicate": False}])
         
         return {
             "success": True,
@@ -735,58 +1087,330 @@ async def create_check_result(check_result: CheckResultRequest):
         )
 
 
+@app.post("/api/checks/batch")
+async def create_check_results_batch(batch: CheckResultBatchRequest, db: Session = Depends(get_db)):
+    """
+    점검 결과 여러 건을 한 번에 받아서 DB에 저장
+    
+    항목별로 검증 후, 유효한 항목만 단일 트랜잭션(multi-row INSERT)으로 저장하고
+    WebSocket 이벤트는 배치당 한 번만 보냄. 일부 항목 때문에 트랜잭션이 실패하면 한 건씩 다시 저장해
+    그 항목만 실패로 응답 (동시 재전송으로 먼저 저장된 키는 duplicate).
+    
+    Args:
+        batch: {"items": [CheckResultRequest, ...]}
+        
+    Returns:
+        항목별 저장 결과 (index, success, id 또는 error)
+    """
+    if len(batch.items) > CHECK_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"배치 항목 수가 너무 많습니다 (최대 {CHECK_BATCH_MAX_ITEMS}건)",
+        )
+
+    item_results: List[Dict[str, Any]] = [None] * len(batch.items)
+    valid: List[tuple] = []  # (index, CheckResultRequest)
+    for idx, raw in enumerate(batch.items):
+        try:
+            valid.append((idx, CheckResultRequest.model_validate(raw)))
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            item_results[idx] = {"index": idx, "success": False, "error": f"요청 형식 오류: {errors}"}
+
+    outcomes: List[Dict[str, Any]] = []
+    if valid:
+        try:
+            outcomes = await run_db(_persist_check_results, [item for _, item in valid], db=db)
+        except Exception as e:
+            import traceback
+            print(f"ERROR: 점검 결과 일괄 저장 중 오류 발생: {str(e)}\n{traceback.format_exc()}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"점검 결과 일괄 저장 중 오류 발생: {str(e)}"
+            )
+
+    for (idx, item), outcome in zip(valid, outcomes):
+        if outcome.get("error"):
+            item_results[idx] = {"index": idx, "success": False, "error": f"저장 실패: {outcome['error']}"}
+            continue
+        item_results[idx] = {
+            "index": idx,
+            "success": True,
+            "id": outcome["id"],
+            "check_type": item.check_type,
+            "hostname": item.hostname,
+            "check_time": item.check_time,
+        }
+        if outcome["duplicate"]:
+            item_results[idx]["duplicate"] = True
+
+    await _broadcast_new_results([item for _, item in valid], outcomes)
+
+    duplicates = sum(1 for o in outcomes if o["duplicate"])
+    failed = sum(1 for r in item_results if not r["success"])
+    saved = len(batch.items) - duplicates - failed
+    return {
+        "success": failed == 0,
+        "message": f"{saved}건 저장, {duplicates}건 중복, {failed}건 실패",
+        "total": len(batch.items),
+        "saved": saved,
+        "duplicates": duplicates,
+        "failed": failed,
+        "items": item_results,
+    }
+
+
+@app.get("/api/checks/receipts/{receipt_id}")
+async def get_check_receipt(receipt_id: str):
+    """
+    POST /api/checks 가 202로 반환한 receipt_id의 저장 상태 조회
+    
+    Returns:
+        status: queued | saved | duplicate | failed (saved/duplicate이면 id 포함)
+    """
+    receipt = ingest_queue.get_receipt(receipt_id)
+    if receipt is None:
+        raise HTTPException(status_code=404, detail="receipt를 찾을 수 없습니다 (만료되었거나 잘못된 ID)")
+    return {"success": True, **receipt}
+
+
+@app.get("/api/ingest/stats")
+async def get_ingest_stats(current_user: User = Depends(get_current_viewer)):
+    """수집 대기열 지표 (깊이, 거부 건수, flush 소요/대기 시간). 큐 크기 산정용."""
+    return {"success": True, "enabled": INGEST_QUEUE_ENABLED, "queue": ingest_queue.stats()}
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_viewer)):
+    """조회 캐시 지표 (포맷된 행 캐시·응답 본문 캐시의 항목 수, 바이트, 적중률). 이 worker 기준, 캐시 크기 산정용."""
+    return {
+        "success": True,
+        "formatted_rows": formatted_row_cache.stats(),
+        "responses": data_response_cache.stats(),
+    }
+
+
+@app.get("/api/ws/stats")
+async def get_ws_stats(current_user: User = Depends(get_current_viewer)):
+    """WebSocket 지표 (연결 수, 전송 대기열 깊이, 느린 클라이언트 끊김·전송 실패 건수, worker 간 중계). 이 worker 기준."""
+    return {"success": True, "websocket": manager.stats(), "broadcast": broadcast.stats()}
+
+
+@app.get("/api/checks/latest")
+async def list_latest_check_results(
+    request: Request,
+    current_user: User = Depends(get_current_viewer),
+    db: Session = Depends(get_db),
+    check_type: Optional[str] = None,
+    hostname: Optional[str] = None,
+    formatted: bool = False,
+):
+    """
+    호스트별 최신 점검 결과 (대시보드 현재 상태용)
+    
+    Args:
+        check_type: 점검 유형 필터
+        hostname: 호스트명 필터
+        formatted: true면 /api/*-checks/data와 같은 표 형식
+        
+    Returns:
+        (check_type, hostname)별 최신 1건씩, check_type·hostname 순
+    """
+    try:
+        cached, store = await _cached_data_response(request, db)
+        if cached is not None:
+            return cached
+        results = await run_db(
+            get_latest_check_results,
+            check_type=check_type,
+            hostname=hostname,
+            formatted=formatted,
+            db=db,
+        )
+        return store({
+            "success": True,
+            "count": len(results),
+            "results": results
+        })
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"최신 점검 결과 조회 중 오류 발생: {str(e)}"
+        )
+
+
+def _page_filters(
+    status: Optional[str],
+    created_after: Optional[str],
+    created_before: Optional[str],
+    cursor: Optional[str],
+) -> Dict[str, Any]:
+    """목록 API 공통 쿼리(status, 기간, cursor) → get_check_results 인자. cursor가 잘못되면 400"""
+    try:
+        parsed_cursor = parse_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "status": status or None,
+        "created_after": _parse_optional_date(created_after),
+        "created_before": _parse_optional_date(created_before),
+        "cursor": parsed_cursor,
+    }
+
+
+def _parse_fields(fields: Optional[str], view: Optional[str]) -> Optional[List[str]]:
+    """fields(쉼표 구분) 또는 view=summary|full → get_check_results의 fields. fields가 우선, 잘못되면 400"""
+    if fields:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in names if f not in CHECK_RESULT_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"알 수 없는 fields: {', '.join(unknown)} (사용 가능: {', '.join(CHECK_RESULT_FIELDS)})",
+            )
+        return names
+    return list(CHECK_RESULT_SUMMARY_FIELDS) if _is_summary_view(view) else None
+
+
+def _is_summary_view(view: Optional[str]) -> bool:
+    """view=summary|full (기본 full). 그 외 값은 400"""
+    view = (view or "full").strip().lower()
+    if view not in ("summary", "full"):
+        raise HTTPException(status_code=400, detail="view는 summary 또는 full만 지원합니다.")
+    return view == "summary"
+
+
+def _paginate(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """limit+1건으로 조회한 결과 → (limit건, next_cursor). 다음 페이지가 없으면 next_cursor는 None"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, make_cursor(rows[-1])
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match(쉼표 구분, * 가능)에 etag가 있는지 (약한 비교: W/ 접두어 무시)"""
+    tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == tag:
+            return True
+    return False
+
+
+async def _cached_data_response(request: Request, db: Session) -> Tuple[Optional[Response], Callable[[Dict[str, Any]], Response]]:
+    """
+    조회 API 공통 HTTP 캐시 검증 + 응답 본문 캐시.
+    데이터 버전(get_check_results_version)으로 ETag·Last-Modified를 만들고
+    - 클라이언트가 가진 버전과 같으면 304,
+    - 같은 URL·같은 버전의 응답 본문이 data_response_cache에 있으면 그 바이트를 그대로 (SQL·포맷·직렬화 생략)
+    를 첫 번째 값으로 반환. 둘 다 아니면 (None, store): 라우트가 조회한 본문을 store(body)로 넘기면 캐시에 넣고 응답 생성.
+    캐시 키의 버전은 저장·삭제 트랜잭션이 커밋과 함께 올리는 데이터 버전이라, 어떤 결과가 보이게 된 시점에는
+    버전도 이미 바뀌어 있음 (max(id)와 달리 늦게 커밋된 작은 id 결과도 놓치지 않음).
+    버전은 본문 조회 전에 읽으므로 본문이 그 버전보다 새로울 수는 있어도 오래될 수는 없고, 그 사이 저장된 결과는
+    다음 요청에서 버전이 달라 다시 조회됨. 새 점검 결과 저장·보관 기간 삭제(어느 worker든) 뒤에는 이전 본문이 모두 miss.
+    """
+    version, last_created_at = await run_db(get_check_results_version, db=db)
+    headers = {
+        "ETag": f'W/"{version}"',
+        # 브라우저가 저장해 두되 매번 서버에 확인하도록 (변경 없으면 304)
+        "Cache-Control": "private, no-cache",
+    }
+    last_modified = None
+    if last_created_at is not None:
+        last_modified = last_created_at.astimezone(timezone.utc).replace(microsecond=0)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    # If-Modified-Since는 304 판단에 쓰지 않음: created_at 순서와 커밋 순서가 달라(먼저 시작해 나중에 커밋된 결과)
+    # 클라이언트가 가진 시각보다 이전 created_at의 결과가 나중에 보일 수 있음. ETag(데이터 버전)만 커밋 순서를 따름
+    if_none_match = request.headers.get("if-none-match")
+    fresh = if_none_match is not None and _etag_matches(if_none_match, headers["ETag"])
+    if fresh:
+        return Response(status_code=304, headers=headers), None
+
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    cached = data_response_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return Response(content=cached[1], media_type="application/json", headers=headers), None
+
+    def store(body: Dict[str, Any]) -> Response:
+        response = JSONResponse(content=jsonable_encoder(body), headers=headers)
+        data_response_cache.put(key, (version, response.body))
+        return response
+
+    return None, store
+
+
 @app.get("/api/checks")
 async def list_check_results(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: User = Depends(get_current_viewer),
+    db: Session = Depends(get_db),
     check_type: Optional[str] = None,
     hostname: Optional[str] = None,
     checker: Optional[str] = None,
     id: Optional[int] = None,
-    limit: int = 100
+    limit: int = 100,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
 ):
     """
-    저장된 점검 결과 조회
+    저장된 점검 결과 조회 (created_at, id 최신순, keyset 페이지네이션)
     
     Args:
         check_type: 점검 유형 필터
         hostname: 호스트명 필터
         checker: 담당자 필터
         id: 점검 결과 ID (특정 ID 조회 시)
-        limit: 최대 조회 개수
+        limit: 페이지 크기
+        status: 상태 필터 (success, warning, error)
+        created_after, created_before: ISO 날짜(예 2026-02-01) 또는 일시
+        cursor: 이전 응답의 next_cursor (다음 페이지)
+        fields: 반환할 컬럼(쉼표 구분, 예 id,hostname,status). id·created_at은 항상 포함
+        view: summary면 results(원본 출력)를 제외한 목록용 컬럼만, full(기본)이면 전체
         
     Returns:
-        점검 결과 목록
+        점검 결과 목록, next_cursor (마지막 페이지면 null)
     """
     try:
+        cached, store = await _cached_data_response(request, db)
+        if cached is not None:
+            return cached
         # ID로 조회하는 경우
         if id is not None:
-            from database import SessionLocal
-            from models import CheckResult
-            db = SessionLocal()
-            try:
-                result = db.query(CheckResult).filter(CheckResult.id == id).first()
-                if result:
-                    return {
-                        "success": True,
-                        "count": 1,
-                        "results": [result.to_dict()]
-                    }
-                else:
-                    raise HTTPException(status_code=404, detail=f"ID {id}에 해당하는 점검 결과를 찾을 수 없습니다.")
-            finally:
-                db.close()
-        
-        results = get_check_results(
+            result = await run_db(get_check_result_by_id, id, db=db)
+            if result:
+                return store({
+                    "success": True,
+                    "count": 1,
+                    "results": [result]
+                })
+            raise HTTPException(status_code=404, detail=f"ID {id}에 해당하는 점검 결과를 찾을 수 없습니다.")
+        
+        limit = max(1, limit)
+        rows = await run_db(
+            get_check_results,
             check_type=check_type,
             hostname=hostname,
             checker=checker,
-            limit=limit
+            limit=limit + 1,
+            db=db,
+            fields=_parse_fields(fields, view),
+            **_page_filters(status, created_after, created_before, cursor),
         )
-        return {
+        results, next_cursor = _paginate(rows, limit)
+        return store({
             "success": True,
             "count": len(results),
-            "results": results
-        }
+            "results": results,
+            "next_cursor": next_cursor,
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -808,9 +1432,77 @@ def _parse_optional_date(s: Optional[str]) -> Optional[datetime]:
         return None
 
 
+# 내보내기 응답을 이 크기(바이트) 정도씩 모아 전송
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_CSV_HEADER = ["id", "check_type", "hostname", "check_time", "checker", "status", "created_at", "results"]
+
+
+def _export_chunks(rows: Iterator[Dict[str, Any]], export_format: str, compress: bool) -> Iterator[bytes]:
+    """
+    내보내기 행 → 응답 바이트 덩어리 (약 EXPORT_CHUNK_BYTES 단위, compress면 gzip 스트림).
+    json은 {"success": true, "results": [...], "count": N} — 건수는 끝에서야 알 수 있으므로 마지막 키.
+    """
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip 헤더
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def take() -> bytes:
+        data = buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+        return gz.compress(data) if gz else data
+
+    count = 0
+    try:
+        if export_format == "csv":
+            writer.writerow(EXPORT_CSV_HEADER)
+        elif export_format == "json":
+            buf.write('{"success": true, "results": [')
+        for r in rows:
+            if export_format == "csv":
+                writer.writerow([
+                    r.get("id"),
+                    r.get("check_type") or "",
+                    r.get("hostname") or "",
+                    r.get("check_time") or "",
+                    r.get("checker") or "",
+                    r.get("status") or "",
+                    r.get("created_at") or "",
+                    json.dumps(r.get("results") or {}, ensure_ascii=False),
+                ])
+            elif export_format == "ndjson":
+                buf.write(json.dumps(r, ensure_ascii=False))
+                buf.write("\n")
+            else:
+                buf.write(",\n  " if count else "\n  ")
+                buf.write(json.dumps(r, ensure_ascii=False))
+            count += 1
+            if buf.tell() >= EXPORT_CHUNK_BYTES:
+                chunk = take()
+                if chunk:
+                    yield chunk
+        if export_format == "json":
+            buf.write(f'\n], "count": {count}}}\n')
+        chunk = take()
+        if gz:
+            chunk += gz.flush()
+        if chunk:
+            yield chunk
+    finally:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+
+
 @app.get("/api/checks/export")
 async def export_check_results(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: User = Depends(get_current_viewer),
     check_type: Optional[str] = None,
     hostname: Optional[str] = None,
     checker: Optional[str] = None,
@@ -819,1410 +1511,164 @@ async def export_check_results(
     created_after: Optional[str] = None,
     created_before: Optional[str] = None,
     ids: Optional[str] = None,
+    status: Optional[str] = None,
+    gzip: bool = False,
 ):
     """
-    저장된 점검 결과를 JSON 또는 CSV 파일로 내보내기.
-    format: json | csv
+    저장된 점검 결과를 JSON, CSV, NDJSON 또는 Parquet/Arrow 파일로 내보내기 (스트리밍).
+    format: json | csv | ndjson (한 줄에 결과 1건) | parquet | arrow
+      parquet/arrow: results 대신 요약의 수치 지표(CPU·메모리·디스크 사용률, 세션 수 등)를 컬럼으로 평탄화, zstd 압축 (pyarrow 필요)
+    limit: 최대 건수. 0 이하면 조건에 맞는 전체
     created_after, created_before: ISO 날짜(예 2026-02-01)
     ids: 쉼표 구분 ID 목록(예 1,2,3). 지정 시 해당 ID만 내보내기.
+    gzip: true면 gzip 압축(json/csv/ndjson). 요청에 Accept-Encoding: gzip이 있으면 Content-Encoding: gzip(브라우저가 자동 해제), 없으면 .gz 파일.
+    행은 서버 측 커서에서 EXPORT_BATCH_SIZE건씩 읽어 바로 전송하므로 건수와 무관하게 메모리가 일정하고 첫 바이트가 빠름.
     """
-    created_after_dt = _parse_optional_date(created_after)
-    created_before_dt = _parse_optional_date(created_before)
     id_list = None
     if ids:
         try:
             id_list = [int(x.strip()) for x in ids.split(",") if x.strip()]
         except ValueError:
             id_list = None
-    results = get_check_results(
+    export_format = (format or "json").strip().lower()
+    filters = dict(
         check_type=check_type,
         hostname=hostname,
         checker=checker,
-        limit=limit,
-        created_after=created_after_dt,
-        created_before=created_before_dt,
+        status=status or None,
+        created_after=_parse_optional_date(created_after),
+        created_before=_parse_optional_date(created_before),
         ids=id_list,
+        limit=limit if limit > 0 else None,
     )
-    export_format = (format or "json").strip().lower()
-    if export_format == "csv":
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(["id", "check_type", "hostname", "check_time", "checker", "status", "created_at", "results"])
-        for r in results:
-            results_json = json.dumps(r.get("results") or {}, ensure_ascii=False)
-            writer.writerow([
-                r.get("id"),
-                r.get("check_type") or "",
-                r.get("hostname") or "",
-                r.get("check_time") or "",
-                r.get("checker") or "",
-                r.get("status") or "",
-                r.get("created_at") or "",
-                results_json,
-            ])
-        body = buf.getvalue().encode("utf-8")
-        return Response(
-            content=body,
-            media_type="text/csv; charset=utf-8",
-            headers={"Content-Disposition": "attachment; filename=\"check_results.csv\""},
+    if export_format in ("parquet", "arrow"):
+        try:
+            from columnar_export import COLUMNAR_MEDIA_TYPES, columnar_chunks
+        except ImportError:
+            raise HTTPException(status_code=500, detail="컬럼형 내보내기 라이브러리(pyarrow)가 설치되지 않았습니다.")
+        rows = iter_check_results(fields=CHECK_RESULT_SUMMARY_FIELDS, with_summary=True, **filters)
+        return StreamingResponse(
+            iterate_db(columnar_chunks(rows, export_format, EXPORT_BATCH_SIZE)),
+            media_type=COLUMNAR_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f"attachment; filename=\"check_results.{export_format}\""},
         )
-    payload = {"success": True, "count": len(results), "results": results}
-    body = json.dumps(payload, ensure_ascii=False, indent=2)
-    return Response(
-        content=body,
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=\"check_results.json\""},
+    if export_format not in EXPORT_MEDIA_TYPES:
+        export_format = "json"
+    rows = iter_check_results(**filters)
+    filename = f"check_results.{export_format}"
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    headers = {}
+    if gzip:
+        if "gzip" in request.headers.get("accept-encoding", "").lower():
+            headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+        else:
+            filename += ".gz"
+            media_type = "application/gzip"
+    headers["Content-Disposition"] = f"attachment; filename=\"{filename}\""
+    return StreamingResponse(
+        iterate_db(_export_chunks(rows, export_format, gzip)),
+        media_type=media_type,
+        headers=headers,
     )
 
 
-def format_check_time(check_time_str: str) -> str:
-    """점검 시간을 한국어 형식으로 포맷팅"""
-    if not check_time_str or check_time_str == "N/A":
-        return "N/A"
-    
+export_jobs = ExportJobs(
+    EXPORT_DIR,
+    workers=EXPORT_JOB_WORKERS,
+    max_pending=EXPORT_JOB_MAX_PENDING,
+    ttl=EXPORT_JOB_TTL,
+)
+
+
+def _export_job_builder(body: ExportJobRequest) -> Tuple[Callable[[ExportProgress], Iterator[bytes]], str, str]:
+    """작업 요청 → (작업 스레드에서 실행할 내보내기 함수, 파일 확장자, media type). 텍스트 형식은 항상 gzip 압축"""
+    export_format = (body.format or "csv").strip().lower()
+    columnar = export_format in ("parquet", "arrow")
+    if columnar:
+        try:
+            from columnar_export import COLUMNAR_MEDIA_TYPES, columnar_chunks
+        except ImportError:
+            raise HTTPException(status_code=500, detail="컬럼형 내보내기 라이브러리(pyarrow)가 설치되지 않았습니다.")
+    elif export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format은 json, csv, ndjson, parquet, arrow 중 하나여야 합니다.")
+    filters = dict(
+        check_type=body.check_type or None,
+        hostname=body.hostname or None,
+        checker=body.checker or None,
+        status=body.status or None,
+        created_after=_parse_optional_date(body.created_after),
+        created_before=_parse_optional_date(body.created_before),
+        ids=body.ids or None,
+    )
+    limit = body.limit if body.limit > 0 else None
+
+    def build(progress: ExportProgress) -> Iterator[bytes]:
+        total = count_check_results(**filters)
+        progress.set_total(min(total, limit) if limit else total)
+        if columnar:
+            rows = iter_check_results(limit=limit, fields=CHECK_RESULT_SUMMARY_FIELDS, with_summary=True, **filters)
+            return columnar_chunks(progress.track(rows), export_format, EXPORT_BATCH_SIZE)
+        return _export_chunks(progress.track(iter_check_results(limit=limit, **filters)), export_format, True)
+
+    if columnar:
+        return build, export_format, COLUMNAR_MEDIA_TYPES[export_format]
+    return build, f"{export_format}.gz", "application/gzip"
+
+
+def _get_export_job(job_id: str, current_user: User) -> Dict[str, Any]:
+    """작업 조회. 없거나 다른 사용자의 작업이면 404 (admin·maintainer는 모든 작업 조회 가능)"""
+    job = export_jobs.get(job_id)
+    role = getattr(current_user, "role", None) or "viewer"
+    if job is None or (job.get("owner_id") != current_user.id and role not in ("admin", "maintainer")):
+        raise HTTPException(status_code=404, detail="내보내기 작업을 찾을 수 없습니다.")
+    return job
+
+
+@app.post("/api/checks/export/jobs")
+async def create_export_job(body: ExportJobRequest, current_user: User = Depends(get_current_viewer)):
+    """
+    대용량 내보내기를 백그라운드 작업으로 등록 → 202 + job_id.
+    진행 상황은 GET /api/checks/export/jobs/{job_id}, 완료 후 .../download 로 파일 받기.
+    결과 파일은 EXPORT_DIR에 저장되고 완료 후 EXPORT_JOB_TTL초가 지나면 삭제.
+    """
+    build, extension, media_type = _export_job_builder(body)
     try:
-        # ISO 8601 형식 파싱 (예: "2026-01-09T01:58:51Z")
-        if 'T' in check_time_str:
-            # ISO 8601 형식 파싱
-            dt_str = check_time_str.replace('Z', '+00:00')
-            dt = datetime.fromisoformat(dt_str)
-            
-            # UTC 시간대가 없으면 UTC로 간주
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            
-            # 한국 시간대(KST, UTC+9)로 변환
-            kst = timezone(timedelta(hours=9))
-            dt_kst = dt.astimezone(kst)
-            
-            # 한국어 형식으로 포맷팅 (예: "2026. 1. 9. 오전 10:58:51")
-            # strftime에서 %-m, %-d는 Windows에서 지원되지 않으므로 직접 처리
-            year = dt_kst.year
-            month = dt_kst.month
-            day = dt_kst.day
-            hour = dt_kst.hour
-            minute = dt_kst.minute
-            second = dt_kst.second
-            
-            # 오전/오후 구분
-            am_pm = "오전" if hour < 12 else "오후"
-            hour_12 = hour if hour <= 12 else hour - 12
-            if hour_12 == 0:
-                hour_12 = 12
-            
-            return f"{year}. {month}. {day}. {am_pm} {hour_12}:{minute:02d}:{second:02d}"
-        return check_time_str
-    except Exception:
-        return check_time_str
-
-
-def format_db_result(result: Dict[str, Any]) -> Dict[str, Any]:
-    """DB 점검 결과를 표 형식으로 정리"""
-    check_type = result.get("check_type", "")
-    results = result.get("results", {})
-    formatted = {
-        "id": result.get("id"),
-        "점검유형": check_type.upper(),
-        "호스트명": result.get("hostname", "N/A"),
-        "점검시간": format_check_time(result.get("check_time", "N/A")),
-        "check_time": result.get("check_time", "N/A"),  # 원본 날짜 (차트용)
-        "created_at": result.get("created_at", "N/A"),  # 데이터베이스 저장 시간 (날짜 필터용)
-        "담당자": result.get("checker", "N/A"),
-        "상태": result.get("status", "N/A"),
-    }
-    
-    if check_type == "mariadb":
-        # MariaDB 점검 결과 정리
-        installation = results.get("installation", {})
-        service_status = results.get("service_status", {})
-        listener = results.get("listener", "N/A")
-        os_resources = results.get("os_resources", {})
-        db_internal = results.get("db_internal", {})
-        database = results.get("database", {})
-        directory_structure = results.get("directory_structure", "N/A")
-        filesystem_usage = results.get("filesystem_usage", "N/A")
-        
-        # 메모리 정보 파싱 (안전하게)
-        memory_total = "N/A"
-        memory_used = "N/A"
-        memory_available = "N/A"
-        try:
-            mem_data = os_resources.get("memory", "")
-            if isinstance(mem_data, dict):
-                mem_str = mem_data.get("detail", "")
-            else:
-                mem_str = str(mem_data)
-            if isinstance(mem_str, str) and "\n" in mem_str:
-                lines = mem_str.split("\n")
-                if len(lines) > 1:
-                    parts = lines[1].split()
-                    if len(parts) >= 2:
-                        memory_total = parts[1]
-                        memory_used = parts[2] if len(parts) > 2 else "N/A"
-                        memory_available = parts[6] if len(parts) > 6 else "N/A"
-        except:
-            pass
-        
-        # CPU 정보 파싱
-        cpu_info = "N/A"
-        try:
-            cpu_data = os_resources.get("cpu", "")
-            if isinstance(cpu_data, dict):
-                cpu_str = cpu_data.get("detail", "")
-            else:
-                cpu_str = str(cpu_data)
-            if isinstance(cpu_str, str):
-                if "%Cpu" in cpu_str:
-                    cpu_info = cpu_str.split("%Cpu")[1].strip()[:50] if "%Cpu" in cpu_str else "N/A"
-        except:
-            pass
-        
-        # InnoDB 버퍼풀 파싱
-        innodb_bp = "N/A"
-        try:
-            bp_str = db_internal.get("innodb_buffer_pool", "")
-            if isinstance(bp_str, str) and "\t" in bp_str:
-                innodb_bp = bp_str.split("\t")[1].strip()
-        except:
-            pass
-        
-        # 바이너리 로그 파싱
-        log_bin_status = "OFF"
-        try:
-            log_bin_str = db_internal.get("log_bin", "")
-            if "ON" in str(log_bin_str):
-                log_bin_status = "ON"
-        except:
-            pass
-        
-        # 테이블스페이스 요약
-        tablespace_summary = "N/A"
-        try:
-            ts_str = db_internal.get("tablespace", "")
-            if isinstance(ts_str, str):
-                lines = ts_str.split("\n")
-                if len(lines) > 0:
-                    tablespace_summary = f"{len(lines)}개 DB" + (f" | {lines[0][:30]}..." if lines[0] else "")
-        except:
-            pass
-        
-        # 온라인 백업 가능 여부 파싱
-        online_backup_possible = db_internal.get("online_backup_possible", "N/A")
-        
-        # 설치 확인 파싱
-        installation_status = "✗"
-        installation_path = "N/A"
-        try:
-            installed_str = str(installation.get("installed", "")).strip()
-            # 첫 줄만 확인 (여러 줄이 있을 수 있음)
-            if "\n" in installed_str:
-                installed_str = installed_str.split("\n")[0]
-            if installed_str.upper() == "INSTALLED":
-                installation_status = "✓"
-            installation_path = installation.get("base_directory", installation.get("binary_path", "N/A"))
-        except:
-            pass
-        
-        # 데이터베이스 정보 파싱
-        db_list = database.get("db_list", "N/A")
-        db_count = database.get("db_count", "N/A")
-        # 빈 문자열이나 공백만 있는 경우 처리
-        if isinstance(db_list, str):
-            db_list_stripped = db_list.strip()
-            if db_list_stripped and db_list_stripped != "N/A":
-                db_list_display = db_list_stripped[:50] + "..." if len(db_list_stripped) > 50 else db_list_stripped
-            else:
-                db_list_display = "없음"  # 빈 문자열이면 "없음"으로 표시
-        else:
-            db_list_display = "N/A"
-        
-        # CPU/메모리 상위 프로세스 파싱
-        cpu_top = "N/A"
-        mem_top = "N/A"
-        try:
-            cpu_top_str = os_resources.get("cpu_top_processes", "")
-            mem_top_str = os_resources.get("mem_top_processes", "")
-            if isinstance(cpu_top_str, str) and cpu_top_str.strip() and cpu_top_str != "N/A":
-                cpu_top = "있음"
-            if isinstance(mem_top_str, str) and mem_top_str.strip() and mem_top_str != "N/A":
-                mem_top = "있음"
-        except:
-            pass
-        
-        # OS 기초 체력 점검 항목 파싱
-        os_basics = results.get("os_basics", {})
-        cpu_model = os_basics.get("cpu_model_name", "N/A")
-        
-        # Swap 상태 파싱
-        swap_status_display = "N/A"
-        try:
-            swap_str = os_basics.get("swap_status", "")
-            if isinstance(swap_str, str) and swap_str.strip():
-                # "Swap: 2.0Gi 0B 2.0Gi" 형식에서 사용량 추출
-                parts = swap_str.split()
-                if len(parts) >= 3:
-                    swap_status_display = f"{parts[1]} / {parts[2]}"
-        except:
-            pass
-        
-        # 루트 디스크 사용률
-        root_disk_usage = os_basics.get("root_disk_usage", "N/A")
-        root_disk_display = f"{root_disk_usage}%" if root_disk_usage != "N/A" and root_disk_usage.isdigit() else root_disk_usage
-        
-        # 전체 디스크 사용 현황 요약
-        all_disk_summary = "N/A"
-        try:
-            all_disk_str = os_basics.get("all_disk_usage", "")
-            if isinstance(all_disk_str, str) and all_disk_str.strip():
-                # df -h 출력에서 70% 이상인 것만 카운트
-                lines = all_disk_str.split("\n")
-                high_usage_count = 0
-                for line in lines[1:]:  # 첫 줄(헤더) 제외
-                    if "%" in line and "Use%" not in line:
-                        parts = line.split()
-                        for part in parts:
-                            if part.endswith("%") and part != "Use%":
-                                try:
-                                    usage = int(part.replace("%", ""))
-                                    if usage >= 70:
-                                        high_usage_count += 1
-                                except (ValueError, AttributeError):
-                                    pass
-                if high_usage_count > 0:
-                    all_disk_summary = f"{high_usage_count}개 디스크 70% 이상"
-                else:
-                    all_disk_summary = "정상"
-        except Exception:
-            pass
-        
-        # 네트워크 통신 상태
-        network_status = "N/A"
-        try:
-            ping_result = os_basics.get("network_ping_result", "")
-            if isinstance(ping_result, str):
-                if "0% packet loss" in ping_result or "0 received" not in ping_result:
-                    network_status = "✓ 연결됨"
-                else:
-                    network_status = "✗ 연결실패"
-        except:
-            pass
-        
-        # NTP 동기화 상태
-        ntp_status = "N/A"
-        try:
-            ntp_str = os_basics.get("ntp_sync_status", "")
-            if isinstance(ntp_str, str):
-                if "NTP not configured" in ntp_str:
-                    ntp_status = "미설정"
-                elif "*" in ntp_str or "^*" in ntp_str:
-                    ntp_status = "✓ 동기화됨"
-                else:
-                    ntp_status = "설정됨"
-        except:
-            pass
-        
-        # 파일시스템 사용률 파싱
-        db_engine_fs = "N/A"
-        archive_log_fs = "N/A"
-        system_log_fs = "N/A"
-        try:
-            if isinstance(filesystem_usage, dict):
-                # DB엔진 파일시스템 파싱 (df -h 출력에서 사용률 추출)
-                db_engine_str = filesystem_usage.get("db_engine", "")
-                if isinstance(db_engine_str, str) and db_engine_str != "N/A" and db_engine_str.strip():
-                    # df -h 출력 형식: "/dev/sdd       1007G  4.2G  952G   1% /"
-                    parts = db_engine_str.split()
-                    if len(parts) >= 5:
-                        # 사용률 추출 (예: "1%")
-                        usage = parts[-2] if parts[-2].endswith("%") else "N/A"
-                        # 파일시스템과 마운트 포인트
-                        fs_info = f"{parts[0]} {usage} {parts[-1]}" if usage != "N/A" else db_engine_str[:50]
-                        db_engine_fs = fs_info
-                    else:
-                        db_engine_fs = db_engine_str[:50]
-                
-                # 아카이브 로그 파일시스템 파싱
-                archive_log_str = filesystem_usage.get("archive_log", "")
-                if isinstance(archive_log_str, str) and archive_log_str != "N/A" and archive_log_str.strip():
-                    if "not found" not in archive_log_str.lower():
-                        parts = archive_log_str.split()
-                        if len(parts) >= 5:
-                            usage = parts[-2] if parts[-2].endswith("%") else "N/A"
-                            fs_info = f"{parts[0]} {usage} {parts[-1]}" if usage != "N/A" else archive_log_str[:50]
-                            archive_log_fs = fs_info
-                        else:
-                            archive_log_fs = archive_log_str[:50]
-                    else:
-                        archive_log_fs = "N/A"
-                
-                # 시스템 로그 파일시스템 파싱
-                system_log_str = filesystem_usage.get("system_log", "")
-                if isinstance(system_log_str, str) and system_log_str != "N/A" and system_log_str.strip():
-                    if "not found" not in system_log_str.lower():
-                        parts = system_log_str.split()
-                        if len(parts) >= 5:
-                            usage = parts[-2] if parts[-2].endswith("%") else "N/A"
-                            fs_info = f"{parts[0]} {usage} {parts[-1]}" if usage != "N/A" else system_log_str[:50]
-                            system_log_fs = fs_info
-                        else:
-                            system_log_fs = system_log_str[:50]
-                    else:
-                        system_log_fs = "N/A"
-        except Exception as e:
-            pass
-        
-        # 최대연결수 파싱
-        max_conn = "N/A"
-        try:
-            max_conn_str = db_internal.get("max_connections", "")
-            if isinstance(max_conn_str, str) and max_conn_str.strip() and max_conn_str != "N/A":
-                max_conn = max_conn_str.strip()
-        except:
-            pass
-        
-        # 활성세션수 파싱
-        active_sess = "N/A"
-        try:
-            sess_str = db_internal.get("active_sessions", "")
-            if isinstance(sess_str, str) and sess_str.strip() and sess_str != "N/A":
-                active_sess = sess_str.strip()
-            elif isinstance(sess_str, (int, float)):
-                active_sess = str(int(sess_str))
-        except:
-            pass
-        
-        # DB접속상태 파싱
-        db_conn_status = "N/A"
-        try:
-            conn_str = db_internal.get("db_connection_status", "")
-            if isinstance(conn_str, str):
-                if "CONNECTED" in conn_str.upper():
-                    db_conn_status = "✓ 연결됨"
-                elif "DISCONNECTED" in conn_str.upper():
-                    db_conn_status = "✗ 연결실패"
-                else:
-                    db_conn_status = conn_str
-        except:
-            pass
-        
-        # 관리프로세스 파싱
-        admin_proc = "N/A"
-        try:
-            proc_str = db_internal.get("mariadb_process", "")
-            if isinstance(proc_str, str):
-                if "RUNNING" in proc_str.upper():
-                    admin_proc = "✓ 실행중"
-                elif "NOT_RUNNING" in proc_str.upper():
-                    admin_proc = "✗ 중지됨"
-                else:
-                    admin_proc = proc_str
-        except:
-            pass
-        
-        # HA상태 파싱
-        ha_status_display = "N/A"
-        try:
-            ha_str = db_internal.get("ha_status", "")
-            if isinstance(ha_str, str) and ha_str.strip() and ha_str != "N/A":
-                ha_status_display = ha_str.strip()[:50]
-        except:
-            pass
-        
-        formatted.update({
-            "설치확인": installation_status,
-            "설치경로": str(installation_path)[:40],
-            "디렉토리구조": "있음" if "not present" not in str(directory_structure).lower() else "없음",
-            "파일시스템": "있음" if "not found" not in str(filesystem_usage).lower() else "없음",
-            "서비스상태": f"{service_status.get('active', 'N/A')}/{service_status.get('substate', 'N/A')}",
-            "리스너(MariaDB)": "LISTENING" if "LISTEN" in str(listener) else "NOT LISTENING",
-            "DB엔진파일시스템": db_engine_fs,
-            "아카이브로그파일시스템": archive_log_fs,
-            "시스템로그파일시스템": system_log_fs,
-            "메모리(Total)": memory_total,
-            "메모리(Used)": memory_used,
-            "메모리(Available)": memory_available,
-            "메모리": f"{memory_total} / {memory_available}",
-            "메모리사용률": os_resources.get("memory", {}).get("usage_percent", "N/A") if isinstance(os_resources.get("memory"), dict) else "N/A",
-            "CPU사용률": cpu_info,
-            "CPU": os_resources.get("cpu", {}).get("usage_percent", "N/A") if isinstance(os_resources.get("cpu"), dict) else "N/A",
-            "프로세스수": os_resources.get("process_count", "N/A"),
-            "InnoDB버퍼풀": innodb_bp,
-            "바이너리로그": log_bin_status,
-            "테이블스페이스": tablespace_summary,
-            "데이터베이스수": str(db_count).strip() if str(db_count).strip() != "0" else "0 (사용자 DB 없음)",
-            "데이터베이스목록": db_list_display,
-            "최대연결수": max_conn,
-            "활성세션수": active_sess,
-            "DB접속상태": db_conn_status,
-            "관리프로세스": admin_proc,
-            "HA상태": ha_status_display,
-            "온라인백업가능": "가능" if "POSSIBLE" in str(online_backup_possible).upper() else "불가능",
-            "CPU상위프로세스": cpu_top,
-            "메모리상위프로세스": mem_top,
-            "CPU모델명": cpu_model[:50] if cpu_model != "N/A" else "N/A",
-            "Swap상태": swap_status_display,
-            "루트디스크사용률": root_disk_display,
-            "디스크사용현황": all_disk_summary,
-            "파일시스템(70%초과)": all_disk_summary,  # 동일한 값 사용
-            "네트워크통신": network_status,
-            "NTP동기화": ntp_status,
-        })
-    
-    elif check_type == "postgresql":
-        # PostgreSQL 점검 결과 정리
-        installation = results.get("installation", {})
-        service_status = results.get("service_status", {})
-        listener = results.get("listener", {})
-        db_parameters = results.get("db_parameters", {})
-        tablespace = results.get("tablespace", {})
-        wal = results.get("wal", {})
-        filesystem_usage = results.get("filesystem_usage", {})
-        db_connection = results.get("db_connection", {})
-        os_resources = results.get("os_resources", {})
-        database = results.get("database", {})
-        
-        # 파일시스템 사용률 파싱
-        fs_usage = "정상"
-        try:
-            fs_str = filesystem_usage.get("usage_over_70", "")
-            if fs_str and fs_str.strip() and fs_str != "N/A":
-                fs_usage = "70% 초과 있음"
-        except:
-            pass
-        
-        # DB엔진 파일시스템 파싱
-        db_engine_fs = "N/A"
-        try:
-            db_engine_str = filesystem_usage.get("db_engine", "")
-            if isinstance(db_engine_str, str) and db_engine_str != "N/A":
-                # 사용률 추출 (예: "34%")
-                db_engine_fs = db_engine_str.split()[-2] if len(db_engine_str.split()) >= 5 else "N/A"
-        except:
-            pass
-        
-        # 리스너 파싱
-        listener_status = "NOT LISTENING"
-        listener_detail = ""
-        try:
-            listener_str = str(listener.get("port_5432", ""))
-            if "LISTEN" in listener_str:
-                listener_status = "LISTENING"
-                # IP 주소 추출
-                if "127.0.0.1" in listener_str:
-                    listener_detail = "localhost"
-                elif "0.0.0.0" in listener_str:
-                    listener_detail = "all"
-        except:
-            pass
-        
-        # DB 접속 상태 파싱
-        db_conn_status = "N/A"
-        session_count = "N/A"
-        try:
-            db_conn_str = db_connection.get("status", "")
-            if isinstance(db_conn_str, str):
-                if "CONNECTED" in db_conn_str.upper():
-                    db_conn_status = "✓ 연결됨"
-                elif "DISCONNECTED" in db_conn_str.upper() or "NO_CONNECTIONS" in db_conn_str.upper():
-                    db_conn_status = "✗ 연결실패"
-                else:
-                    db_conn_status = db_conn_str
-            
-            # 활성세션수 파싱
-            session_str = db_connection.get("active_sessions", "")
-            if isinstance(session_str, str) and session_str != "N/A" and session_str.strip():
-                session_count = session_str.strip()
-            elif isinstance(session_str, (int, float)):
-                session_count = str(int(session_str))
-            else:
-                # session_detail에서 줄 수 계산 (fallback)
-                session_detail = db_connection.get("session_detail", "")
-                if isinstance(session_detail, str) and session_detail != "N/A" and session_detail.strip():
-                    if "\n" in session_detail:
-                        session_count = str(len([l for l in session_detail.split("\n") if l.strip()]))
-                    else:
-                        session_count = "1" if session_detail.strip() else "0"
-        except:
-            pass
-        
-        # 관리프로세스 파싱
-        admin_proc = "N/A"
-        try:
-            proc_str = results.get("postgres_process", "")
-            if isinstance(proc_str, str):
-                if "RUNNING" in proc_str.upper():
-                    admin_proc = "✓ 실행중"
-                elif "NOT_RUNNING" in proc_str.upper():
-                    admin_proc = "✗ 중지됨"
-                else:
-                    admin_proc = proc_str
-        except:
-            pass
-        
-        # HA상태 파싱
-        ha_status_display = "N/A"
-        try:
-            ha_str = results.get("ha_status", "")
-            if isinstance(ha_str, str) and ha_str.strip() and ha_str != "N/A":
-                ha_status_display = ha_str.strip()[:50]
-        except:
-            pass
-        
-        # 메모리 정보 파싱
-        memory_info = "N/A"
-        memory_percent = "N/A"
-        try:
-            mem_detail = os_resources.get("memory", {})
-            if isinstance(mem_detail, dict):
-                mem_str = mem_detail.get("detail", "")
-                memory_percent = mem_detail.get("usage_percent", "N/A")
-                if isinstance(mem_str, str) and "\n" in mem_str:
-                    lines = mem_str.split("\n")
-                    if len(lines) > 1:
-                        parts = lines[1].split()
-                        if len(parts) >= 2:
-                            memory_info = f"{parts[1]} / {parts[2]}"
-            elif isinstance(mem_detail, str):
-                # 이전 형식 호환
-                if "\n" in mem_detail:
-                    lines = mem_detail.split("\n")
-                    if len(lines) > 1:
-                        parts = lines[1].split()
-                        if len(parts) >= 2:
-                            memory_info = f"{parts[1]} / {parts[2]}"
-        except:
-            pass
-        
-        # CPU 정보 파싱
-        cpu_info = "N/A"
-        cpu_percent = "N/A"
-        try:
-            cpu_detail = os_resources.get("cpu", {})
-            if isinstance(cpu_detail, dict):
-                cpu_str = cpu_detail.get("detail", "")
-                cpu_percent = cpu_detail.get("usage_percent", "N/A")
-                cpu_info = cpu_str[:50] if isinstance(cpu_str, str) else "N/A"
-            elif isinstance(cpu_detail, str):
-                cpu_info = cpu_detail[:50]
-        except:
-            pass
-        
-        # WAL 크기 파싱
-        wal_size = "N/A"
-        try:
-            wal_str = wal.get("wal_size", "")
-            if isinstance(wal_str, str) and wal_str != "N/A":
-                wal_size = wal_str.strip()
-        except:
-            pass
-        
-        # 테이블스페이스 요약
-        tablespace_summary = "N/A"
-        try:
-            ts_str = tablespace.get("usage", "")
-            if isinstance(ts_str, str) and ts_str != "N/A":
-                lines = ts_str.split("\n")
-                if len(lines) > 0:
-                    tablespace_summary = f"{len(lines)}개" + (f" | {lines[0][:30]}..." if lines[0] else "")
-        except:
-            pass
-        
-        # 설치 확인 파싱
-        installation_status = "✗"
-        installation_path = "N/A"
-        try:
-            installed_str = str(installation.get("installed", "")).strip()
-            # 첫 줄만 확인 (여러 줄이 있을 수 있음)
-            if "\n" in installed_str:
-                installed_str = installed_str.split("\n")[0]
-            if installed_str.upper() == "INSTALLED":
-                installation_status = "✓"
-            installation_path = installation.get("base_directory", installation.get("binary_path", "N/A"))
-        except:
-            pass
-        
-        # 데이터베이스 정보 파싱
-        db_list = database.get("db_list", "N/A")
-        db_count = database.get("db_count", "N/A")
-        # 빈 문자열이나 공백만 있는 경우 처리
-        if isinstance(db_list, str):
-            db_list_stripped = db_list.strip()
-            if db_list_stripped and db_list_stripped != "N/A":
-                db_list_display = db_list_stripped[:50] + "..." if len(db_list_stripped) > 50 else db_list_stripped
-            else:
-                db_list_display = "없음"  # 빈 문자열이면 "없음"으로 표시
-        else:
-            db_list_display = "N/A"
-        
-        # CPU/메모리 상위 프로세스 파싱
-        cpu_top = "N/A"
-        mem_top = "N/A"
-        try:
-            cpu_top_str = os_resources.get("cpu_top_processes", "")
-            mem_top_str = os_resources.get("mem_top_processes", "")
-            if isinstance(cpu_top_str, str) and cpu_top_str.strip() and cpu_top_str != "N/A":
-                cpu_top = "있음"
-            if isinstance(mem_top_str, str) and mem_top_str.strip() and mem_top_str != "N/A":
-                mem_top = "있음"
-        except:
-            pass
-        
-        # OS 기초 체력 점검 항목 파싱
-        os_basics = results.get("os_basics", {})
-        cpu_model = os_basics.get("cpu_model_name", "N/A")
-        
-        # Swap 상태 파싱
-        swap_status_display = "N/A"
-        try:
-            swap_str = os_basics.get("swap_status", "")
-            if isinstance(swap_str, str) and swap_str.strip():
-                # "Swap: 2.0Gi 0B 2.0Gi" 형식에서 사용량 추출
-                parts = swap_str.split()
-                if len(parts) >= 3:
-                    swap_status_display = f"{parts[1]} / {parts[2]}"
-        except:
-            pass
-        
-        # 루트 디스크 사용률
-        root_disk_usage = os_basics.get("root_disk_usage", "N/A")
-        root_disk_display = f"{root_disk_usage}%" if root_disk_usage != "N/A" and root_disk_usage.isdigit() else root_disk_usage
-        
-        # 전체 디스크 사용 현황 요약
-        all_disk_summary = "N/A"
-        try:
-            all_disk_str = os_basics.get("all_disk_usage", "")
-            if isinstance(all_disk_str, str) and all_disk_str.strip():
-                # df -h 출력에서 70% 이상인 것만 카운트
-                lines = all_disk_str.split("\n")
-                high_usage_count = 0
-                for line in lines[1:]:  # 첫 줄(헤더) 제외
-                    if "%" in line and "Use%" not in line:
-                        parts = line.split()
-                        for part in parts:
-                            if part.endswith("%") and part != "Use%":
-                                try:
-                                    usage = int(part.replace("%", ""))
-                                    if usage >= 70:
-                                        high_usage_count += 1
-                                except (ValueError, AttributeError):
-                                    pass
-                if high_usage_count > 0:
-                    all_disk_summary = f"{high_usage_count}개 디스크 70% 이상"
-                else:
-                    all_disk_summary = "정상"
-        except Exception:
-            pass
-        
-        # 네트워크 통신 상태
-        network_status = "N/A"
-        try:
-            ping_result = os_basics.get("network_ping_result", "")
-            if isinstance(ping_result, str):
-                if "0% packet loss" in ping_result or "0 received" not in ping_result:
-                    network_status = "✓ 연결됨"
-                else:
-                    network_status = "✗ 연결실패"
-        except:
-            pass
-        
-        # NTP 동기화 상태
-        ntp_status = "N/A"
-        try:
-            ntp_str = os_basics.get("ntp_sync_status", "")
-            if isinstance(ntp_str, str):
-                if "NTP not configured" in ntp_str:
-                    ntp_status = "미설정"
-                elif "*" in ntp_str or "^*" in ntp_str:
-                    ntp_status = "✓ 동기화됨"
-                else:
-                    ntp_status = "설정됨"
-        except:
-            pass
-        
-        # 디렉토리구조 파싱
-        directory_structure = results.get("directory_structure", "N/A")
-        
-        # 메모리 상세 정보 파싱 (Total, Used, Available)
-        memory_total = "N/A"
-        memory_used = "N/A"
-        memory_available = "N/A"
-        try:
-            mem_detail = os_resources.get("memory", {})
-            if isinstance(mem_detail, dict):
-                mem_str = mem_detail.get("detail", "")
-                if isinstance(mem_str, str) and "\n" in mem_str:
-                    lines = mem_str.split("\n")
-                    if len(lines) > 1:
-                        parts = lines[1].split()
-                        if len(parts) >= 2:
-                            memory_total = parts[1]
-                            memory_used = parts[2] if len(parts) > 2 else "N/A"
-                            memory_available = parts[6] if len(parts) > 6 else "N/A"
-        except:
-            pass
-        
-        formatted.update({
-            "설치확인": installation_status,
-            "설치경로": str(installation_path)[:40],
-            "디렉토리구조": "있음" if "not present" not in str(directory_structure).lower() else "없음",
-            "DB엔진파일시스템": db_engine_fs,
-            "아카이브로그파일시스템": filesystem_usage.get("archive_log", "N/A")[:50],
-            "시스템로그파일시스템": filesystem_usage.get("system_log", "N/A")[:50],
-            "파일시스템": "있음" if "not found" not in str(filesystem_usage).lower() else "없음",
-            "파일시스템(70%초과)": fs_usage if isinstance(fs_usage, str) else "정상",
-            "서비스상태": f"{service_status.get('active', 'N/A')}/{service_status.get('substate', 'N/A')}",
-            "리스너(PostgreSQL)": f"{listener_status} ({listener_detail})",
-            "DB접속상태": db_conn_status,
-            "활성세션수": session_count,
-            "관리프로세스": admin_proc,
-            "HA상태": ha_status_display,
-            "메모리(Total)": memory_total,
-            "메모리(Used)": memory_used,
-            "메모리(Available)": memory_available,
-            "메모리": memory_info,
-            "메모리사용률": memory_percent,
-            "CPU": cpu_info,
-            "CPU사용률": cpu_percent,
-            "프로세스수": os_resources.get("process_count", "N/A"),
-            "공유버퍼": str(db_parameters.get("shared_buffers", "N/A")).strip(),
-            "최대연결수": str(db_parameters.get("max_connections", "N/A")).strip(),
-            "테이블스페이스": tablespace_summary,
-            "아카이브모드": str(wal.get("archive_mode", "N/A")).strip(),
-            "온라인백업가능": "가능" if "POSSIBLE" in str(wal.get("online_backup_possible", "")).upper() else "불가능",
-            "WAL크기": wal_size,
-            "데이터베이스수": str(db_count).strip() if str(db_count).strip() != "0" else "0 (사용자 DB 없음)",
-            "데이터베이스목록": db_list_display,
-            "CPU상위프로세스": cpu_top,
-            "메모리상위프로세스": mem_top,
-            "CPU모델명": cpu_model[:50] if cpu_model != "N/A" else "N/A",
-            "Swap상태": swap_status_display,
-            "루트디스크사용률": root_disk_display,
-            "디스크사용현황": all_disk_summary,
-            "네트워크통신": network_status,
-            "NTP동기화": ntp_status,
-        })
+        job = export_jobs.submit(build, extension, media_type, current_user.id, body.model_dump(exclude_none=True))
+    except ExportJobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return JSONResponse(
+        status_code=202,
+        content={
+            "success": True,
+            "job": job,
+            "status_url": f"/api/checks/export/jobs/{job['job_id']}",
+            "download_url": f"/api/checks/export/jobs/{job['job_id']}/download",
+        },
+    )
 
-    elif check_type == "os":
-        # OS 점검 결과 정리 (DB/OS 공통 컬럼 스키마에 맞춤)
-        cpu = results.get("cpu", {})
-        memory = results.get("memory", {})
-        disk = results.get("disk", {})
-        network = results.get("network", {})
-        ntp = results.get("ntp", {})
 
-        # CPU 모델명
-        cpu_model = "N/A"
-        try:
-            if isinstance(cpu, dict):
-                cpu_model = cpu.get("model", "N/A")
-            elif isinstance(cpu, str):
-                cpu_model = cpu
-        except:
-            pass
-
-        # Swap 상태 (예: "Swap: 2.0Gi 0B 2.0Gi" → "2.0Gi / 0B")
-        swap_status_display = "N/A"
-        try:
-            if isinstance(memory, dict):
-                swap_str = memory.get("swap", "")
-                if isinstance(swap_str, str) and swap_str.strip():
-                    parts = swap_str.split()
-                    if len(parts) >= 3:
-                        swap_status_display = f"{parts[1]} / {parts[2]}"
-        except:
-            pass
-
-        # 루트 디스크 사용률
-        root_disk_usage = "N/A"
-        try:
-            if isinstance(disk, dict):
-                root_disk_usage = disk.get("root_usage_percent", "N/A")
-        except:
-            pass
-        if isinstance(root_disk_usage, str) and root_disk_usage.isdigit():
-            root_disk_display = f"{root_disk_usage}%"
-        else:
-            root_disk_display = root_disk_usage
+@app.get("/api/checks/export/jobs/{job_id}")
+async def get_export_job(job_id: str, current_user: User = Depends(get_current_viewer)):
+    """내보내기 작업 상태: queued | running | done | failed, 처리 건수(rows)/예상 건수(total), progress(%)"""
+    job = _get_export_job(job_id, current_user)
+    return {"success": True, "job": export_jobs.public(job)}
 
-        # 전체 디스크 사용 현황 요약 (간단히 high-level 요약만)
-        all_disk_summary = "N/A"
-        try:
-            if isinstance(disk, dict):
-                all_disk_str = disk.get("all", "")
-                if isinstance(all_disk_str, str) and all_disk_str.strip():
-                    # 70% 이상 사용 중인 디스크 수 계산
-                    lines = all_disk_str.split("\n")
-                    high_usage_count = 0
-                    for line in lines[1:]:
-                        if "%" in line and "Use%" not in line:
-                            parts = line.split()
-                            for part in parts:
-                                if part.endswith("%") and part != "Use%":
-                                    try:
-                                        usage = int(part.replace("%", ""))
-                                        if usage >= 70:
-                                            high_usage_count += 1
-                                    except (ValueError, AttributeError):
-                                        pass
-                    if high_usage_count > 0:
-                        all_disk_summary = f"{high_usage_count}개 디스크 70% 이상"
-                    else:
-                        all_disk_summary = "정상"
-        except:
-            pass
-
-        # 네트워크 통신 상태
-        network_status = "N/A"
-        try:
-            if isinstance(network, dict):
-                ping_result = network.get("ping_result", "")
-                if isinstance(ping_result, str):
-                    if "0% packet loss" in ping_result:
-                        network_status = "✓ 연결됨"
-                    elif "packet loss" in ping_result:
-                        network_status = "✗ 연결실패"
-                    else:
-                        network_status = ping_result[:50]
-        except:
-            pass
-
-        # NTP 동기화 상태
-        ntp_status = "N/A"
-        try:
-            if isinstance(ntp, dict):
-                ntp_str = ntp.get("status", "")
-                if isinstance(ntp_str, str):
-                    if "NTP not configured" in ntp_str:
-                        ntp_status = "미설정"
-                    elif "*" in ntp_str or "^*" in ntp_str:
-                        ntp_status = "✓ 동기화됨"
-                    else:
-                        ntp_status = "설정됨"
-        except:
-            pass
-
-        # CPU/메모리 상위 프로세스
-        cpu_top = "N/A"
-        mem_top = "N/A"
-        try:
-            if isinstance(cpu, dict):
-                cpu_top_str = cpu.get("top_processes", "")
-                if isinstance(cpu_top_str, str) and cpu_top_str.strip() and cpu_top_str != "N/A":
-                    cpu_top = "있음"
-            if isinstance(memory, dict):
-                mem_top_str = memory.get("top_processes", "")
-                if isinstance(mem_top_str, str) and mem_top_str.strip() and mem_top_str != "N/A":
-                    mem_top = "있음"
-        except:
-            pass
-
-        # OS용 포맷 결과 (DB와 동일한 공통 19개 컬럼 구조 맞추기)
-        formatted.update({
-            # 설치 정보 (OS는 별도 설치 개념이 없으므로 N/A)
-            "설치확인": "N/A",
-            "설치경로": "N/A",
-
-            # OS 기초 체력
-            "CPU모델명": cpu_model[:50] if isinstance(cpu_model, str) else "N/A",
-            "Swap상태": swap_status_display,
-            "루트디스크사용률": root_disk_display,
-            "디스크사용현황": all_disk_summary,
-            "네트워크통신": network_status,
-            "NTP동기화": ntp_status,
-
-            # OS 리소스
-            "CPU상위프로세스": cpu_top,
-            "메모리상위프로세스": mem_top,
-
-            # 공통 DB 정보 (OS는 DB가 없으므로 N/A)
-            "프로세스수": "N/A",
-            "데이터베이스수": "N/A",
-            "데이터베이스목록": "N/A",
-            "테이블스페이스": "N/A",
-        })
 
-    elif check_type == "cubrid":
-        # CUBRID 점검 결과 정리
-        installation = results.get("installation", {})
-        service_status = results.get("service_status", {})
-        processes = results.get("processes", {})
-        database = results.get("database", {})
-        os_resources = results.get("os_resources", {})
-        tablespace = results.get("tablespace", {})
-        filesystem = results.get("filesystem", {})
-        ha = results.get("ha", {})
-        
-        # CUBRID 서비스 상태 확인
-        service_state = "STOPPED"
-        server_state = "STOPPED"
-        broker_state = "STOPPED"
-        try:
-            service_str = str(service_status.get("service", "")).strip()
-            server_str = str(service_status.get("server", "")).strip()
-            broker_str = str(service_status.get("broker", "")).strip()
-            
-            # 서비스 상태 파싱
-            if not service_str or service_str == "":
-                service_state = "STOPPED"
-            elif "error" in service_str.lower() or "failed" in service_str.lower():
-                service_state = "ERROR"
-            elif "running" in service_str.lower() and "not running" not in service_str.lower():
-                service_state = "RUNNING"
-            elif "not running" in service_str.lower() or "stopped" in service_str.lower():
-                service_state = "STOPPED"
-            else:
-                # 알 수 없는 상태는 간단히 표시
-                if "unknown" in service_str.lower():
-                    service_state = "UNKNOWN"
-                else:
-                    service_state = "STOPPED"
-            
-            # 서버 상태 파싱
-            if not server_str or server_str == "":
-                server_state = "STOPPED"
-            elif "error" in server_str.lower() or "failed" in server_str.lower():
-                server_state = "ERROR"
-            elif "running" in server_str.lower() and "not running" not in server_str.lower():
-                server_state = "RUNNING"
-            elif "not running" in server_str.lower() or "stopped" in server_str.lower():
-                server_state = "STOPPED"
-            else:
-                if "unknown" in server_str.lower():
-                    server_state = "UNKNOWN"
-                else:
-                    server_state = "STOPPED"
-            
-            # 브로커 상태 파싱
-            if not broker_str or broker_str == "":
-                broker_state = "STOPPED"
-            elif "error" in broker_str.lower() or "failed" in broker_str.lower():
-                broker_state = "ERROR"
-            elif "running" in broker_str.lower() or "active" in broker_str.lower():
-                if "not running" not in broker_str.lower():
-                    broker_state = "RUNNING"
-                else:
-                    broker_state = "STOPPED"
-            elif "not running" in broker_str.lower() or "stopped" in broker_str.lower():
-                broker_state = "STOPPED"
-            else:
-                if "unknown" in broker_str.lower():
-                    broker_state = "UNKNOWN"
-                else:
-                    broker_state = "STOPPED"
-        except:
-            pass
-        
-        # 데이터베이스 목록 파싱
-        db_list = database.get("db_list", "N/A")
-        db_count = "0"
-        try:
-            if isinstance(db_list, str) and db_list != "N/A":
-                db_count = str(len(db_list.split()))
-        except:
-            pass
-        
-        # CPU/메모리 사용률 상위 프로세스
-        cpu_top = "N/A"
-        mem_top = "N/A"
-        try:
-            # CUBRID는 cpu_top_processes/mem_top_processes도 확인
-            cpu_str = os_resources.get("cpu_top_processes", "") or os_resources.get("cpu_usage_top", "")
-            mem_str = os_resources.get("mem_top_processes", "") or os_resources.get("mem_usage_top", "")
-            if isinstance(cpu_str, str) and cpu_str.strip() and cpu_str != "N/A":
-                cpu_top = "있음"
-            if isinstance(mem_str, str) and mem_str.strip() and mem_str != "N/A":
-                mem_top = "있음"
-        except:
-            pass
-        
-        # 테이블스페이스 정보
-        tablespace_info = "N/A"
-        try:
-            ts_str = tablespace.get("spacedb_info", "")
-            if isinstance(ts_str, str) and ts_str.strip():
-                tablespace_info = "있음"
-        except:
-            pass
-        
-        # 파일시스템 정보
-        ncia_fs = "없음"
-        try:
-            fs_str = filesystem.get("ncia_usage", "")
-            if isinstance(fs_str, str) and fs_str.strip():
-                ncia_fs = "있음"
-        except:
-            pass
-        
-        # HA 상태
-        ha_status = "미구성"
-        try:
-            ha_str = ha.get("ha_status", "")
-            if isinstance(ha_str, str) and ha_str.strip():
-                ha_status = "구성됨"
-        except:
-            pass
-        
-        # OS 기초 체력 점검 항목 파싱
-        os_basics = results.get("os_basics", {})
-        cpu_model = os_basics.get("cpu_model_name", "N/A")
-        
-        # Swap 상태 파싱
-        swap_status_display = "N/A"
-        try:
-            swap_str = os_basics.get("swap_status", "")
-            if isinstance(swap_str, str) and swap_str.strip():
-                # "Swap: 2.0Gi 0B 2.0Gi" 형식에서 사용량 추출
-                parts = swap_str.split()
-                if len(parts) >= 3:
-                    swap_status_display = f"{parts[1]} / {parts[2]}"
-        except:
-            pass
-        
-        # 루트 디스크 사용률
-        root_disk_usage = os_basics.get("root_disk_usage", "N/A")
-        root_disk_display = f"{root_disk_usage}%" if root_disk_usage != "N/A" and root_disk_usage.isdigit() else root_disk_usage
-        
-        # 전체 디스크 사용 현황 요약
-        all_disk_summary = "N/A"
-        try:
-            all_disk_str = os_basics.get("all_disk_usage", "")
-            if isinstance(all_disk_str, str) and all_disk_str.strip():
-                # df -h 출력에서 70% 이상인 것만 카운트
-                lines = all_disk_str.split("\n")
-                high_usage_count = 0
-                for line in lines[1:]:  # 첫 줄(헤더) 제외
-                    if "%" in line and "Use%" not in line:
-                        parts = line.split()
-                        for part in parts:
-                            if part.endswith("%") and part != "Use%":
-                                try:
-                                    usage = int(part.replace("%", ""))
-                                    if usage >= 70:
-                                        high_usage_count += 1
-                                except (ValueError, AttributeError):
-                                    pass
-                if high_usage_count > 0:
-                    all_disk_summary = f"{high_usage_count}개 디스크 70% 이상"
-                else:
-                    all_disk_summary = "정상"
-        except Exception:
-            pass
-        
-        # 네트워크 통신 상태
-        network_status = "N/A"
-        try:
-            ping_result = os_basics.get("network_ping_result", "")
-            if isinstance(ping_result, str):
-                if "0% packet loss" in ping_result or "0 received" not in ping_result:
-                    network_status = "✓ 연결됨"
-                else:
-                    network_status = "✗ 연결실패"
-        except:
-            pass
-        
-        # NTP 동기화 상태
-        ntp_status = "N/A"
-        try:
-            ntp_str = os_basics.get("ntp_sync_status", "")
-            if isinstance(ntp_str, str):
-                if "NTP not configured" in ntp_str:
-                    ntp_status = "미설정"
-                elif "*" in ntp_str or "^*" in ntp_str:
-                    ntp_status = "✓ 동기화됨"
-                else:
-                    ntp_status = "설정됨"
-        except:
-            pass
-        
-        formatted.update({
-            "설치확인": "✓" if installation.get("home_exists") and installation.get("bin_exists") else "✗",
-            "설치경로": str(installation.get("cubrid_home", "N/A"))[:40],
-            "서비스상태": service_state,
-            "서버상태": server_state,
-            "브로커상태": broker_state,
-            "브로커개수": processes.get("broker_count", "N/A"),
-            "프로세스수": processes.get("total_proc_count", "N/A"),
-            "관리프로세스": "있음" if processes.get("admin_proc") else "없음",
-            "데이터베이스수": db_count,
-            "데이터베이스목록": str(db_list)[:50],
-            "CPU상위프로세스": cpu_top,
-            "메모리상위프로세스": mem_top,
-            "테이블스페이스": tablespace_info,
-            "NCIA파일시스템": ncia_fs,
-            "HA상태": ha_status,
-            "CPU모델명": cpu_model[:50] if cpu_model != "N/A" else "N/A",
-            "Swap상태": swap_status_display,
-            "루트디스크사용률": root_disk_display,
-            "디스크사용현황": all_disk_summary,
-            "네트워크통신": network_status,
-            "NTP동기화": ntp_status,
-        })
-    
-    elif check_type == "tomcat" or check_type == "was":
-        # WAS(Tomcat) 점검 결과 정리
-        installation = results.get("installation", {})
-        service_status = results.get("service_status", {})
-        listener = results.get("listener", {})
-        os_resources = results.get("os_resources", {})
-        applications = results.get("applications", {})
-        process = results.get("process", {})
-        filesystem_usage = results.get("filesystem_usage", {})
-        directory_structure = results.get("directory_structure", "N/A")
-        configuration = results.get("configuration", {})
-        logs_data = results.get("logs", {})
-        script = results.get("script", {})
-        
-        # 설치 확인 파싱
-        installation_status = "✗"
-        installation_path = "N/A"
-        try:
-            installed_str = str(installation.get("installed", "")).strip()
-            if installed_str.upper() == "INSTALLED":
-                installation_status = "✓"
-            installation_path = installation.get("catalina_home", installation.get("binary_path", "N/A"))
-            if isinstance(installation_path, str):
-                installation_path = installation_path[:40]
-        except:
-            pass
-        
-        # 디렉토리 구조 파싱
-        directory_structure_display = "N/A"
-        try:
-            if isinstance(directory_structure, str) and directory_structure.strip() and directory_structure != "N/A":
-                directory_structure_display = "있음"
-        except:
-            pass
-        
-        # 파일시스템 파싱
-        filesystem_display = "N/A"
-        try:
-            fs_keys = ["catalina_home", "catalina_base", "logs", "temp"]
-            fs_found = False
-            for key in fs_keys:
-                fs_val = filesystem_usage.get(key, "")
-                if isinstance(fs_val, str) and fs_val.strip() and fs_val != "N/A":
-                    fs_found = True
-                    break
-            if fs_found:
-                filesystem_display = "있음"
-        except:
-            pass
-        
-        # 서비스 상태 파싱
-        service_state = "N/A"
-        try:
-            active = service_status.get("active", "")
-            substate = service_status.get("substate", "")
-            if active and substate:
-                service_state = f"{active}/{substate}"
-            elif active:
-                service_state = active
-        except:
-            pass
-        
-        # 리스너 상태 파싱 (8080, 8005, 8009)
-        listener_8080_status = "NOT LISTENING"
-        listener_8005_status = "NOT LISTENING"
-        listener_8009_status = "NOT LISTENING"
-        try:
-            listener_8080 = str(listener.get("port_8080", ""))
-            listener_8005 = str(listener.get("port_8005", ""))
-            listener_8009 = str(listener.get("port_8009", ""))
-            if "LISTEN" in listener_8080:
-                listener_8080_status = "LISTENING"
-            if "LISTEN" in listener_8005:
-                listener_8005_status = "LISTENING"
-            if "LISTEN" in listener_8009:
-                listener_8009_status = "LISTENING"
-        except:
-            pass
-        
-        # 메모리 정보 파싱
-        memory_detail = "N/A"
-        memory_usage_percent = "N/A"
-        try:
-            memory = os_resources.get("memory", {})
-            if isinstance(memory, dict):
-                memory_detail = memory.get("detail", "N/A")
-                memory_usage_percent = memory.get("usage_percent", "N/A")
-            elif isinstance(memory, str):
-                memory_detail = memory
-        except:
-            pass
-        
-        # CPU 정보 파싱
-        cpu_detail = "N/A"
-        cpu_usage_percent = "N/A"
-        try:
-            cpu = os_resources.get("cpu", {})
-            if isinstance(cpu, dict):
-                cpu_detail = cpu.get("detail", "N/A")
-                cpu_usage_percent = cpu.get("usage_percent", "N/A")
-            elif isinstance(cpu, str):
-                cpu_detail = cpu
-        except:
-            pass
-        
-        # 프로세스 정보
-        process_count = os_resources.get("process_count", "N/A")
-        process_running = "N/A"
-        try:
-            running_str = str(process.get("running", "")).upper()
-            if running_str == "YES":
-                process_running = "실행중"
-            elif running_str == "NO":
-                process_running = "정지됨"
-        except:
-            pass
-        
-        # 애플리케이션 정보
-        app_count = applications.get("app_count", "N/A")
-        deployed_apps = applications.get("deployed_apps", "N/A")
-        deployed_apps_display = "N/A"
-        try:
-            if isinstance(deployed_apps, str) and deployed_apps.strip() and deployed_apps != "N/A":
-                # 첫 몇 줄만 표시
-                lines = deployed_apps.split("\n")
-                if len(lines) > 0:
-                    deployed_apps_display = lines[0][:50] + ("..." if len(lines[0]) > 50 else "")
-        except:
-            pass
-        
-        # CPU/메모리 상위 프로세스
-        cpu_top = "N/A"
-        mem_top = "N/A"
-        try:
-            cpu_top_str = os_resources.get("cpu_top_processes", "")
-            mem_top_str = os_resources.get("mem_top_processes", "")
-            if isinstance(cpu_top_str, str) and cpu_top_str.strip() and cpu_top_str != "N/A":
-                cpu_top = "있음"
-            if isinstance(mem_top_str, str) and mem_top_str.strip() and mem_top_str != "N/A":
-                mem_top = "있음"
-        except:
-            pass
-        
-        # 파일시스템 상세 파싱
-        catalina_home_fs = "N/A"
-        catalina_base_fs = "N/A"
-        logs_fs = "N/A"
-        temp_fs = "N/A"
-        try:
-            catalina_home_fs_raw = filesystem_usage.get("catalina_home", "")
-            catalina_base_fs_raw = filesystem_usage.get("catalina_base", "")
-            logs_fs_raw = filesystem_usage.get("logs", "")
-            temp_fs_raw = filesystem_usage.get("temp", "")
-            
-            # df -h 출력에서 사용률 추출
-            if isinstance(catalina_home_fs_raw, str) and "%" in catalina_home_fs_raw:
-                parts = catalina_home_fs_raw.split()
-                for i, part in enumerate(parts):
-                    if part.endswith("%"):
-                        catalina_home_fs = part
-                        break
-            
-            if isinstance(catalina_base_fs_raw, str) and "%" in catalina_base_fs_raw:
-                parts = catalina_base_fs_raw.split()
-                for i, part in enumerate(parts):
-                    if part.endswith("%"):
-                        catalina_base_fs = part
-                        break
-                        
-            if isinstance(logs_fs_raw, str) and "%" in logs_fs_raw:
-                parts = logs_fs_raw.split()
-                for i, part in enumerate(parts):
-                    if part.endswith("%"):
-                        logs_fs = part
-                        break
-                        
-            if isinstance(temp_fs_raw, str) and "%" in temp_fs_raw:
-                parts = temp_fs_raw.split()
-                for i, part in enumerate(parts):
-                    if part.endswith("%"):
-                        temp_fs = part
-                        break
-        except:
-            pass
-        
-        # 설정 정보 파싱
-        server_xml = configuration.get("server_xml", "N/A")
-        java_opts = configuration.get("java_opts", "N/A")
-        max_heap = configuration.get("max_heap", "N/A")
-        
-        server_xml_display = "N/A"
-        try:
-            if isinstance(server_xml, str) and server_xml.strip() and server_xml != "N/A":
-                server_xml_display = "있음" if "not found" not in server_xml.lower() else "없음"
-        except:
-            pass
-        
-        # 로그 정보 파싱
-        catalina_log = logs_data.get("catalina_log", "N/A")
-        error_log = logs_data.get("error_log", "N/A")
-        access_log_error_count = logs_data.get("access_log_error_count", "N/A")
-        
-        catalina_log_display = "N/A"
-        error_log_display = "N/A"
-        try:
-            if isinstance(catalina_log, str) and catalina_log.strip() and catalina_log != "N/A":
-                catalina_log_display = "있음" if "not found" not in catalina_log.lower() else "없음"
-            if isinstance(error_log, str) and error_log.strip() and error_log != "N/A":
-                error_log_display = "있음" if "not found" not in error_log.lower() else "없음"
-        except:
-            pass
-        
-        # 기동 스크립트 날짜
-        startup_script_date = script.get("startup_script_date", "N/A")
-
-        formatted.update({
-            # WAS 기본 항목
-            "설치확인": installation_status,
-            "설치경로": installation_path if isinstance(installation_path, str) else "N/A",
-            "CPU상위프로세스": cpu_top,
-            "메모리상위프로세스": mem_top,
-            "프로세스수": str(process_count) if process_count != "N/A" else "N/A",
-            
-            # WAS 전용 항목
-            "디렉토리구조": directory_structure_display,
-            "파일시스템": filesystem_display,
-            "서비스상태": service_state,
-            "리스너(8080)": listener_8080_status,
-            "리스너(8005)": listener_8005_status,
-            "리스너(8009)": listener_8009_status,
-            "메모리(Total)": memory_detail[:50] if isinstance(memory_detail, str) and memory_detail != "N/A" else "N/A",
-            "메모리사용률": memory_usage_percent,
-            "CPU": cpu_detail[:50] if isinstance(cpu_detail, str) and cpu_detail != "N/A" else "N/A",
-            "CPU사용률": cpu_usage_percent,
-            "관리프로세스": process_running,
-            "애플리케이션수": str(app_count) if app_count != "N/A" else "N/A",
-            "애플리케이션목록": deployed_apps_display,
-            "CATALINA_HOME파일시스템": catalina_home_fs,
-            "CATALINA_BASE파일시스템": catalina_base_fs,
-            "로그파일시스템": logs_fs,
-            "임시파일시스템": temp_fs,
-            "server.xml": server_xml_display,
-            "JAVA_OPTS": java_opts[:50] if isinstance(java_opts, str) and java_opts != "N/A" else "N/A",
-            "Max_Heap": max_heap if max_heap != "N/A" else "N/A",
-            "catalina.out": catalina_log_display,
-            "error.log": error_log_display,
-            "접속로그에러수": access_log_error_count if access_log_error_count != "N/A" else "N/A",
-            "기동스크립트수정일": startup_script_date if startup_script_date != "N/A" else "N/A",
-            
-            # DB 전용 항목 (WAS에서는 N/A)
-            "서버상태": "N/A",
-            "브로커상태": "N/A",
-            "브로커개수": "N/A",
-            "NCIA파일시스템": "N/A",
-            "HA상태": "N/A",
-        })
-    
-    # 원본 results 객체도 포함 (모달에서 사용하기 위해)
-    formatted["results"] = results
-    
-    return formatted
+@app.get("/api/checks/export/jobs/{job_id}/download")
+async def download_export_job(job_id: str, current_user: User = Depends(get_current_viewer)):
+    """완료된 내보내기 파일 다운로드 (완료 전이면 409, 만료·삭제되었으면 404)"""
+    job = _get_export_job(job_id, current_user)
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"내보내기 작업이 완료되지 않았습니다 (상태: {job['status']}).")
+    path = export_jobs.artifact_path(job)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="내보내기 파일이 만료되었거나 삭제되었습니다.")
+    return FileResponse(path, media_type=job["media_type"], filename=job["filename"])
 
 
 @app.get("/api/db-checks/report", response_class=HTMLResponse)
-async def db_checks_report(current_user: User = Depends(get_current_user)):
+async def db_checks_report(current_user: User = Depends(get_current_viewer)):
     """
     DB 점검 결과를 HTML 테이블 형식으로 표시 (필터링, 정렬, 페이지네이션, 차트, 실시간 업데이트 포함)
     
@@ -2256,7 +1702,7 @@ async def db_checks_report(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/os-checks/report", response_class=HTMLResponse)
-async def os_checks_report(current_user: User = Depends(get_current_user)):
+async def os_checks_report(current_user: User = Depends(get_current_viewer)):
     """
     OS 점검 결과 리포트
     
@@ -2289,7 +1735,7 @@ async def os_checks_report(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/was-checks/report", response_class=HTMLResponse)
-async def was_checks_report(current_user: User = Depends(get_current_user)):
+async def was_checks_report(current_user: User = Depends(get_current_viewer)):
     """
     WAS 점검 결과 리포트
     
@@ -2322,7 +1768,7 @@ async def was_checks_report(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/report", response_class=HTMLResponse)
-async def unified_report(current_user: User = Depends(get_current_user)):
+async def unified_report(current_user: User = Depends(get_current_viewer)):
     """
     통합 점검 결과 대시보드 (신규)
     
@@ -2355,7 +1801,7 @@ async def unified_report(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/report-legacy", response_class=HTMLResponse)
-async def unified_report_legacy(current_user: User = Depends(get_current_user)):
+async def unified_report_legacy(current_user: User = Depends(get_current_viewer)):
     """
     통합 점검 결과 리포트 (레거시) - DB, OS, WAS를 탭/iframe으로 통합
     
@@ -2388,7 +1834,7 @@ async def unified_report_legacy(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/json-viewer", response_class=HTMLResponse)
-async def json_viewer(current_user: User = Depends(get_current_user)):
+async def json_viewer(current_user: User = Depends(get_current_viewer)):
     """
     점검 결과 JSON 뷰어 페이지 - PRETTY PRINT 적용
     
@@ -2455,87 +1901,164 @@ async def dashboard(request: Request):
 
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket 엔드포인트 - 실시간 업데이트"""
-    await manager.connect(websocket)
+async def websocket_endpoint(
+    websocket: WebSocket,
+    epoch: Optional[str] = None,
+    since: Optional[int] = None,
+    check_type: Optional[str] = None,
+    hostname: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """
+    WebSocket 엔드포인트 - 실시간 업데이트 (프로토콜은 websocket_manager 참고).
+    재연결 시 epoch·since(마지막으로 받은 이벤트의 epoch, seq)를 주면 놓친 이벤트를 다시 받음.
+    check_type·hostname(패턴)·status(쉼표로 여러 값)를 주면 해당 행이 있는 이벤트만 받음.
+    연결 중에는 {"type": "subscribe", ...} 메시지로 구독 변경
+    """
+    subscription = make_subscription(check_type, hostname, status)
+    await manager.connect(websocket, epoch=epoch, since=since, subscription=subscription)
     try:
         while True:
-            # 클라이언트로부터 메시지 수신 (ping/pong)
+            # 클라이언트로부터 메시지 수신 (ping/pong, 구독 변경)
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_json({"type": "pong", "timestamp": datetime.now().isoformat()})
+                manager.send(websocket, {"type": "pong", "timestamp": datetime.now().isoformat()})
+                continue
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(message, dict) or message.get("type") != "subscribe":
+                continue
+            try:
+                subscription = make_subscription(
+                    message.get("check_type"), message.get("hostname"), message.get("status")
+                )
+            except TypeError:
+                manager.send(websocket, {"type": "error", "detail": "check_type·hostname·status는 문자열 또는 문자열 목록이어야 합니다."})
+                continue
+            manager.subscribe(websocket, subscription)
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
 @app.get("/api/db-checks/data")
-async def get_db_checks_data(current_user: User = Depends(get_current_user), limit: int = 100):
-    """DB 점검 결과를 JSON 형식으로 반환 (차트/필터링용)"""
+async def get_db_checks_data(
+    request: Request,
+    current_user: User = Depends(get_current_viewer),
+    db: Session = Depends(get_db),
+    limit: int = 100,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+):
+    """DB 점검 결과를 JSON 형식으로 반환 (차트/필터링용). 필터·cursor는 GET /api/checks와 동일, view=summary면 원본 results 제외"""
     try:
-        db_types = ["mariadb", "postgresql", "cubrid"]
-        all_results = []
-        
-        for db_type in db_types:
-            results = get_check_results(check_type=db_type, limit=limit)
-            all_results.extend(results)
-        
-        all_results.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        formatted_results = [format_db_result(result) for result in all_results[:limit]]
+        cached, store = await _cached_data_response(request, db)
+        if cached is not None:
+            return cached
+        limit = max(1, limit)
+        # 세 유형을 한 쿼리로 조회 (정렬·limit은 DB에서). 저장 시 계산해 둔 요약(summary) 사용
+        results = await run_db(
+            get_formatted_check_results, check_type=["mariadb", "postgresql", "cubrid"], limit=limit + 1,
+            hostname=hostname, checker=checker, db=db, include_results=not _is_summary_view(view),
+            **_page_filters(status, created_after, created_before, cursor),
+        )
+        formatted_results, next_cursor = _paginate(results, limit)
         
-        return {
+        return store({
             "success": True,
             "count": len(formatted_results),
-            "results": formatted_results
-        }
+            "results": formatted_results,
+            "next_cursor": next_cursor,
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/os-checks/data")
-async def get_os_checks_data(current_user: User = Depends(get_current_user), limit: int = 100):
-    """OS 점검 결과를 JSON 형식으로 반환 (DB/OS 공통 테이블용)"""
+async def get_os_checks_data(
+    request: Request,
+    current_user: User = Depends(get_current_viewer),
+    db: Session = Depends(get_db),
+    limit: int = 100,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+):
+    """OS 점검 결과를 JSON 형식으로 반환 (DB/OS 공통 테이블용). 필터·cursor는 GET /api/checks와 동일, view=summary면 원본 results 제외"""
     try:
-        results = get_check_results(check_type="os", limit=limit)
-        results.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        formatted_results = [format_db_result(result) for result in results[:limit]]
+        cached, store = await _cached_data_response(request, db)
+        if cached is not None:
+            return cached
+        limit = max(1, limit)
+        results = await run_db(
+            get_formatted_check_results, check_type="os", limit=limit + 1,
+            hostname=hostname, checker=checker, db=db, include_results=not _is_summary_view(view),
+            **_page_filters(status, created_after, created_before, cursor),
+        )
+        formatted_results, next_cursor = _paginate(results, limit)
 
-        return {
+        return store({
             "success": True,
             "count": len(formatted_results),
             "results": formatted_results,
-        }
+            "next_cursor": next_cursor,
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/was-checks/data")
-async def get_was_checks_data(current_user: User = Depends(get_current_user), limit: int = 1000):
-    """WAS 점검 결과를 JSON 형식으로 반환 (DB/OS 공통 테이블용)"""
+async def get_was_checks_data(
+    request: Request,
+    current_user: User = Depends(get_current_viewer),
+    db: Session = Depends(get_db),
+    limit: int = 1000,
+    hostname: Optional[str] = None,
+    checker: Optional[str] = None,
+    status: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+):
+    """WAS 점검 결과를 JSON 형식으로 반환 (DB/OS 공통 테이블용). 필터·cursor는 GET /api/checks와 동일, view=summary면 원본 results 제외"""
     try:
+        cached, store = await _cached_data_response(request, db)
+        if cached is not None:
+            return cached
+        limit = max(1, limit)
         # "was"와 "tomcat" 둘 다 조회 (플레이북에서 "was"로 저장하지만 이전에는 "tomcat"일 수 있음)
-        results_was = get_check_results(check_type="was", limit=limit)
-        results_tomcat = get_check_results(check_type="tomcat", limit=limit)
-        
-        # 두 결과 합치기
-        all_results = list(results_was) + list(results_tomcat)
-        
-        # 중복 제거 (id 기준) 및 정렬
-        seen_ids = set()
-        unique_results = []
-        for result in all_results:
-            result_id = result.get("id")
-            if result_id and result_id not in seen_ids:
-                seen_ids.add(result_id)
-                unique_results.append(result)
-        
-        unique_results.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        formatted_results = [format_db_result(result) for result in unique_results[:limit]]
+        results = await run_db(
+            get_formatted_check_results, check_type=["was", "tomcat"], limit=limit + 1,
+            hostname=hostname, checker=checker, db=db, include_results=not _is_summary_view(view),
+            **_page_filters(status, created_after, created_before, cursor),
+        )
+        formatted_results, next_cursor = _paginate(results, limit)
         
-        return {
+        return store({
             "success": True,
             "count": len(formatted_results),
-            "results": formatted_results
-        }
+            "results": formatted_results,
+            "next_cursor": next_cursor,
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,60 @@
+"""
+기존 DB의 check_results 테이블에 조회용 복합 인덱스 추가.
+- (check_type, created_at DESC), (hostname, created_at DESC), (created_at DESC)
+- get_check_results 등이 필터 + created_at DESC + LIMIT 로 조회할 때 전체 정렬 없이 인덱스로 상위 N건만 읽도록 함
+- 이미 있는 인덱스는 건너뛰므로 여러 번 실행해도 됨
+SQLite / PostgreSQL 모두 동작. PostgreSQL 운영 중 대용량 테이블은 --concurrently 로 쓰기 잠금 없이 생성.
+
+실행: api_server 디렉터리에서 가상환경 Python으로 실행하세요.
+  venv/bin/python3 migrate_add_check_results_indexes.py
+  venv/bin/python3 migrate_add_check_results_indexes.py --concurrently   # PostgreSQL
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+env_file = Path(__file__).parent / ".env"
+if env_file.exists():
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                os.environ[key.strip()] = value.strip()
+
+from sqlalchemy import text
+from database import DATABASE_URL, engine
+
+# models.py의 Index 정의와 같은 이름·컬럼
+INDEXES = [
+    ("ix_check_results_check_type_created_at", "check_type, created_at DESC"),
+    ("ix_check_results_hostname_created_at", "hostname, created_at DESC"),
+    ("ix_check_results_created_at", "created_at DESC"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check_results 복합 인덱스 추가")
+    parser.add_argument("--concurrently", action="store_true", help="PostgreSQL: CREATE INDEX CONCURRENTLY (쓰기 잠금 없음)")
+    args = parser.parse_args()
+    url = str(DATABASE_URL).lower()
+    concurrently = args.concurrently and ("postgresql" in url or "postgres" in url)
+    if args.concurrently and not concurrently:
+        print("--concurrently 는 PostgreSQL에서만 사용합니다. 일반 CREATE INDEX로 진행.")
+
+    # CONCURRENTLY는 트랜잭션 밖에서 실행해야 하므로 AUTOCOMMIT 연결 사용
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, columns in INDEXES:
+            keyword = "CREATE INDEX CONCURRENTLY" if concurrently else "CREATE INDEX"
+            conn.execute(text(f"{keyword} IF NOT EXISTS {name} ON check_results ({columns})"))
+            print(f"{name} 확인 완료.")
+        # 새 인덱스를 플래너가 바로 고르도록 통계 갱신
+        conn.execute(text("ANALYZE check_results"))
+        print("통계 갱신(ANALYZE) 완료.")
+    print("migrate_add_check_results_indexes 완료.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+기존 DB의 check_results 테이블에 idempotency_key 컬럼 및 unique 인덱스 추가.
+- api_sender spool 재전송(replay) 시 같은 점검 결과가 두 번 저장되지 않도록 사용
+- 컬럼은 NULL 허용 (기존 행·키 없이 보낸 결과는 NULL)
+SQLite / PostgreSQL 모두 동작.
+
+실행: api_server 디렉터리에서 가상환경 Python으로 실행하세요.
+  venv/bin/python3 migrate_add_idempotency_key.py
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+env_file = Path(__file__).parent / ".env"
+if env_file.exists():
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                os.environ[key.strip()] = value.strip()
+
+from sqlalchemy import text
+from database import DATABASE_URL, engine
+
+
+def column_exists(conn, table: str, column: str) -> bool:
+    url = str(DATABASE_URL).lower()
+    if "sqlite" in url:
+        r = conn.execute(text(f"PRAGMA table_info({table})"))
+        for row in r:
+            if row[1] == column:
+                return True
+        return False
+    if "postgresql" in url or "postgres" in url:
+        r = conn.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns WHERE table_name = :t AND column_name = :c"
+            ),
+            {"t": table, "c": column},
+        )
+        return r.scalar() is not None
+    return False
+
+
+def main():
+    with engine.connect() as conn:
+        if column_exists(conn, "check_results", "idempotency_key"):
+            print("check_results.idempotency_key 이미 있음.")
+        else:
+            conn.execute(text("ALTER TABLE check_results ADD COLUMN idempotency_key VARCHAR(64)"))
+            conn.commit()
+            print("check_results.idempotency_key 추가 완료.")
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_check_results_idempotency_key "
+                "ON check_results (idempotency_key)"
+            )
+        )
+        conn.commit()
+        print("ix_check_results_idempotency_key 인덱스 확인 완료.")
+    print("migrate_add_idempotency_key 완료.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+latest_check_results 테이블 생성 및 기존 check_results로 채우기 (호스트별 최신 점검 결과).
+- 새 점검 결과는 저장 시 같은 트랜잭션에서 upsert되므로 이 스크립트는 기존 DB에 1회 실행
+- (check_type, hostname)별 id가 가장 큰 행(가장 나중에 저장된 결과)으로 전체를 다시 채우므로 여러 번 실행해도 됨
+SQLite / PostgreSQL 모두 동작.
+
+실행: api_server 디렉터리에서 가상환경 Python으로 실행하세요.
+  venv/bin/python3 migrate_add_latest_check_results.py
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+env_file = Path(__file__).parent / ".env"
+if env_file.exists():
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                os.environ[key.strip()] = value.strip()
+
+from sqlalchemy import text
+from database import engine
+from models import LatestCheckResult
+
+
+def main():
+    LatestCheckResult.__table__.create(bind=engine, checkfirst=True)
+    print("latest_check_results 테이블 확인 완료.")
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM latest_check_results"))
+        conn.execute(
+            text(
+                "INSERT INTO latest_check_results "
+                "(check_type, hostname, result_id, check_time, checker, status, created_at) "
+                "SELECT check_type, hostname, id, check_time, checker, status, created_at "
+                "FROM check_results "
+                "WHERE id IN (SELECT MAX(id) FROM check_results GROUP BY check_type, hostname)"
+            )
+        )
+        count = conn.execute(text("SELECT COUNT(*) FROM latest_check_results")).scalar()
+    print(f"latest_check_results {count}건 채움.")
+    print("migrate_add_latest_check_results 완료.")
+
+
+if __name__ == "__main__":
+    main()
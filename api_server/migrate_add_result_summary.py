@@ -0,0 +1,111 @@
+"""
+기존 DB의 check_results 테이블에 summary(JSON), summary_version 컬럼 추가 및 기존 행 요약 백필.
+- summary: 저장 시 result_formatter.build_summary()로 계산한 표 형식 요약 (데이터 API가 그대로 사용)
+- summary_version이 result_formatter.SUMMARY_VERSION과 다른 행(NULL 포함)만 다시 계산하므로 여러 번 실행해도 됨
+- 파싱 로직을 바꿔 SUMMARY_VERSION을 올린 뒤에도 이 스크립트로 재계산
+SQLite / PostgreSQL 모두 동작.
+
+실행: api_server 디렉터리에서 가상환경 Python으로 실행하세요.
+  venv/bin/python3 migrate_add_result_summary.py
+  venv/bin/python3 migrate_add_result_summary.py --batch-size 200
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+env_file = Path(__file__).parent / ".env"
+if env_file.exists():
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                os.environ[key.strip()] = value.strip()
+
+from sqlalchemy import or_, text
+from database import DATABASE_URL, SessionLocal, engine
+from models import CheckResult
+from result_formatter import SUMMARY_VERSION, build_summary
+
+
+def column_exists(conn, table: str, column: str) -> bool:
+    url = str(DATABASE_URL).lower()
+    if "sqlite" in url:
+        r = conn.execute(text(f"PRAGMA table_info({table})"))
+        for row in r:
+            if row[1] == column:
+                return True
+        return False
+    if "postgresql" in url or "postgres" in url:
+        r = conn.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns WHERE table_name = :t AND column_name = :c"
+            ),
+            {"t": table, "c": column},
+        )
+        return r.scalar() is not None
+    return False
+
+
+def add_columns():
+    with engine.connect() as conn:
+        for column, ddl in (("summary", "JSON"), ("summary_version", "INTEGER")):
+            if column_exists(conn, "check_results", column):
+                print(f"check_results.{column} 이미 있음.")
+            else:
+                conn.execute(text(f"ALTER TABLE check_results ADD COLUMN {column} {ddl}"))
+                conn.commit()
+                print(f"check_results.{column} 추가 완료.")
+
+
+def backfill(batch_size: int):
+    """id 순으로 batch_size건씩 요약 계산 후 커밋 (중간에 중단돼도 다시 실행하면 이어서 처리)"""
+    updated = failed = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(CheckResult)
+                .filter(
+                    CheckResult.id > last_id,
+                    or_(CheckResult.summary_version.is_(None), CheckResult.summary_version != SUMMARY_VERSION),
+                )
+                .order_by(CheckResult.id.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            for r in rows:
+                summary = build_summary(r.to_dict())
+                if summary is None:
+                    failed += 1
+                    continue
+                r.summary = summary
+                r.summary_version = SUMMARY_VERSION
+                updated += 1
+            last_id = rows[-1].id
+            db.commit()
+            print(f"  ... id {last_id}까지 처리 (갱신 {updated}건)")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    print(f"요약 백필 완료: 갱신 {updated}건, 실패 {failed}건 (실패 행은 조회 시 계산)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check_results.summary 컬럼 추가 및 백필")
+    parser.add_argument("--batch-size", type=int, default=500, help="커밋 단위 건수 (기본 500)")
+    args = parser.parse_args()
+    add_columns()
+    backfill(max(1, args.batch_size))
+    print("migrate_add_result_summary 완료.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+기존 PostgreSQL check_results 테이블을 created_at 월별 파티션 테이블로 전환 (check_result_partitions 참고).
+- 기존 테이블은 check_results_unpartitioned로 이름을 바꾸고, 같은 컬럼의 파티션 테이블(PK: id, created_at)을 만든 뒤 전체 복사
+- 기존 데이터가 있는 달 ~ 이번 달 + CHECK_RESULTS_PARTITION_MONTHS_AHEAD개월 파티션과 default 파티션 생성
+- 인덱스는 models.py 정의 그대로 만들되, idempotency_key는 일반 인덱스 (파티션 테이블의 유니크 인덱스는 created_at을 포함해야 하므로.
+  중복 저장은 database._ensure_idempotency_keys_unused가 advisory lock으로 막음)
+- id 시퀀스는 새 테이블로 옮기므로 이후 id는 이어서 증가
+- 한 트랜잭션으로 실행하고 기존 테이블을 잠그므로 API 서버를 멈춘 뒤 실행. 이미 파티션 테이블이면 파티션만 보충
+- 확인 후 기존 테이블 삭제: --drop-old 로 다시 실행하거나 DROP TABLE check_results_unpartitioned
+PostgreSQL 전용 (SQLite는 단일 테이블 그대로 사용).
+
+실행: api_server 디렉터리에서 가상환경 Python으로 실행하세요.
+  venv/bin/python3 migrate_partition_check_results.py
+  venv/bin/python3 migrate_partition_check_results.py --drop-old   # 전환 후 기존 테이블 삭제
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+env_file = Path(__file__).parent / ".env"
+if env_file.exists():
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                os.environ[key.strip()] = value.strip()
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+import check_result_partitions as partitions
+from database import CHECK_RESULTS_PARTITION_MONTHS_AHEAD, engine
+from models import CheckResult
+
+OLD_TABLE = "check_results_unpartitioned"
+
+
+def _create_partitioned_table(conn):
+    """기존 테이블 이름 변경 → 같은 컬럼의 파티션 테이블·PK·인덱스 생성 → id 시퀀스 이전"""
+    conn.execute(text(f"LOCK TABLE {partitions.PARENT} IN ACCESS EXCLUSIVE MODE"))
+    conn.execute(text(f"ALTER TABLE {partitions.PARENT} RENAME TO {OLD_TABLE}"))
+    # 새 테이블이 같은 인덱스 이름을 쓰도록 기존 인덱스(PK·유니크 제약 포함) 이름 변경 (다른 스키마의 같은 이름 테이블 제외)
+    old_indexes = conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :t"
+    ), {"t": OLD_TABLE}).scalars().all()
+    for name in old_indexes:
+        conn.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name[:59]}_old"'))
+
+    conn.execute(text(
+        f"CREATE TABLE {partitions.PARENT} (LIKE {OLD_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    conn.execute(text(f"ALTER TABLE {partitions.PARENT} ADD PRIMARY KEY (id, created_at)"))
+    for index in sorted(CheckResult.__table__.indexes, key=lambda i: i.name):
+        ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+        conn.execute(text(ddl.replace("CREATE UNIQUE INDEX", "CREATE INDEX", 1)))
+
+    # serial 시퀀스는 기존 테이블 소유 → 새 테이블로 옮겨야 기존 테이블을 지워도 남음
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:t, 'id')"), {"t": OLD_TABLE}).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {partitions.PARENT}.id"))
+
+
+def _copy_rows(conn) -> int:
+    identity = conn.execute(text(
+        "SELECT attidentity <> '' FROM pg_attribute WHERE attrelid = to_regclass(:t) AND attname = 'id'"
+    ), {"t": partitions.PARENT}).scalar()
+    overriding = "OVERRIDING SYSTEM VALUE " if identity else ""
+    conn.execute(text(f"INSERT INTO {partitions.PARENT} {overriding}SELECT * FROM {OLD_TABLE}"))
+    if identity:
+        # INCLUDING IDENTITY는 새 시퀀스를 만들므로 기존 최대 id 다음부터 발급되도록 맞춤
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence(:t, 'id'), (SELECT COALESCE(MAX(id), 0) + 1 FROM {OLD_TABLE}), false)"
+        ), {"t": partitions.PARENT})
+    copied = conn.execute(text(f"SELECT COUNT(*) FROM {partitions.PARENT}")).scalar()
+    expected = conn.execute(text(f"SELECT COUNT(*) FROM {OLD_TABLE}")).scalar()
+    if copied != expected:
+        raise RuntimeError(f"복사 건수 불일치: {copied} / {expected}")
+    return copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check_results 월별 파티션 전환 (PostgreSQL)")
+    parser.add_argument("--drop-old", action="store_true", help=f"전환 후(또는 이미 전환된 경우) {OLD_TABLE} 삭제")
+    args = parser.parse_args()
+    if engine.dialect.name != "postgresql":
+        print("PostgreSQL에서만 지원합니다 (SQLite는 파티셔닝 없이 단일 테이블 사용).")
+        return
+
+    with engine.begin() as conn:
+        partitions.lock_maintenance(conn)
+        this_month = partitions.month_start(datetime.now())
+        first_month, last_month = this_month, partitions.add_months(this_month, CHECK_RESULTS_PARTITION_MONTHS_AHEAD)
+        old_exists = conn.execute(text("SELECT to_regclass(:t) IS NOT NULL"), {"t": OLD_TABLE}).scalar()
+        converting = not partitions.is_partitioned(conn)
+        if converting:
+            if old_exists:
+                print(f"{OLD_TABLE} 테이블이 이미 있습니다. 확인 후 이름을 바꾸거나 삭제하고 다시 실행하세요.")
+                return
+            _create_partitioned_table(conn)
+            oldest, newest = conn.execute(text(f"SELECT MIN(created_at), MAX(created_at) FROM {OLD_TABLE}")).one()
+            if oldest is not None:
+                first_month = min(first_month, partitions.month_start(oldest))
+                last_month = max(last_month, partitions.month_start(newest))
+        else:
+            print("check_results는 이미 파티션 테이블입니다. 앞으로 쓸 파티션만 보충합니다.")
+
+        created = partitions.ensure_partitions(conn, first_month, last_month)
+        partitions.create_default_partition(conn)
+        print(f"파티션 {len(created)}개 생성: {', '.join(created) or '-'}")
+        if converting:
+            print(f"{_copy_rows(conn)}건 복사 완료.")
+            old_exists = True
+        if args.drop_old and old_exists:
+            conn.execute(text(f"DROP TABLE {OLD_TABLE}"))
+            print(f"{OLD_TABLE} 삭제.")
+        elif converting:
+            print(f"기존 테이블은 {OLD_TABLE}로 남겨 둠. 확인 후 --drop-old로 다시 실행해 삭제하세요.")
+
+    # 파티션별 통계가 있어야 플래너가 파티션 인덱스를 고름
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ANALYZE {partitions.PARENT}"))
+        print("통계 갱신(ANALYZE) 완료.")
+    print("migrate_partition_check_results 완료.")
+
+
+if __name__ == "__main__":
+    main()
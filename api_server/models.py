@@ -1,7 +1,7 @@
 """
 데이터베이스 모델 정의
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -48,6 +48,11 @@ class CheckResult(Base):
     status = Column(String(20), index=True)  # "success", "warning", "error"
     results = Column(JSON, nullable=False)  # 점검 결과 데이터 (JSON)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
+    # 재전송(spool replay) 시 중복 저장 방지 키. 기존 DB는 migrate_add_idempotency_key.py 실행 필요
+    idempotency_key = Column(String(64), unique=True, index=True, nullable=True)
+    # 저장 시 계산한 표 형식 요약 (result_formatter.build_summary). 기존 DB는 migrate_add_result_summary.py 실행 필요
+    summary = Column(JSON, nullable=True)
+    summary_version = Column(Integer, nullable=True)  # result_formatter.SUMMARY_VERSION과 다르면 조회 시 재계산
     
     def to_dict(self):
         """딕셔너리로 변환"""
@@ -63,6 +68,29 @@ class CheckResult(Base):
         }
 
 
+# 조회 패턴(check_type/hostname 필터 + created_at DESC + LIMIT)용 복합 인덱스 — 전체 정렬 없이 인덱스 순서대로 상위 N건만 읽음.
+# 기존 DB는 migrate_add_check_results_indexes.py 실행 필요
+Index("ix_check_results_check_type_created_at", CheckResult.check_type, CheckResult.created_at.desc())
+Index("ix_check_results_hostname_created_at", CheckResult.hostname, CheckResult.created_at.desc())
+Index("ix_check_results_created_at", CheckResult.created_at.desc())
+
+
+class LatestCheckResult(Base):
+    """
+    (check_type, hostname)별 최신 점검 결과 (대시보드 현재 상태용).
+    점검 결과 저장과 같은 트랜잭션에서 upsert. 기존 DB는 migrate_add_latest_check_results.py로 채움.
+    """
+    __tablename__ = "latest_check_results"
+
+    check_type = Column(String(50), primary_key=True)
+    hostname = Column(String(255), primary_key=True)
+    result_id = Column(Integer, nullable=False)  # check_results.id
+    check_time = Column(String(50), nullable=False)
+    checker = Column(String(100))
+    status = Column(String(20), index=True)
+    created_at = Column(DateTime, nullable=False)
+
+
 class CheckItem(Base):
     """점검 유형별 세부 항목 (관리자에서 추가/삭제, 활성화 여부). 신규 점검 시 활성화된 항목만 반영."""
     __tablename__ = "check_items"
@@ -87,6 +115,14 @@ class CheckItem(Base):
         }
 
 
+class CacheVersion(Base):
+    """프로세스 메모리 캐시 버전 (여러 uvicorn worker가 다른 worker의 변경을 감지하는 용도)"""
+    __tablename__ = "cache_versions"
+
+    name = Column(String(50), primary_key=True)  # 캐시 이름 (check_items 등)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class Server(Base):
     """점검 대상 서버 (관리자 콘솔에서 추가/수정/삭제). SSH 인증: key_file | password."""
     __tablename__ = "servers"
@@ -0,0 +1,108 @@
+"""
+조회 결과용 프로세스 메모리 LRU 캐시
+- 포맷된 점검 결과 행 (database.formatted_row_cache): id -> 표 형식 행. 점검 결과는 저장 후 바뀌지 않으므로 무효화 없음
+- 조회 API 응답 본문 (main.data_response_cache): URL -> (데이터 버전, JSON 바이트). 버전이 다르면 miss
+- 항목 수(max_entries)와 대략적인 바이트 수(max_bytes)로 크기를 제한하고, 넘으면 오래 안 쓴 항목부터 삭제
+- 여러 스레드(DB 스레드풀)에서 동시에 써도 되도록 lock 사용
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Args:
+        max_entries: 최대 항목 수 (0이면 제한 없음)
+        max_bytes: 값 크기 합 상한 (0이면 제한 없음). 이보다 큰 값 하나는 저장하지 않음
+        sizeof: 값 → 크기(바이트) 추정 함수 (None이면 항목당 1)
+    max_entries와 max_bytes가 모두 0 이하면 캐시 사용 안 함 (get은 항상 None).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self.sizeof = sizeof
+        self.enabled = bool(self.max_entries or self.max_bytes)
+        self._items: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """있으면 값 (최근 사용으로 표시), 없으면 None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def get_many(self, keys) -> Dict[Hashable, Any]:
+        """keys 중 캐시에 있는 것만 {key: 값} (lock 1회)"""
+        found: Dict[Hashable, Any] = {}
+        if not self.enabled:
+            return found
+        with self._lock:
+            for key in keys:
+                entry = self._items.get(key)
+                if entry is None:
+                    self._stats["misses"] += 1
+                    continue
+                self._items.move_to_end(key)
+                self._stats["hits"] += 1
+                found[key] = entry[0]
+        return found
+
+    def put(self, key: Hashable, value: Any):
+        """값 저장 (같은 key는 교체). 한도를 넘으면 오래된 항목부터 삭제"""
+        if not self.enabled:
+            return
+        size = self.sizeof(value) if self.sizeof is not None else 1
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while self._items and (
+                (self.max_entries and len(self._items) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 산정용 지표 (항목 수, 바이트, 적중률)"""
+        with self._lock:
+            s = dict(self._stats)
+            entries, size = len(self._items), self._bytes
+        lookups = s["hits"] + s["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": s["hits"],
+            "misses": s["misses"],
+            "hit_ratio": round(s["hits"] / lookups, 4) if lookups else None,
+            "evictions": s["evictions"],
+        }
@@ -0,0 +1,228 @@
+"""
+check_results 월별 파티션 (PostgreSQL 전용, pg 마커. 테스트마다 임시 스키마에 테이블을 만들고 지움)
+- migrate_partition_check_results: 기존 행을 달별 파티션으로 옮기고 id를 이어서 발급하는지
+- create_partition: default 파티션에 들어간 그 달 행을 새 파티션으로 옮기는지
+- maintain_check_result_partitions: 보관 기간이 지난 파티션 DROP·default 행 삭제·latest 행 삭제·데이터 버전 +1
+- idempotency_key: 유니크 인덱스 없이 advisory lock + 존재 확인으로 동시 중복 저장을 막는지
+  (잠금·확인·INSERT가 한 트랜잭션이라 앞 트랜잭션이 커밋할 때까지 뒤 저장이 기다리는지)
+"""
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+import check_result_partitions as partitions
+import database
+import migrate_partition_check_results as migrate
+from models import Base
+
+pytestmark = pytest.mark.pg
+
+TIMEOUT = 10.0
+
+
+def _row(hostname: str, idempotency_key=None):
+    return {
+        "check_type": "os",
+        "hostname": hostname,
+        "check_time": "2026-01-01T00:00:00",
+        "checker": "tester",
+        "status": "success",
+        "results": {"cpu": {"usage": 1}},
+        "idempotency_key": idempotency_key,
+    }
+
+
+@pytest.fixture
+def pg(pg_url, monkeypatch):
+    """임시 스키마를 search_path로 쓰는 (engine, sessionmaker). 파티션 여부 캐시는 테스트마다 초기화"""
+    schema = f"test_cr_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(pg_url)
+    with admin.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    engine = create_engine(pg_url, connect_args={"options": f"-csearch_path={schema}"})
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(database, "_check_results_partitioned", None)
+    monkeypatch.setattr(migrate, "engine", engine)
+    monkeypatch.setattr(sys, "argv", ["migrate_partition_check_results.py"])
+    try:
+        yield engine, sessionmaker(bind=engine)
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+def _locations(engine):
+    """hostname → 행이 들어 있는 파티션 이름"""
+    with engine.connect() as conn:
+        return dict(conn.execute(text("SELECT hostname, tableoid::regclass::text FROM check_results")).all())
+
+
+def test_migrate_and_maintain_partitions(pg, monkeypatch):
+    engine, Session = pg
+    this_month = partitions.month_start(datetime.now())
+    months = {f"h{m}": partitions.add_months(this_month, m) for m in (-5, -1, 0)}
+
+    db = Session()
+    try:
+        ids = database.save_check_results_bulk([_row(hostname) for hostname in months], db=db)
+        for hostname, month in months.items():
+            for table in ("check_results", "latest_check_results"):
+                db.execute(text(f"UPDATE {table} SET created_at = :t WHERE hostname = :h"), {"t": month, "h": hostname})
+        db.commit()
+    finally:
+        db.close()
+
+    migrate.main()
+
+    with engine.connect() as conn:
+        assert partitions.is_partitioned(conn)
+        names = [name for name, _, _ in partitions.list_partitions(conn)]
+    # 기존 데이터가 있는 가장 오래된 달 ~ 이번 달 + CHECK_RESULTS_PARTITION_MONTHS_AHEAD
+    expected = [
+        partitions.partition_name(partitions.add_months(this_month, m))
+        for m in range(-5, database.CHECK_RESULTS_PARTITION_MONTHS_AHEAD + 1)
+    ]
+    assert names == expected
+    assert _locations(engine) == {hostname: partitions.partition_name(month) for hostname, month in months.items()}
+
+    db = Session()
+    try:
+        assert database.check_results_partitioned(db)
+        # id 시퀀스가 새 테이블로 옮겨져 이어서 발급
+        new_id = database.save_check_results_bulk([_row("h-new")], db=db)[0]
+        assert new_id > max(ids)
+        assert database.get_check_result_by_id(ids[0], db=db)["hostname"] == "h-5"
+    finally:
+        db.close()
+
+    # 파티션이 없는 달 행은 default로 들어가고, 그 달 파티션을 만들면 새 파티션으로 옮겨짐
+    far, expired = partitions.add_months(this_month, 12), partitions.add_months(this_month, -8)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO check_results (check_type, hostname, check_time, results, created_at) "
+            "VALUES ('os', 'h12', 't', '{}', :far), ('os', 'h-8', 't', '{}', :expired)"
+        ), {"far": far, "expired": expired})
+    assert _locations(engine)["h12"] == partitions.DEFAULT_PARTITION
+    with engine.begin() as conn:
+        assert partitions.ensure_partitions(conn, far, far) == [partitions.partition_name(far)]
+    locations = _locations(engine)
+    assert locations["h12"] == partitions.partition_name(far)
+    assert locations["h-8"] == partitions.DEFAULT_PARTITION
+
+    # 보관 2개월(이번 달·지난 달): 그 이전 달 파티션 DROP, default의 오래된 행·latest 행 삭제, 데이터 버전 +1
+    monkeypatch.setattr(database, "CHECK_RESULTS_RETENTION_MONTHS", 2)
+    db = Session()
+    try:
+        version_before, _ = database.get_check_results_version(db=db)
+        db.commit()
+        result = database.maintain_check_result_partitions(db=db)
+        assert result["partitioned"]
+        assert result["dropped"] == [partitions.partition_name(partitions.add_months(this_month, m)) for m in (-5, -4, -3, -2)]
+        version_after, _ = database.get_check_results_version(db=db)
+        assert version_after != version_before
+        latest_hosts = db.execute(text("SELECT hostname FROM latest_check_results ORDER BY hostname")).scalars().all()
+        assert latest_hosts == ["h-1", "h-new", "h0"]
+        db.commit()
+
+        # 더 지울 것이 없으면 버전 그대로
+        assert database.maintain_check_result_partitions(db=db)["dropped"] == []
+        assert database.get_check_results_version(db=db)[0] == version_after
+        db.commit()
+    finally:
+        db.close()
+    assert sorted(_locations(engine)) == ["h-1", "h-new", "h0", "h12"]
+
+
+def _wait_for_advisory_lock_waiter(engine):
+    deadline = time.monotonic() + TIMEOUT
+    with engine.connect() as conn:
+        while conn.execute(text("SELECT COUNT(*) FROM pg_locks WHERE locktype = 'advisory' AND NOT granted")).scalar() == 0:
+            if time.monotonic() > deadline:
+                raise AssertionError("advisory lock을 기다리는 저장이 없음")
+            time.sleep(0.02)
+            conn.rollback()
+
+
+def _run_in_thread(func):
+    """func를 스레드에서 실행. (thread, outcome) — outcome에는 반환값 또는 예외"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = func()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def _save_bulk(Session, rows, barrier=None):
+    def run():
+        db = Session()
+        try:
+            if barrier is not None:
+                barrier.wait(TIMEOUT)
+            return database.save_check_results_bulk(rows, db=db)
+        finally:
+            db.close()
+    return run
+
+
+def test_concurrent_duplicate_idempotency_keys(pg):
+    engine, Session = pg
+    migrate.main()
+
+    def count(key):
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM check_results WHERE idempotency_key = :k"), {"k": key}).scalar()
+
+    # 같은 키 동시 저장: 하나만 저장되고 나머지는 유니크 위반과 같은 IntegrityError
+    barrier = threading.Barrier(2)
+    runs = [_run_in_thread(_save_bulk(Session, [_row("h1", "k-race")], barrier)) for _ in range(2)]
+    for thread, _ in runs:
+        thread.join(TIMEOUT)
+    outcomes = [outcome for _, outcome in runs]
+    assert sorted("value" in o for o in outcomes) == [False, True]
+    assert any(isinstance(o.get("error"), IntegrityError) for o in outcomes)
+    assert count("k-race") == 1
+
+    # 잠금·존재 확인·INSERT가 한 트랜잭션: 먼저 저장한 트랜잭션이 커밋할 때까지 뒤 저장은 잠금에서 기다리고,
+    # 커밋 후에는 저장된 키를 보고 IntegrityError
+    first = Session()
+    try:
+        first_id = database._insert_check_results(first, [_row("h2", "k-held")])[0]
+        thread, outcome = _run_in_thread(_save_bulk(Session, [_row("h2", "k-held"), _row("h3")]))
+        _wait_for_advisory_lock_waiter(engine)
+        assert thread.is_alive()
+        first.commit()
+        thread.join(TIMEOUT)
+    finally:
+        first.close()
+    assert isinstance(outcome.get("error"), IntegrityError)
+    assert count("k-held") == 1
+
+    # 한 건 저장은 기존 ID, 건별 저장은 중복으로 보고 (다른 항목은 저장)
+    db = Session()
+    try:
+        row = _row("h2", "k-held")
+        assert database.save_check_result(
+            row["check_type"], row["hostname"], row["check_time"], row["checker"], row["status"], row["results"],
+            idempotency_key="k-held", db=db,
+        ) == first_id
+        outcomes = database.save_check_results_each([_row("h2", "k-held"), _row("h3", "k-new")], db=db)
+        assert outcomes[0] == {"id": first_id, "duplicate": True}
+        assert outcomes[1]["duplicate"] is False and outcomes[1]["id"] is not None
+    finally:
+        db.close()
+    assert count("k-held") == 1 and count("k-new") == 1
@@ -0,0 +1,237 @@
+"""
+ws_broadcast 백엔드: worker(프로세스) 사이 이벤트 중계
+- unix: 별도 프로세스 여러 개가 같은 소켓 경로로 허브를 선출하고, 한 프로세스가 publish한 이벤트를 다른 프로세스가 받는지,
+  허브 프로세스가 죽으면(flock 해제) 남은 프로세스가 다시 선출해 계속 전달하는지
+- postgres: LISTEN/NOTIFY로 다른 인스턴스에 ids가 전달되는지(집계 필드가 큰 실제 이벤트도 NOTIFY 한도 안으로),
+  한도를 넘는 이벤트는 resync로 대신 가는지, LISTEN 연결이 끊기면 다시 연결하고 resync하는지 (pg 마커)
+"""
+import asyncio
+import multiprocessing
+import queue
+import time
+import uuid
+
+import pytest
+
+from ws_broadcast import UnixSocketBroadcast, create_broadcast
+
+TIMEOUT = 10.0
+
+
+def _unix_worker(path: str, commands, events):
+    """별도 프로세스(uvicorn worker 역할): commands로 받은 메시지를 publish, 받은 이벤트·resync·역할을 events로 보고"""
+
+    async def run():
+        broadcast = UnixSocketBroadcast(path, retry_interval=0.05)
+
+        async def deliver(message):
+            events.put(("event", message))
+
+        async def resync():
+            events.put(("resync", None))
+
+        await broadcast.start(deliver, resync)
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await loop.run_in_executor(None, commands.get)
+            if command is None:
+                break
+            if command == "role":
+                events.put(("role", broadcast.role))
+            else:
+                await broadcast.publish(command)
+        await broadcast.stop()
+
+    asyncio.run(run())
+
+
+class Worker:
+    def __init__(self, ctx, path: str):
+        self.commands = ctx.Queue()
+        self.events = ctx.Queue()
+        self.process = ctx.Process(target=_unix_worker, args=(path, self.commands, self.events), daemon=True)
+        self.process.start()
+        self.seen = []
+
+    def role(self):
+        self.commands.put("role")
+        return self.wait(lambda kind, value: kind == "role")[1]
+
+    def wait(self, match, timeout: float = TIMEOUT):
+        """match(kind, value)가 참인 보고가 올 때까지 대기 (그 전 보고는 seen에 보관)"""
+        for kind, value in self.seen:
+            if match(kind, value):
+                self.seen.remove((kind, value))
+                return kind, value
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                kind, value = self.events.get(timeout=max(0.01, deadline - time.monotonic()))
+            except queue.Empty:
+                raise AssertionError(f"{timeout}초 안에 기대한 보고 없음 (받은 것: {self.seen})")
+            if match(kind, value):
+                return kind, value
+            self.seen.append((kind, value))
+
+    def wait_event(self, n: int):
+        return self.wait(lambda kind, value: kind == "event" and value.get("n") == n)[1]
+
+    def close(self):
+        if self.process.is_alive():
+            self.commands.put(None)
+            self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+def _wait_roles(workers, expected):
+    """허브 선출·접속이 끝나 역할이 expected(정렬된 리스트)가 될 때까지 대기"""
+    deadline = time.monotonic() + TIMEOUT
+    while True:
+        roles = [w.role() for w in workers]
+        if sorted(roles, key=str) == expected:
+            return roles
+        if time.monotonic() > deadline:
+            raise AssertionError(f"허브 선출 안 됨: {roles}")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def spawn_workers(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    path = str(tmp_path / "ws_broadcast.sock")
+    workers = []
+
+    def spawn(n: int):
+        workers.extend(Worker(ctx, path) for _ in range(n))
+        return workers
+
+    yield spawn
+    for worker in workers:
+        worker.close()
+
+
+def test_unix_broadcast_crosses_processes(spawn_workers):
+    a, b = spawn_workers(2)
+    _wait_roles([a, b], ["hub", "peer"])
+
+    a.commands.put({"type": "new_check_results", "n": 1})
+    b.commands.put({"type": "new_check_results", "n": 2})
+
+    assert b.wait_event(1) == {"type": "new_check_results", "n": 1}
+    assert a.wait_event(2) == {"type": "new_check_results", "n": 2}
+    # 보낸 worker는 자기 이벤트를 중계로 다시 받지 않음 (publish에서 바로 1번만 전달)
+    assert a.wait_event(1) == {"type": "new_check_results", "n": 1}
+    with pytest.raises(AssertionError):
+        a.wait(lambda kind, value: kind == "event" and value.get("n") == 1, timeout=0.5)
+
+
+def test_unix_broadcast_hub_failover(spawn_workers):
+    workers = spawn_workers(3)
+    roles = _wait_roles(workers, ["hub", "peer", "peer"])
+    hub = workers[roles.index("hub")]
+    peers = [w for w in workers if w is not hub]
+
+    hub.process.kill()  # 정리 없이 종료: OS가 flock을 풀고 소켓 파일은 남음
+    hub.process.join(5)
+    _wait_roles(peers, ["hub", "peer"])
+
+    # 새 허브·다시 접속한 peer 모두 그 사이 이벤트를 놓쳤을 수 있으므로 resync
+    for worker in peers:
+        worker.wait(lambda kind, value: kind == "resync")
+
+    peers[0].commands.put({"type": "new_check_results", "n": 3})
+    peers[1].commands.put({"type": "new_check_results", "n": 4})
+    assert peers[1].wait_event(3)["n"] == 3
+    assert peers[0].wait_event(4)["n"] == 4
+
+
+@pytest.mark.pg
+def test_postgres_broadcast_notify(pg_url):
+    import psycopg2
+
+    channel = f"test_ws_{uuid.uuid4().hex[:8]}"
+
+    async def run():
+        sender = create_broadcast("postgres", None, pg_url, channel)
+        receiver = create_broadcast("postgres", None, pg_url, channel)
+        sender.retry_interval = receiver.retry_interval = 0.05
+        received, sent_locally = asyncio.Queue(), []
+
+        async def on_receive(message):
+            received.put_nowait(message)
+
+        async def on_resync():
+            received.put_nowait({"resync": True})
+
+        async def on_local(message):
+            sent_locally.append(message)
+
+        async def noop():
+            pass
+
+        await sender.start(on_local, noop)
+        await receiver.start(on_receive, on_resync)
+        try:
+            for backend in (sender, receiver):
+                while not backend.listening:
+                    await asyncio.sleep(0.02)
+
+            rows = [{"id": n, "hostname": f"h{n}"} for n in range(1, 4)]
+            await sender.publish({"type": "new_check_results", "rows": rows, "timestamp": "t"})
+            message = await asyncio.wait_for(received.get(), TIMEOUT)
+            # rows 대신 id만 전달 (받는 worker가 DB에서 다시 읽음), 보낸 쪽은 rows 그대로 1번만
+            assert message == {"type": "new_check_results", "ids": [1, 2, 3], "timestamp": "t"}
+            assert sent_locally == [{"type": "new_check_results", "rows": rows, "timestamp": "t"}]
+            assert sender.stats()["received_total"] == 0
+
+            # 한 알림이 max_payload를 넘으면 ids를 나눠 여러 번 보냄
+            sender.max_payload = 200
+            await sender.publish({"type": "new_check_results", "rows": [{"id": n} for n in range(100)], "timestamp": "t"})
+            ids = []
+            while len(ids) < 100:
+                ids.extend((await asyncio.wait_for(received.get(), TIMEOUT))["ids"])
+            assert sorted(ids) == list(range(100))
+
+            # 실제 이벤트(main._new_results_event): 호스트 수백 개의 hostnames·checkers 등 집계는 보내지 않고 ids만
+            import main
+
+            sender.max_payload = 7900
+            rows = [
+                {"id": n, "check_type": "os", "hostname": f"server-{n:04d}.example.internal",
+                 "checker": f"operator-{n % 7}", "status": "success", "formatted": {"cpu": "ok"}}
+                for n in range(1000, 1300)
+            ]
+            event = main._new_results_event(rows)
+            errors_before = sender.stats()["errors_total"]
+            await sender.publish(event)
+            message = await asyncio.wait_for(received.get(), TIMEOUT)
+            assert set(message) == {"type", "timestamp", "ids"}
+            assert message["timestamp"] == event["timestamp"]
+            assert sorted(message["ids"]) == [row["id"] for row in rows]
+            assert sender.stats()["errors_total"] == errors_before
+
+            # 나눌 ids가 없는 큰 이벤트는 보내지 않고 resync 이벤트로 대신
+            await sender.publish({"type": "new_check_results", "hostnames": [row["hostname"] for row in rows], "timestamp": "t"})
+            assert await asyncio.wait_for(received.get(), TIMEOUT) == {"type": "new_check_results", "timestamp": "t", "resync": True}
+            assert sender.stats()["oversized_total"] == 1
+
+            # resync 이벤트조차 한도를 넘으면 전송 오류로 집계 (publish는 실패하지 않음)
+            sender.max_payload = 20
+            await sender.publish({"type": "new_check_results", "rows": [{"id": 1}], "timestamp": "t"})
+            assert sender.stats()["errors_total"] == errors_before + 1
+
+            # LISTEN 연결이 끊기면 다시 연결하고 resync
+            pid = receiver._listen_conn.get_backend_pid()
+            admin = psycopg2.connect(receiver.dsn)
+            admin.autocommit = True
+            with admin.cursor() as cur:
+                cur.execute("SELECT pg_terminate_backend(%s)", (pid,))
+            admin.close()
+            assert await asyncio.wait_for(received.get(), TIMEOUT) == {"resync": True}
+            assert receiver.stats()["reconnects_total"] == 1
+        finally:
+            await sender.stop()
+            await receiver.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,307 @@
+"""
+WebSocket(/ws) 실시간 이벤트 관리
+- 이벤트에 순번(seq)을 붙이고 최근 buffer_size건을 보관 → 재연결한 클라이언트에게 놓친 이벤트 재전송
+- 연결마다 크기 제한 전송 대기열 + 전송 task. publish()는 클라이언트를 기다리지 않음
+- 구독(check_type, hostname 패턴, status)별로 이벤트의 rows를 걸러서 전달.
+  같은 구독의 연결은 한 그룹으로 묶고 그룹을 check_type으로 색인 → 이벤트마다 관련 그룹만 보고, 직렬화는 그룹당 1회
+
+프로토콜 (클라이언트 기준)
+- 연결 직후 {"type": "hello", "epoch", "seq", "resumed", "subscription"}
+- /ws?epoch=<마지막 epoch>&since=<마지막 seq>로 재연결하면 그 이후 이벤트 중 구독에 맞는 것을 resumed=true와 함께 재전송.
+  재전송할 수 없으면(재시작·버퍼 초과) resumed=false → 데이터 API로 전체 재조회(resync)
+- 이벤트의 prev는 이 연결에 직전에 보낸 이벤트의 seq (구독 때문에 seq는 건너뛸 수 있음).
+  prev가 마지막으로 받은 seq와 다르면 놓친 이벤트가 있으므로 전체 재조회
+- 구독: /ws?check_type=os&hostname=web*&status=error (쉼표로 여러 값) 또는
+  {"type": "subscribe", "check_type": [...], "hostname": [...], "status": [...]} 메시지. 빈 값은 전체
+"""
+import asyncio
+import json
+import uuid
+from collections import deque
+from fnmatch import fnmatchcase
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+from fastapi import WebSocket
+
+# 구독 키: (check_type 집합, hostname 패턴들, status 집합). None이면 해당 조건 없음(전체)
+Subscription = Tuple[Optional[FrozenSet[str]], Optional[Tuple[str, ...]], Optional[FrozenSet[str]]]
+ALL: Subscription = (None, None, None)
+
+
+def _values(value: Union[None, str, Iterable[str]]) -> List[str]:
+    """쉼표 구분 문자열 또는 리스트 → 소문자 값 리스트 (빈 값 제외)"""
+    if value is None:
+        return []
+    items = value.split(",") if isinstance(value, str) else value
+    return [str(v).strip().lower() for v in items if str(v).strip()]
+
+
+def make_subscription(
+    check_type: Union[None, str, Iterable[str]] = None,
+    hostname: Union[None, str, Iterable[str]] = None,
+    status: Union[None, str, Iterable[str]] = None,
+) -> Subscription:
+    """구독 조건 정규화. hostname은 fnmatch 패턴(web*, db-0?), 대소문자 구분 없음"""
+    check_types, hostnames, statuses = _values(check_type), _values(hostname), _values(status)
+    return (
+        frozenset(check_types) or None,
+        tuple(sorted(set(hostnames))) or None,
+        frozenset(statuses) or None,
+    )
+
+
+def subscription_to_dict(subscription: Subscription) -> Dict[str, Optional[List[str]]]:
+    check_types, hostnames, statuses = subscription
+    return {
+        "check_type": sorted(check_types) if check_types else None,
+        "hostname": list(hostnames) if hostnames else None,
+        "status": sorted(statuses) if statuses else None,
+    }
+
+
+def _row_matches(row: Dict[str, Any], subscription: Subscription) -> bool:
+    check_types, hostnames, statuses = subscription
+    if check_types is not None and str(row.get("check_type") or "").lower() not in check_types:
+        return False
+    if statuses is not None and str(row.get("status") or "").lower() not in statuses:
+        return False
+    if hostnames is not None:
+        hostname = str(row.get("hostname") or "").lower()
+        if not any(fnmatchcase(hostname, pattern) for pattern in hostnames):
+            return False
+    return True
+
+
+def filter_event(message: Dict[str, Any], subscription: Subscription) -> Optional[Dict[str, Any]]:
+    """
+    구독에 맞는 rows만 남긴 이벤트 (집계 필드도 남은 rows 기준으로 다시 계산). 맞는 행이 없으면 None.
+    rows가 없는 이벤트는 그대로 전달.
+    """
+    rows = message.get("rows")
+    if subscription == ALL or not isinstance(rows, list):
+        return message
+    matched = [row for row in rows if _row_matches(row, subscription)]
+    if not matched:
+        return None
+    if len(matched) == len(rows):
+        return message
+    return dict(
+        message,
+        rows=matched,
+        count=len(matched),
+        check_types=sorted({row.get("check_type") for row in matched}),
+        hostnames=sorted({row.get("hostname") for row in matched}),
+        checkers=sorted({row.get("checker") for row in matched if row.get("checker")}),
+        statuses=sorted({row.get("status") for row in matched if row.get("status")}),
+    )
+
+
+class WebSocketClient:
+    """연결 1개: 전송 대기열 + 대기열을 비우는 전송 task (이 task만 소켓에 씀)"""
+
+    def __init__(self, websocket: WebSocket, queue_size: int, subscription: Subscription, last_seq: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.task: Optional[asyncio.Task] = None
+        self.subscription = subscription
+        self.last_seq = last_seq  # 이 연결에 마지막으로 보낸(또는 hello로 알린) seq → 다음 이벤트의 prev
+
+
+class ConnectionManager:
+    """
+    Args:
+        buffer_size: 재전송용으로 보관할 최근 이벤트 수
+        queue_size: 연결별 전송 대기열 크기(메시지 수). 가득 차면 느린 클라이언트로 보고 1013으로 끊음
+        send_timeout: 메시지 1건 전송 제한 시간(초). 넘거나 전송이 실패하면 1011로 끊고 목록에서 제거
+    """
+
+    def __init__(self, buffer_size: int = 256, queue_size: int = 64, send_timeout: float = 10):
+        self.clients: Dict[WebSocket, WebSocketClient] = {}
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self.queue_size = max(1, queue_size)
+        self.send_timeout = send_timeout
+        self._events: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=max(1, buffer_size))
+        # 구독별 연결 그룹과 check_type 색인 (None 키: check_type 조건이 없는 구독)
+        self._groups: Dict[Subscription, Set[WebSocketClient]] = {}
+        self._type_index: Dict[Optional[str], Set[Subscription]] = {}
+        self._closing: set = set()
+        self._stats = {"published_total": 0, "dropped_slow_total": 0, "send_failures_total": 0}
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        epoch: Optional[str] = None,
+        since: Optional[int] = None,
+        subscription: Subscription = ALL,
+    ):
+        await websocket.accept()
+        # 등록과 재전송 목록 계산 사이에 await가 없으므로 그 뒤 발행된 이벤트는 재전송분 다음에 대기열에 들어감
+        missed = self._events_since(since) if epoch == self.epoch and since is not None else None
+        client = WebSocketClient(websocket, self.queue_size, subscription, since if missed is not None else self.seq)
+        replay = self._replay(client, missed) if missed is not None else None
+        if replay is not None and len(replay) + 1 > self.queue_size:
+            replay = None  # 대기열에 다 넣을 수 없으면 재전송 대신 전체 재조회
+            client.last_seq = self.seq
+        client.queue.put_nowait(json.dumps({
+            "type": "hello",
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "resumed": replay is not None,
+            "subscription": subscription_to_dict(subscription),
+        }))
+        for text in replay or []:
+            client.queue.put_nowait(text)
+        client.task = asyncio.create_task(self._sender(client))
+        self.clients[websocket] = client
+        self._join(client)
+
+    def disconnect(self, websocket: WebSocket):
+        client = self.clients.pop(websocket, None)
+        if client is not None:
+            self._leave(client)
+            if client.task is not None:
+                client.task.cancel()
+
+    def subscribe(self, websocket: WebSocket, subscription: Subscription):
+        """연결의 구독 변경 후 {"type": "subscribed", "seq", "subscription"} 전송. 이후 이벤트부터 적용"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+        self._leave(client)
+        client.subscription = subscription
+        self._join(client)
+        self._enqueue(client, json.dumps({
+            "type": "subscribed",
+            "seq": client.last_seq,
+            "subscription": subscription_to_dict(subscription),
+        }))
+
+    def send(self, websocket: WebSocket, message: dict):
+        """한 연결에만 보냄 (pong 등). 대기열이 가득 차면 연결을 끊음"""
+        client = self.clients.get(websocket)
+        if client is not None:
+            self._enqueue(client, json.dumps(message, ensure_ascii=False, default=str))
+
+    async def publish(self, message: dict):
+        """
+        seq·epoch를 붙여 보관하고, 이벤트 rows의 check_type으로 관련 구독 그룹만 골라
+        그룹마다 걸러진 이벤트를 1회 직렬화해 그룹 연결들의 전송 대기열에 넣음 (전송 완료를 기다리지 않음)
+        """
+        self.seq += 1
+        message = dict(message, seq=self.seq, epoch=self.epoch)
+        self._events.append((self.seq, message))
+        self._stats["published_total"] += 1
+        for subscription in self._candidate_subscriptions(message):
+            event = filter_event(message, subscription)
+            if event is None:
+                continue
+            body = json.dumps(event, ensure_ascii=False, default=str)
+            for client in list(self._groups.get(subscription, ())):
+                self._enqueue(client, self._with_prev(body, client, self.seq))
+
+    def stats(self) -> Dict[str, Any]:
+        """연결 수, 구독 그룹 수, 연결별 대기열 최대 깊이, 느린 클라이언트 끊김·전송 실패 누적"""
+        return {
+            "connections": len(self.clients),
+            "subscription_groups": len(self._groups),
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "queue_size": self.queue_size,
+            "max_queue_depth": max((c.queue.qsize() for c in self.clients.values()), default=0),
+            **self._stats,
+        }
+
+    def _candidate_subscriptions(self, message: Dict[str, Any]) -> Set[Subscription]:
+        """이벤트를 받을 수 있는 구독 (check_type 색인). rows가 없는 이벤트는 전체"""
+        rows = message.get("rows")
+        if not isinstance(rows, list):
+            return set(self._groups)
+        candidates = set(self._type_index.get(None, ()))
+        for check_type in {str(row.get("check_type") or "").lower() for row in rows}:
+            candidates |= self._type_index.get(check_type, set())
+        return candidates
+
+    def _join(self, client: WebSocketClient):
+        subscription = client.subscription
+        group = self._groups.get(subscription)
+        if group is None:
+            group = self._groups[subscription] = set()
+            for check_type in subscription[0] or [None]:
+                self._type_index.setdefault(check_type, set()).add(subscription)
+        group.add(client)
+
+    def _leave(self, client: WebSocketClient):
+        subscription = client.subscription
+        group = self._groups.get(subscription)
+        if group is None:
+            return
+        group.discard(client)
+        if not group:
+            del self._groups[subscription]
+            for check_type in subscription[0] or [None]:
+                keys = self._type_index.get(check_type)
+                if keys is not None:
+                    keys.discard(subscription)
+                    if not keys:
+                        del self._type_index[check_type]
+
+    def _events_since(self, since: int) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """since 이후 이벤트 (순서대로). 버퍼에서 이미 밀려났거나 since가 현재 seq보다 크면 None"""
+        if since > self.seq:
+            return None
+        if since < self.seq and (not self._events or self._events[0][0] > since + 1):
+            return None
+        return [(seq, message) for seq, message in self._events if seq > since]
+
+    def _replay(self, client: WebSocketClient, events: List[Tuple[int, Dict[str, Any]]]) -> List[str]:
+        texts = []
+        for seq, message in events:
+            event = filter_event(message, client.subscription)
+            if event is not None:
+                texts.append(self._with_prev(json.dumps(event, ensure_ascii=False, default=str), client, seq))
+        return texts
+
+    @staticmethod
+    def _with_prev(body: str, client: WebSocketClient, seq: int) -> str:
+        """그룹 공용 직렬화 결과에 이 연결의 prev만 덧붙임 (body는 JSON 객체)"""
+        text = f'{body[:-1]}, "prev": {client.last_seq}}}'
+        client.last_seq = seq
+        return text
+
+    def _enqueue(self, client: WebSocketClient, text: str):
+        try:
+            client.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self._stats["dropped_slow_total"] += 1
+            # 1013 Try Again Later: 클라이언트는 재연결하면서 since로 놓친 이벤트를 다시 받음
+            self._drop(client, code=1013)
+
+    def _drop(self, client: WebSocketClient, code: int):
+        """목록에서 제거하고 전송 task 중단 후 소켓 닫기 (닫기는 별도 task, 호출자는 기다리지 않음)"""
+        if self.clients.get(client.websocket) is client:
+            del self.clients[client.websocket]
+            self._leave(client)
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        task = asyncio.create_task(self._close(client.websocket, code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    async def _sender(self, client: WebSocketClient):
+        try:
+            while True:
+                text = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_text(text), timeout=self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 끊긴 소켓·전송 시간 초과: 연결 정리
+            self._stats["send_failures_total"] += 1
+            self._drop(client, code=1011)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+api_sender spool 재전송 (replay)
+
+전송에 실패해 spool 디렉터리(기본: 프로젝트 루트/.api_spool)에 남은 점검 결과를
+/api/checks/batch 로 일괄 재전송하고, 모든 API 서버에 저장(또는 중복 확인)된 파일은 삭제합니다.
+각 결과에는 idempotency_key가 들어 있으므로 여러 번 실행해도 중복 저장되지 않습니다.
+형식 오류로 서버가 거부한 항목은 spool/failed/ 로 옮겨 반복 재전송을 막습니다.
+묶음 요청이 서버 오류(5xx 등)로 실패하면 반으로 나눠 다시 보내 문제 항목만 골라내고,
+서버가 정상인데도 혼자 실패한 항목은 실행마다 횟수를 세어(spool/.replay_attempts)
+--max-attempts회가 되면 spool/failed/ 로 격리합니다 (서버 전체 장애 중에는 세지 않음).
+
+사용법 (프로젝트 루트에서):
+  python3 scripts/replay_api_spool.py
+  python3 scripts/replay_api_spool.py --url http://localhost:8000/api/checks/batch --batch-size 200
+  python3 scripts/replay_api_spool.py --dry-run
+  python3 scripts/replay_api_spool.py --max-attempts 5
+
+URL을 지정하지 않으면 config/api_config.yml 의 api_server.batch_urls,
+없으면 api_server.urls / api_server.url 각 항목 뒤에 /batch 를 붙여 사용합니다.
+Cron 예: */10 * * * * cd /opt/ansible-monitoring && python3 scripts/replay_api_spool.py >> logs/replay_api_spool.log 2>&1
+"""
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SPOOL_DIR = PROJECT_DIR / ".api_spool"
+CONFIG_FILE = PROJECT_DIR / "config" / "api_config.yml"
+ATTEMPTS_FILE = ".replay_attempts"  # spool 디렉터리 안, 항목별 실패 횟수 (*.json이 아니므로 재전송 대상 아님)
+
+
+def load_api_config() -> Dict[str, Any]:
+    """config/api_config.yml 의 api_server 설정 (PyYAML 없거나 파일 없으면 빈 dict)"""
+    if not CONFIG_FILE.exists():
+        return {}
+    try:
+        import yaml
+    except ImportError:
+        return {}
+    with open(CONFIG_FILE, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return data.get("api_server") or {}
+
+
+def resolve_batch_urls(api_server: Dict[str, Any]) -> List[str]:
+    """batch_urls 우선, 없으면 urls/url 뒤에 /batch 를 붙임 (api_sender와 동일 규칙)"""
+    if api_server.get("batch_urls"):
+        return list(api_server["batch_urls"])
+    urls = api_server.get("urls") or ([api_server["url"]] if api_server.get("url") else [])
+    return [u.rstrip("/") + "/batch" for u in urls]
+
+
+def load_spool(spool_dir: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+    """spool 디렉터리의 *.json 파일을 (경로, 점검 결과) 목록으로 읽기. 깨진 파일은 건너뜀."""
+    entries = []
+    for path in sorted(spool_dir.glob("*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                item = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ spool 파일을 읽을 수 없습니다 (건너뜀): {path.name}: {e}")
+            continue
+        if not isinstance(item, dict):
+            print(f"⚠️ spool 파일 형식 오류 (건너뜀): {path.name}")
+            continue
+        entries.append((path, item))
+    return entries
+
+
+def load_attempts(spool_dir: Path) -> Dict[str, int]:
+    """파일 이름별 누적 실패 횟수 (없거나 깨졌으면 빈 dict)"""
+    try:
+        with open(spool_dir / ATTEMPTS_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {k: int(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+
+def save_attempts(spool_dir: Path, attempts: Dict[str, int]):
+    path = spool_dir / ATTEMPTS_FILE
+    if not attempts:
+        path.unlink(missing_ok=True)
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(attempts, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+
+def post_batch(url: str, items: List[Dict[str, Any]], timeout: int) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """
+    /api/checks/batch 로 POST. (HTTP 상태, 응답 JSON)
+    서버에 닿지 못하면(연결 실패·타임아웃) (None, None), 오류 응답(4xx/5xx)이면 (상태, None)
+    """
+    body = json.dumps({"items": items}, ensure_ascii=False).encode("utf-8")
+    req = urllib.request.Request(
+        url, data=body, method="POST", headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        print(f"⚠️ 전송 실패 ({url}, {len(items)}건): HTTP {e.code}")
+        return e.code, None
+    except (urllib.error.URLError, OSError) as e:
+        print(f"⚠️ 전송 실패 ({url}, {len(items)}건): {e}")
+        return None, None
+    except ValueError as e:
+        print(f"⚠️ 응답 형식 오류 ({url}, {len(items)}건): {e}")
+        return 200, None
+
+
+def server_healthy(url: str, timeout: int) -> bool:
+    """batch URL과 같은 서버의 /api/health가 DB까지 정상인지 (혼자 실패한 항목이 항목 문제인지 판단용)"""
+    base = url.split("/api/", 1)[0] if "/api/" in url else url.rstrip("/")
+    try:
+        with urllib.request.urlopen(base + "/api/health", timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8")).get("db") == "ok"
+    except (urllib.error.URLError, OSError, ValueError, AttributeError):
+        return False
+
+
+class Replayer:
+    """
+    URL 하나로 spool 항목 전송. 묶음이 서버 오류로 실패하면 반씩 나눠 다시 보내고,
+    한 건만 보내도 실패하는 항목은 suspects에 모음 (서버에 닿지 못하면 이번 실행에서 이 URL 중단)
+    """
+
+    def __init__(self, url: str, timeout: int):
+        self.url = url
+        self.timeout = timeout
+        self.reachable = True
+        self.accepted = False  # 이번 실행에서 이 서버가 정상 응답한 적이 있는지
+        self.stored: List[Path] = []
+        self.rejected: Dict[Path, str] = {}
+        self.suspects: Dict[Path, str] = {}
+
+    def send(self, chunk: List[Tuple[Path, Dict[str, Any]]]):
+        if not self.reachable or not chunk:
+            return
+        status, response = post_batch(self.url, [item for _, item in chunk], self.timeout)
+        if status is None:
+            self.reachable = False
+            return
+        item_results = (response or {}).get("items")
+        if isinstance(item_results, list) and len(item_results) != len(chunk):
+            print(f"⚠️ 응답 항목 수 불일치 ({self.url}): 보냄 {len(chunk)}건, 응답 {len(item_results)}건")
+            item_results = None
+        if not isinstance(item_results, list):
+            if len(chunk) > 1:
+                middle = len(chunk) // 2
+                self.send(chunk[:middle])
+                self.send(chunk[middle:])
+            else:
+                self.suspects[chunk[0][0]] = f"HTTP {status}" if response is None else "응답 형식 오류"
+            return
+        self.accepted = True
+        for (path, _), item_result in zip(chunk, item_results):
+            if (item_result or {}).get("success"):
+                self.stored.append(path)
+            else:
+                self.rejected[path] = (item_result or {}).get("error", "unknown")
+
+    def confirmed_suspects(self) -> Dict[Path, str]:
+        """서버가 정상(다른 요청 성공 또는 /api/health 정상)일 때만 항목 문제로 봄 (서버 장애 중에는 빈 dict)"""
+        if not self.suspects:
+            return {}
+        if self.accepted or server_healthy(self.url, self.timeout):
+            return self.suspects
+        return {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="api_sender spool 재전송")
+    parser.add_argument("--spool-dir", default=None, help=f"spool 디렉터리 (기본: api_server.spool_dir 또는 {DEFAULT_SPOOL_DIR})")
+    parser.add_argument("--url", action="append", default=None, help="batch API URL (여러 번 지정 가능)")
+    parser.add_argument("--batch-size", type=int, default=None, help="요청 1회당 최대 건수 (기본: api_server.batch_size 또는 100)")
+    parser.add_argument("--timeout", type=int, default=None, help="요청 타임아웃 초 (기본: api_server.timeout 또는 60)")
+    parser.add_argument("--max-attempts", type=int, default=3, help="서버 정상인데 혼자 실패한 항목을 격리할 실행 횟수 (기본 3)")
+    parser.add_argument("--dry-run", action="store_true", help="전송하지 않고 대상만 출력")
+    args = parser.parse_args()
+
+    api_server = load_api_config()
+    spool_dir = Path(args.spool_dir or api_server.get("spool_dir") or DEFAULT_SPOOL_DIR)
+    urls = args.url or resolve_batch_urls(api_server)
+    batch_size = max(1, args.batch_size or int(api_server.get("batch_size") or 100))
+    timeout = args.timeout or int(api_server.get("timeout") or 60)
+
+    if not spool_dir.is_dir():
+        print(f"spool 디렉터리가 없습니다: {spool_dir}")
+        return 0
+    entries = load_spool(spool_dir)
+    if not entries:
+        print("재전송할 spool 파일이 없습니다.")
+        return 0
+    if not urls:
+        print("전송할 URL이 없습니다. --url 또는 config/api_config.yml 의 api_server.urls 를 설정하세요.")
+        return 1
+    print(f"spool {len(entries)}건 → {len(urls)}개 서버로 재전송 (batch_size={batch_size})")
+    if args.dry_run:
+        for path, _ in entries:
+            print(f"  {path.name}")
+        return 0
+
+    # 파일별로 "모든 URL에서 저장됨" 여부를 추적. 한 URL이라도 실패하면 남겨서 다음 실행 때 재시도.
+    stored_count = {path: 0 for path, _ in entries}
+    rejected: Dict[Path, str] = {}
+    suspects: Dict[Path, str] = {}
+    for url in urls:
+        replayer = Replayer(url, timeout)
+        for start in range(0, len(entries), batch_size):
+            replayer.send(entries[start:start + batch_size])
+        for path in replayer.stored:
+            stored_count[path] += 1
+        rejected.update(replayer.rejected)
+        suspects.update(replayer.confirmed_suspects())
+
+    # 서버는 정상인데 혼자 계속 실패하는 항목: 실행마다 1회씩 세어 max_attempts회면 격리
+    attempts = load_attempts(spool_dir)
+    for path, reason in suspects.items():
+        if path in rejected:
+            continue
+        attempts[path.name] = attempts.get(path.name, 0) + 1
+        if attempts[path.name] >= args.max_attempts:
+            rejected[path] = f"{attempts[path.name]}회 연속 전송 실패 ({reason})"
+
+    failed_dir = spool_dir / "failed"
+    removed = 0
+    for path, count in stored_count.items():
+        if count == len(urls) and path not in rejected:
+            path.unlink(missing_ok=True)
+            removed += 1
+        elif path in rejected:
+            # 서버가 거부한 항목은 재전송해도 실패하므로 격리
+            failed_dir.mkdir(exist_ok=True)
+            path.replace(failed_dir / path.name)
+            print(f"✗ 서버가 거부한 항목 격리: {path.name}: {rejected[path]}")
+    remaining_names = {path.name for path in stored_count if path.exists()}
+    save_attempts(spool_dir, {name: n for name, n in attempts.items() if name in remaining_names})
+    remaining = len(remaining_names)
+    print(f"완료: 전송 {removed}건, 격리 {len(rejected)}건, 남은 spool {remaining}건")
+    return 0 if remaining == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())